@@ -0,0 +1,437 @@
+"""
+Benchmarks of the generator on synthetic constellations.
+
+Each scenario runs generate_satellite_paths.py in a scratch copy of the
+scripts directory, with synthetic constellation files and a canned TLE
+catalogue for N satellites, over a prediction window of H hours. Runs are
+offline (--offline --tle-catalogue) and skip tippecanoe unless --tiles is
+given. Per-stage throughput comes from each run's satellite_run_report.json
+(see eo_predictor/run_report.py).
+
+Satellites and their orbits are generated deterministically from their NORAD
+IDs, so every run of a scenario propagates the same tracks. Orbits are
+near-circular LEO orbits, mostly sun-synchronous, with epochs on the day of
+the run.
+
+Usage:
+    uv run python benchmark.py --suite quick
+    uv run python benchmark.py --satellites 1000 --hours 48 --save-baseline
+    uv run python benchmark.py --suite full --generator-args="--stream --workers 0"
+"""
+
+import argparse
+import glob
+import json
+import os
+import random
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+baseline_path = os.path.join(script_dir, "benchmark_baseline.json")
+results_path = os.path.join(script_dir, "benchmark_results.json")
+
+# (satellite counts, window lengths in hours) of each suite
+SUITES = {
+    "quick": ([10, 100], [6, 48]),
+    "full": ([10, 100, 1000, 5000], [6, 48, 168]),
+}
+
+# Synthetic NORAD IDs start here, above the catalogue numbers in use
+FIRST_NORAD_ID = 80000
+
+# Satellites per synthetic constellation
+CONSTELLATION_SIZE = 50
+
+# Sensor profiles cycled through by the synthetic constellations
+SENSOR_PROFILES = [
+    {
+        "sensor_type": "optical",
+        "spatial_res_cm": 300,
+        "swath_km": 24,
+        "altitude_km": 475,
+        "off_nadir_deg": 20,
+        "data_access": "commercial",
+        "tasking": False,
+    },
+    {
+        "sensor_type": "SAR",
+        "spatial_res_cm": 50,
+        "swath_km": 10,
+        "altitude_km": 570,
+        "off_nadir_deg": 35,
+        "data_access": "commercial",
+        "tasking": True,
+    },
+    {
+        "sensor_type": "optical",
+        "spatial_res_cm": 1000,
+        "swath_km": 290,
+        "altitude_km": 786,
+        "off_nadir_deg": 0,
+        "data_access": "open",
+        "tasking": False,
+    },
+    {
+        "sensor_type": "hyperspectral",
+        "spatial_res_cm": 3000,
+        "swath_km": 18,
+        "altitude_km": 520,
+        "off_nadir_deg": 30,
+        "data_access": "commercial",
+        "tasking": True,
+    },
+]
+
+# Stage times below this many seconds are too noisy to compare
+MIN_COMPARE_SECONDS = 0.1
+
+
+def tle_checksum(line):
+    """Modulo 10 checksum of the first 68 characters of a TLE line"""
+    total = sum(int(c) if c.isdigit() else c == "-" for c in line[:68])
+    return str(total % 10)
+
+
+def synthetic_tle(norad_id, epoch):
+    """
+    Deterministic TLE of a near-circular LEO satellite.
+
+    Args:
+        norad_id: NORAD ID, also the seed of the orbital elements
+        epoch: datetime in UTC of the element set
+
+    Returns:
+        tuple: (name, line1, line2)
+    """
+    rng = random.Random(norad_id)
+    inclination = rng.choice([97.4, 97.6, 97.8, 98.2, 51.6, 45.0])
+    raan = rng.uniform(0, 360)
+    mean_anomaly = rng.uniform(0, 360)
+    mean_motion = rng.uniform(14.8, 15.4)
+    day_of_year = (
+        epoch.timetuple().tm_yday
+        + (epoch.hour * 3600 + epoch.minute * 60 + epoch.second) / 86400
+    )
+    line1 = (
+        f"1 {norad_id:05d}U 26001A   {epoch:%y}{day_of_year:012.8f} "
+        " .00000000  00000-0  00000-0 0  999"
+    )
+    line2 = (
+        f"2 {norad_id:05d} {inclination:8.4f} {raan:8.4f} 0001000  90.0000 "
+        f"{mean_anomaly:8.4f} {mean_motion:11.8f}    1"
+    )
+    return (
+        f"SYNTH-{norad_id}",
+        line1 + tle_checksum(line1),
+        line2 + tle_checksum(line2),
+    )
+
+
+def synthetic_constellations(n_satellites):
+    """Constellation files for n_satellites, CONSTELLATION_SIZE per file"""
+    constellations = []
+    for i, first in enumerate(range(0, n_satellites, CONSTELLATION_SIZE)):
+        norad_ids = list(
+            range(
+                FIRST_NORAD_ID + first,
+                FIRST_NORAD_ID + min(first + CONSTELLATION_SIZE, n_satellites),
+            )
+        )
+        constellations.append(
+            {
+                "constellation": f"Synthetic {i + 1:03d}",
+                "operator": f"Synthetic Operator {i % 7 + 1}",
+                **SENSOR_PROFILES[i % len(SENSOR_PROFILES)],
+                "url": "https://example.com/constellation-info",
+                "data_repo_type": "STAC",
+                "data_repo_url": "https://example.com/stac-catalog",
+                "norad_ids": norad_ids,
+            }
+        )
+    return constellations
+
+
+def prepare_work_dir(work_dir, n_satellites, epoch):
+    """
+    Lay out a scratch project for one scenario.
+
+    Copies the scripts and the eo_predictor package (and the de421
+    ephemeris, if downloaded) and writes
+    the synthetic constellations and TLE catalogue.
+
+    Returns:
+        tuple: (scripts directory, TLE catalogue path)
+    """
+    work_scripts = os.path.join(work_dir, "scripts")
+    satellites_dir = os.path.join(work_scripts, "satellites")
+    os.makedirs(satellites_dir)
+    os.makedirs(os.path.join(work_dir, "public"))
+    for path in glob.glob(os.path.join(script_dir, "*.py")) + glob.glob(
+        os.path.join(script_dir, "de421.bsp")
+    ):
+        shutil.copy(path, work_scripts)
+    shutil.copytree(
+        os.path.join(script_dir, "eo_predictor"),
+        os.path.join(work_scripts, "eo_predictor"),
+        ignore=shutil.ignore_patterns("__pycache__"),
+    )
+
+    for i, constellation in enumerate(synthetic_constellations(n_satellites)):
+        with open(
+            os.path.join(satellites_dir, f"synthetic-{i + 1:03d}.json"), "w"
+        ) as f:
+            json.dump(constellation, f, indent=2)
+
+    catalogue_path = os.path.join(work_dir, "synthetic.tle")
+    with open(catalogue_path, "w") as f:
+        for norad_id in range(FIRST_NORAD_ID, FIRST_NORAD_ID + n_satellites):
+            f.write("\n".join(synthetic_tle(norad_id, epoch)) + "\n")
+    return work_scripts, catalogue_path
+
+
+def run_scenario(n_satellites, hours, generator_args, verbose=False):
+    """
+    Run the generator on one synthetic scenario.
+
+    Args:
+        n_satellites: Number of synthetic satellites
+        hours: Prediction window length
+        generator_args: Extra generate_satellite_paths.py arguments
+        verbose: Show the generator's output
+
+    Returns:
+        dict: Scenario, total wall time (including interpreter startup and
+        imports) and peak RSS, and per-stage wall time, items and throughput
+        (items per second)
+    """
+    epoch = datetime.now(timezone.utc).replace(microsecond=0)
+    with tempfile.TemporaryDirectory(prefix="eo-predictor-bench-") as work_dir:
+        work_scripts, catalogue_path = prepare_work_dir(work_dir, n_satellites, epoch)
+        command = [
+            sys.executable,
+            "generate_satellite_paths.py",
+            "--offline",
+            "--tle-catalogue",
+            catalogue_path,
+            "--window-hours",
+            str(hours),
+            *generator_args,
+        ]
+        started = time.perf_counter()
+        completed = subprocess.run(
+            command,
+            cwd=work_scripts,
+            stdout=None if verbose else subprocess.DEVNULL,
+            stderr=None if verbose else subprocess.PIPE,
+            text=True,
+        )
+        wall_seconds = time.perf_counter() - started
+        if completed.returncode:
+            raise RuntimeError(
+                f"Generator failed for {n_satellites} satellites over {hours} h:\n"
+                f"{completed.stderr or ''}"
+            )
+        with open(os.path.join(work_dir, "public", "satellite_run_report.json")) as f:
+            report = json.load(f)
+
+    return {
+        "satellites": n_satellites,
+        "hours": hours,
+        "wallSeconds": wall_seconds,
+        "peakRssMb": max(report["peakRssMb"], report["childrenPeakRssMb"]),
+        "stages": {
+            record["name"]: {
+                "wallSeconds": record["wallSeconds"],
+                "items": record.get("items"),
+                "itemsPerSecond": (
+                    record["items"] / record["wallSeconds"]
+                    if record.get("items") and record["wallSeconds"] > 0
+                    else None
+                ),
+            }
+            for record in report["stages"]
+        },
+    }
+
+
+def scenario_key(result):
+    """Key of a scenario in results and baselines, e.g. "100sat-48h" """
+    return f"{result['satellites']}sat-{result['hours']:g}h"
+
+
+def compare_to_baseline(results, baseline, tolerance):
+    """
+    Find stages (and totals) that got slower than the baseline allows.
+
+    Args:
+        results: Scenario results from run_scenario()
+        baseline: Stored benchmark results, keyed by scenario_key()
+        tolerance: Allowed ratio of new to baseline wall time
+
+    Returns:
+        list: (scenario, stage, baseline seconds, new seconds) of each
+        regression; stage is "total" for the whole run
+    """
+    regressions = []
+    for result in results:
+        key = scenario_key(result)
+        if key not in baseline:
+            continue
+        base = baseline[key]
+        pairs = [("total", base["wallSeconds"], result["wallSeconds"])] + [
+            (name, base["stages"][name]["wallSeconds"], stage["wallSeconds"])
+            for name, stage in result["stages"].items()
+            if name in base["stages"]
+        ]
+        for name, old, new in pairs:
+            if max(old, new) >= MIN_COMPARE_SECONDS and new > old * tolerance:
+                regressions.append((key, name, old, new))
+    return regressions
+
+
+def print_result(result, baseline=None):
+    """Print a scenario's stages, with the change from the baseline if any"""
+    base = (baseline or {}).get(scenario_key(result))
+    print(
+        f"\n{scenario_key(result)}: {result['wallSeconds']:.2f} s, "
+        f"peak {result['peakRssMb']:.0f} MiB"
+    )
+    print(f"  {'Stage':<20} {'Wall s':>9} {'Items':>10} {'Items/s':>12} {'vs base':>8}")
+    for name, stage in result["stages"].items():
+        rate = (
+            "" if stage["itemsPerSecond"] is None else f"{stage['itemsPerSecond']:.0f}"
+        )
+        change = ""
+        if base and name in base["stages"] and base["stages"][name]["wallSeconds"] > 0:
+            change = (
+                f"{stage['wallSeconds'] / base['stages'][name]['wallSeconds']:.2f}x"
+            )
+        print(
+            f"  {name:<20} {stage['wallSeconds']:>9.2f} "
+            f"{'' if stage['items'] is None else stage['items']:>10} "
+            f"{rate:>12} {change:>8}"
+        )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the generator on synthetic constellations"
+    )
+    parser.add_argument(
+        "--suite",
+        choices=list(SUITES),
+        default="quick",
+        help="Satellite counts and window lengths to run: quick (10-100 "
+        "satellites, 6-48 h, default) or full (10-5000 satellites, 6 h-7 days)",
+    )
+    parser.add_argument(
+        "--satellites",
+        type=int,
+        nargs="+",
+        help="Satellite counts to run instead of the suite's",
+    )
+    parser.add_argument(
+        "--hours",
+        type=float,
+        nargs="+",
+        help="Window lengths in hours to run instead of the suite's",
+    )
+    parser.add_argument(
+        "--generator-args",
+        default="",
+        help='Extra generate_satellite_paths.py arguments, e.g. "--stream --workers 0"',
+    )
+    parser.add_argument(
+        "--tiles",
+        action="store_true",
+        help="Also run tippecanoe (by default runs stop before tiling)",
+    )
+    parser.add_argument(
+        "--baseline",
+        default=baseline_path,
+        help="Baseline to compare against (default: "
+        f"{os.path.relpath(baseline_path, script_dir)})",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store these results as the baseline, replacing the scenarios they cover",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=1.25,
+        help="Fail if a stage or run takes longer than this times the "
+        "baseline (default: 1.25)",
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Show the generator's output",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    satellite_counts, window_hours = SUITES[args.suite]
+    satellite_counts = args.satellites or satellite_counts
+    window_hours = args.hours or window_hours
+    generator_args = shlex.split(args.generator_args)
+    if not args.tiles:
+        generator_args.append("--skip-tiles")
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("generatorArgs") != generator_args:
+            print(
+                f"WARNING: baseline was run with {baseline.get('generatorArgs')}, "
+                f"not {generator_args}"
+            )
+
+    results = []
+    for n_satellites in satellite_counts:
+        for hours in window_hours:
+            print(f"\nRunning {n_satellites} satellites over {hours:g} h...")
+            result = run_scenario(n_satellites, hours, generator_args, args.verbose)
+            print_result(result, baseline.get("scenarios"))
+            results.append(result)
+
+    output = {
+        "createdAt": datetime.now(timezone.utc).isoformat(),
+        "generatorArgs": generator_args,
+        "scenarios": {scenario_key(result): result for result in results},
+    }
+    with open(results_path, "w") as f:
+        json.dump(output, f, indent=2)
+    print(f"\nResults saved to: {results_path}")
+
+    if args.save_baseline:
+        output["scenarios"] = {**baseline.get("scenarios", {}), **output["scenarios"]}
+        with open(args.baseline, "w") as f:
+            json.dump(output, f, indent=2)
+        print(f"Baseline saved to: {args.baseline}")
+        return
+
+    regressions = compare_to_baseline(
+        results, baseline.get("scenarios", {}), args.tolerance
+    )
+    for key, name, old, new in regressions:
+        ratio = f"{new / old:.2f}x" if old else "new"
+        print(f"REGRESSION {key} {name}: {old:.2f} s -> {new:.2f} s ({ratio})")
+    if regressions:
+        sys.exit(1)
+    if baseline:
+        print(f"No stage slower than {args.tolerance:g}x the baseline")
+
+
+if __name__ == "__main__":
+    main()
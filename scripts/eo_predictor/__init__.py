@@ -0,0 +1,74 @@
+"""
+Satellite path predictions for the eo-predictor map.
+
+The generator as a library: each pipeline stage is a function (see
+pipeline.py) and the lower-level building blocks live in their own modules.
+Names are imported from their module on first access, so importing the
+package loads neither GeoPandas nor Skyfield.
+
+Example:
+    import eo_predictor
+
+    satellite_info = eo_predictor.expand_constellations_to_satellites(
+        eo_predictor.load_constellations()
+    )
+"""
+
+from importlib import import_module
+
+# Public name -> module defining it
+_EXPORTS = {
+    "load_constellations": "constellations",
+    "expand_constellations_to_satellites": "constellations",
+    "parse_tle_text": "tle",
+    "create_satellite": "tle",
+    "propagate_satellites": "propagation",
+    "propagate_satellites_adaptive": "propagation",
+    "is_daytime": "daylight",
+    "generate_path_segments": "segments",
+    "generate_path_segments_parallel": "segments",
+    "generate_path_segments_incremental": "incremental",
+    "stream_path_segments": "output",
+    "summarize_path_segments": "output",
+    "find_pass_events": "pass_events",
+    "find_pass_events_parallel": "pass_events",
+    "load_aois": "pass_events",
+    "build_pass_index": "pass_index",
+    "query_passes": "pass_index",
+    "load_path_segments": "geoparquet",
+    "write_path_segments": "geoparquet",
+    "run_tippecanoe": "tiles",
+    "validate_constellations": "validation",
+    "PredictionService": "service",
+    "PIPELINE_STAGES": "pipeline",
+    "fetch_tles": "pipeline",
+    "combine_tles": "pipeline",
+    "load_satellites": "pipeline",
+    "build_fetch_status": "pipeline",
+    "write_fetch_status": "pipeline",
+    "prediction_window": "pipeline",
+    "load_daylight": "pipeline",
+    "find_passes": "pipeline",
+    "generate_segments": "pipeline",
+    "write_geoparquet": "pipeline",
+    "index_passes": "pipeline",
+    "build_metadata": "pipeline",
+    "time_slice_index": "pipeline",
+    "write_geojson": "pipeline",
+    "generate_tiles": "pipeline",
+    "run": "pipeline",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted([*globals(), *__all__])
@@ -0,0 +1,354 @@
+"""
+Command line interface of the generator.
+
+Usage:
+    uv run python -m eo_predictor generate [options]
+    uv run python -m eo_predictor validate [options]
+    uv run python -m eo_predictor serve [options]
+
+Installed, the same commands are available as `eo-predictor generate`,
+`eo-predictor validate` and `eo-predictor serve`.
+generate_satellite_paths.py and validate_satellites.py run the first two.
+"""
+
+import argparse
+import os
+import sys
+
+from .fetch import CELESTRAK_URL
+from .pass_index import PASS_INDEX_ZOOM
+from .paths import (
+    combined_tle_path,
+    geoparquet_path,
+    pass_events_path,
+    pass_index_path,
+    profile_dir,
+    project_root,
+    run_report_path,
+    tle_cache_path,
+    validation_cache_path,
+)
+from .pipeline import PIPELINE_STAGES, run
+from .run_report import PROFILERS, configure_profiling, write_run_report
+
+
+def add_generate_arguments(parser):
+    """Add the options of the generate command to parser"""
+    parser.add_argument(
+        "--daylight-mode",
+        choices=["ephemeris", "subsolar"],
+        default="ephemeris",
+        help="Solar position source for day/night classification: the de421 "
+        "ephemeris (default) or a faster subsolar-point approximation",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes to shard satellites across "
+        "(default: 1, serial; 0 uses every CPU core)",
+    )
+    parser.add_argument(
+        "--tle-max-age",
+        type=float,
+        default=12,
+        help="Serve cached TLEs whose epoch is younger than this many hours "
+        "without hitting Celestrak (default: 12; 0 refetches every TLE)",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Never hit Celestrak; use only TLEs from the on-disk cache",
+    )
+    parser.add_argument(
+        "--celestrak-url",
+        default=CELESTRAK_URL,
+        help=f"Base URL of the Celestrak GP API (default: {CELESTRAK_URL})",
+    )
+    parser.add_argument(
+        "--tle-group",
+        action="append",
+        default=[],
+        help="Fetch a whole Celestrak GP group (e.g. 'active') in one request "
+        "and filter it to our NORAD IDs; may be repeated",
+    )
+    parser.add_argument(
+        "--tle-catalogue",
+        action="append",
+        default=[],
+        help="Read TLEs from a local catalogue file and filter it to our "
+        "NORAD IDs; may be repeated",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=16,
+        help="Maximum number of concurrent Celestrak requests (default: 16)",
+    )
+    parser.add_argument(
+        "--request-timeout",
+        type=float,
+        default=30,
+        help="Per-request timeout in seconds (default: 30)",
+    )
+    parser.add_argument(
+        "--max-error-km",
+        type=float,
+        default=None,
+        help="Sample ground tracks adaptively: refine the step where the track "
+        "curves and coarsen it elsewhere, keeping straight segments within this "
+        "distance of the true track (default: fixed 5 minute steps). Small "
+        "values produce more segments than the fixed steps",
+    )
+    parser.add_argument(
+        "--window-hours",
+        type=float,
+        default=48,
+        help="Length of the prediction window in hours (default: 48)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Slide the previous run's prediction window forward: reuse cached "
+        "path segments and only propagate the new tail, recomputing satellites "
+        "whose TLE or constellation properties changed",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Generate path segments one satellite at a time and stream them to "
+        "newline-delimited GeoJSON, bounding memory by a single satellite",
+    )
+    parser.add_argument(
+        "--tiles-format",
+        choices=["directory", "pmtiles", "mbtiles"],
+        default="pmtiles",
+        help="Write tiles as a single PMTiles archive (default, what the site "
+        "loads), a directory of .pbf files or an MBTiles archive",
+    )
+    parser.add_argument(
+        "--parallel-tiles",
+        action="store_true",
+        help="Run tippecanoe for each constellation in parallel (up to --workers "
+        "at a time) and merge the results with tile-join",
+    )
+    parser.add_argument(
+        "--time-slices",
+        type=int,
+        metavar="HOURS",
+        help="Write one tileset per HOURS-long time slice (aligned to midnight "
+        "UTC, so HOURS must divide 24) under public/slices/, indexed in the "
+        "metadata, instead of a single tileset",
+    )
+    parser.add_argument(
+        "--skip-tiles",
+        action="store_true",
+        help="Stop after writing the GeoJSON (or NDJSON with --stream) without "
+        "running tippecanoe, e.g. for benchmarks or analysis-only runs",
+    )
+    parser.add_argument(
+        "--satellite-table",
+        action="store_true",
+        help="Write only sat_id (the NORAD ID), start_time, end_time and "
+        "is_daytime on each segment, with the other satellite properties once "
+        "per satellite in the metadata's satelliteTable",
+    )
+    parser.add_argument(
+        "--field-of-regard",
+        action="store_true",
+        help="Also build the area tasking satellites can image by pointing up to "
+        "off_nadir_deg, per segment, as a separate field_of_regard tile layer",
+    )
+    parser.add_argument(
+        "--geoparquet",
+        action="store_true",
+        help=f"Also write path segments to "
+        f"{os.path.relpath(geoparquet_path, project_root)}, with categorical "
+        "metadata columns and timestamp-typed times (see geoparquet.py)",
+    )
+    parser.add_argument(
+        "--pass-index",
+        action="store_true",
+        help=f"Also write a per-cell index of satellite passes to "
+        f"{os.path.relpath(pass_index_path, project_root)} for area/time queries "
+        "(see pass_index.py)",
+    )
+    parser.add_argument(
+        "--pass-index-zoom",
+        type=int,
+        default=PASS_INDEX_ZOOM,
+        help="Web Mercator zoom level of the pass index grid cells "
+        f"(default: {PASS_INDEX_ZOOM})",
+    )
+    parser.add_argument(
+        "--aoi",
+        help="Find pass events (entry, closest approach and exit times, and the "
+        "off-nadir angle needed) of every satellite over the areas of interest "
+        "in this file: a CSV with lat/lon columns or any GeoPandas-readable file",
+    )
+    parser.add_argument(
+        "--aoi-id-column",
+        default="id",
+        help="Column of the --aoi file identifying each area (default: id)",
+    )
+    parser.add_argument(
+        "--pass-events-output",
+        default=pass_events_path,
+        help="Where to write pass events; a .csv path writes CSV, anything else "
+        f"Parquet (default: {os.path.relpath(pass_events_path, project_root)})",
+    )
+    parser.add_argument(
+        "--profile-stage",
+        choices=PIPELINE_STAGES,
+        help="Profile one pipeline stage and write the profiles to "
+        f"{os.path.relpath(profile_dir, project_root)}/ (see run_report.py)",
+    )
+    parser.add_argument(
+        "--profiler",
+        choices=PROFILERS,
+        default="cprofile",
+        help="Profiler for --profile-stage (default: cprofile; pyinstrument "
+        "must be installed separately)",
+    )
+
+
+def add_validate_arguments(parser):
+    """Add the options of the validate command to parser"""
+    parser.add_argument(
+        "--check-tles",
+        action="store_true",
+        help="Also check NORAD IDs, names and altitudes against the TLE cache "
+        f"({os.path.relpath(tle_cache_path, project_root)}, written by generate)",
+    )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="Fail on --check-tles warnings as well as errors",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Validate every file, ignoring results cached in "
+        f"{os.path.relpath(validation_cache_path, project_root)}",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of processes validating changed files "
+        "(default: 1, serial; 0 uses every CPU core)",
+    )
+
+
+def add_serve_arguments(parser):
+    """Add the options of the serve command to parser"""
+    parser.add_argument(
+        "--host", default="127.0.0.1", help="Address to listen on (default: 127.0.0.1)"
+    )
+    parser.add_argument(
+        "--port", type=int, default=8000, help="Port to listen on (default: 8000)"
+    )
+    parser.add_argument(
+        "--tle-file",
+        default=combined_tle_path,
+        help="TLE file to predict from, reread when it changes (default: "
+        f"{os.path.relpath(combined_tle_path, project_root)}, written by generate)",
+    )
+    parser.add_argument(
+        "--daylight-mode",
+        choices=["ephemeris", "subsolar"],
+        default="ephemeris",
+        help="Solar position source for day/night classification (default: ephemeris)",
+    )
+    parser.add_argument(
+        "--field-of-regard",
+        action="store_true",
+        help="Also return field of regard footprints of tasking satellites",
+    )
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="eo-predictor",
+        description="Satellite path predictions for the eo-predictor map",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    add_generate_arguments(
+        commands.add_parser(
+            "generate",
+            help="Generate satellite path predictions and map tiles",
+            description="Generate satellite path predictions and map tiles",
+        )
+    )
+    add_validate_arguments(
+        commands.add_parser(
+            "validate",
+            help="Validate the constellation files in satellites/",
+            description="Validate the constellation files in satellites/",
+        )
+    )
+    add_serve_arguments(
+        commands.add_parser(
+            "serve",
+            help="Serve on-demand predictions over HTTP",
+            description="Serve path segments and passes of single satellites, "
+            "constellations or areas over HTTP, from a local TLE file "
+            "(see service.py)",
+        )
+    )
+    return parser
+
+
+def parse_args(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "generate" and args.stream and args.incremental:
+        parser.error("--stream cannot be combined with --incremental")
+    if args.command == "generate" and args.time_slices is not None:
+        if args.time_slices <= 0 or 24 % args.time_slices:
+            parser.error("--time-slices must be a whole number of hours dividing 24")
+        if args.tiles_format == "mbtiles":
+            parser.error("--time-slices cannot be combined with --tiles-format mbtiles")
+    return args
+
+
+def generate(args):
+    """Run the pipeline and write the run report, whether or not it succeeds"""
+    if args.profile_stage:
+        configure_profiling(args.profile_stage, args.profiler, profile_dir)
+    status = "failed"
+    try:
+        run(args)
+        status = "succeeded"
+    finally:
+        write_run_report(run_report_path, status=status, options=vars(args))
+
+
+def validate(args):
+    """Validate the constellation files, exiting with 1 if they fail"""
+    from .validation import print_validation_report, validate_constellations
+
+    report = validate_constellations(
+        cache_path=None if args.no_cache else validation_cache_path,
+        check_tles=args.check_tles,
+        workers=args.workers or os.cpu_count(),
+    )
+    if not print_validation_report(report, args.strict):
+        sys.exit(1)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == "validate":
+        validate(args)
+    elif args.command == "serve":
+        from .service import PredictionService, serve
+
+        service = PredictionService(
+            args.tle_file,
+            daylight_mode=args.daylight_mode,
+            field_of_regard=args.field_of_regard,
+        )
+        serve(service, args.host, args.port)
+    else:
+        generate(args)
@@ -0,0 +1,148 @@
+"""
+Day/night classification of ground track samples.
+
+The de421 solar ephemeris is loaded (and downloaded if needed) the first time
+it is used; the subsolar-point approximation needs no ephemeris.
+"""
+
+from functools import cache, lru_cache
+
+import numpy as np
+import pandas as pd
+from skyfield.api import load, wgs84
+from skyfield.framelib import itrs
+
+from .tle import timescale
+
+
+@cache
+def load_ephemeris():
+    """Load the de421 solar ephemeris once per process for daytime calculations"""
+    eph = load("de421.bsp")
+    return eph["earth"], eph["sun"]
+
+
+def to_skyfield_time(timestamps):
+    """Convert UTC timestamps to a Skyfield Time vector in one call"""
+    timestamps = pd.DatetimeIndex(timestamps)
+    return timescale().utc(
+        timestamps.year.to_numpy(),
+        timestamps.month.to_numpy(),
+        timestamps.day.to_numpy(),
+        timestamps.hour.to_numpy(),
+        timestamps.minute.to_numpy(),
+        (timestamps.second + timestamps.microsecond / 1e6).to_numpy(),
+    )
+
+
+@lru_cache(maxsize=8)
+def sun_itrs_xyz(epoch_ns):
+    """
+    Apparent sun position in the ITRS frame at each of a set of times.
+
+    Args:
+        epoch_ns: Tuple of UTC times as integer nanoseconds since the epoch
+
+    Returns:
+        ndarray: Sun positions in km, shape (3, len(epoch_ns))
+
+    Cached, so satellites processed one at a time (--stream) over the same
+    time grid evaluate the sun only once.
+    """
+    earth, sun = load_ephemeris()
+    times = to_skyfield_time(pd.to_datetime(np.array(epoch_ns), utc=True))
+    return earth.at(times).observe(sun).apparent().frame_xyz(itrs).km
+
+
+def solar_elevation_ephemeris(lat_degrees, lon_degrees, observation_times):
+    """
+    Solar elevation from the de421 sun vector, evaluated once per time.
+
+    Args:
+        lat_degrees: Array of latitudes in degrees
+        lon_degrees: Array of longitudes in degrees
+        observation_times: UTC timestamps, one per location
+
+    Returns:
+        ndarray: Solar elevation in degrees
+    """
+    # Segments share a handful of distinct times, so evaluate the sun vector
+    # once per unique time and broadcast it back to every location
+    codes, unique_times = pd.factorize(pd.DatetimeIndex(observation_times))
+    sun_xyz = sun_itrs_xyz(tuple(unique_times.as_unit("ns").asi8))[:, codes]
+    observer_xyz = wgs84.latlon(lat_degrees, lon_degrees).itrs_xyz.km
+    lat = np.radians(lat_degrees)
+    lon = np.radians(lon_degrees)
+    # Local vertical (ellipsoid normal) at each observer
+    up = np.array([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+    to_sun = sun_xyz - observer_xyz
+    sin_alt = (up * to_sun).sum(axis=0) / np.linalg.norm(to_sun, axis=0)
+    return np.degrees(np.arcsin(sin_alt))
+
+
+def solar_elevation_subsolar(lat_degrees, lon_degrees, timestamps):
+    """
+    Approximate solar elevation from the subsolar point (accurate to ~0.1°).
+
+    Uses the low-precision solar coordinates from the Astronomical Almanac,
+    so no ephemeris file is required.
+
+    Args:
+        lat_degrees: Array of latitudes in degrees
+        lon_degrees: Array of longitudes in degrees
+        timestamps: UTC timestamps, one per location
+
+    Returns:
+        ndarray: Solar elevation in degrees
+    """
+    n = pd.DatetimeIndex(timestamps).to_julian_date().to_numpy() - 2451545.0
+    mean_lon = np.radians((280.460 + 0.9856474 * n) % 360)
+    mean_anomaly = np.radians((357.528 + 0.9856003 * n) % 360)
+    ecliptic_lon = (
+        mean_lon
+        + np.radians(1.915) * np.sin(mean_anomaly)
+        + np.radians(0.020) * np.sin(2 * mean_anomaly)
+    )
+    obliquity = np.radians(23.439 - 0.0000004 * n)
+    declination = np.arcsin(np.sin(obliquity) * np.sin(ecliptic_lon))
+    right_ascension = np.arctan2(
+        np.cos(obliquity) * np.sin(ecliptic_lon), np.cos(ecliptic_lon)
+    )
+    gmst = np.radians((280.46061837 + 360.98564736629 * n) % 360)
+    subsolar_lon = right_ascension - gmst
+
+    lat = np.radians(lat_degrees)
+    hour_angle = np.radians(lon_degrees) - subsolar_lon
+    sin_alt = np.sin(lat) * np.sin(declination) + np.cos(lat) * np.cos(
+        declination
+    ) * np.cos(hour_angle)
+    return np.degrees(np.arcsin(np.clip(sin_alt, -1, 1)))
+
+
+def is_daytime(lat_degrees, lon_degrees, observation_times, mode="ephemeris"):
+    """
+    Determine if it's daytime at many locations and times in one pass.
+    Uses solar elevation > 0° as the threshold for daytime.
+
+    Args:
+        lat_degrees: Array of latitudes in degrees
+        lon_degrees: Array of longitudes in degrees
+        observation_times: UTC timestamps, one per location
+        mode: "ephemeris" (de421 sun vector) or "subsolar" (approximation)
+
+    Returns:
+        ndarray: Boolean array, True if daytime, False if nighttime
+    """
+    lat_degrees = np.asarray(lat_degrees, dtype=float)
+    lon_degrees = np.asarray(lon_degrees, dtype=float)
+    if mode == "subsolar":
+        elevation = solar_elevation_subsolar(
+            lat_degrees, lon_degrees, observation_times
+        )
+    else:
+        elevation = solar_elevation_ephemeris(
+            lat_degrees, lon_degrees, observation_times
+        )
+
+    # Return True if sun is above horizon (elevation > 0°)
+    return elevation > 0
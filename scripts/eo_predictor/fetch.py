@@ -0,0 +1,388 @@
+"""
+TLE fetching from Celestrak, through an on-disk cache.
+
+Satellites whose cached TLE is fresh enough are not fetched at all; the rest
+are fetched from bulk GP groups or catalogue files first and then one NORAD ID
+at a time, with bounded concurrency and retries.
+"""
+
+import asyncio
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+from .paths import tle_cache_path
+from .tle import parse_tle_text
+
+CELESTRAK_URL = "https://celestrak.org"
+
+# Celestrak refreshes GP data about every 2 hours; refetching a TLE sooner
+# cannot return a newer element set
+TLE_MIN_REFRESH = timedelta(hours=2)
+
+# Leading letters of Alpha-5 catalogue numbers, standing for 10 to 33 (I and O
+# are skipped to avoid confusion with 1 and 0)
+ALPHA5_LETTERS = "ABCDEFGHJKLMNPQRSTUVWXYZ"
+
+
+# Async function to fetch a single TLE URL
+async def fetch_tle(client, request):
+    url = request["url"]
+    norad_id = request["norad_id"]
+    try:
+        response = await client.get(url)
+        response.raise_for_status()  # Raise an exception for 4xx or 5xx status codes
+        content = response.text.strip()
+        if not content:
+            print(f"  Empty response for NORAD {norad_id}")
+            return {
+                "norad_id": norad_id,
+                "url": url,
+                "success": False,
+                "no_gp": False,
+                "content": "",
+            }
+        if "no gp data found" in content.lower():
+            print(f"  No GP data found for NORAD {norad_id}")
+            return {
+                "norad_id": norad_id,
+                "url": url,
+                "success": False,
+                "no_gp": True,
+                "content": "",
+            }
+        print(f"  Successfully fetched NORAD {norad_id}")
+        return {
+            "norad_id": norad_id,
+            "url": url,
+            "success": True,
+            "no_gp": False,
+            "content": response.text,
+        }
+    except httpx.HTTPStatusError as e:
+        # Celestrak returns 404 (instead of 200 with a "no GP data" body) for
+        # catalog numbers with no GP data, e.g. decayed/deorbited satellites.
+        if (
+            e.response.status_code == 404
+            and "no gp data found" in e.response.text.lower()
+        ):
+            print(f"  No GP data found for NORAD {norad_id}")
+            return {
+                "norad_id": norad_id,
+                "url": url,
+                "success": False,
+                "no_gp": True,
+                "content": "",
+            }
+        print(
+            f"  Failed to fetch NORAD {norad_id} (HTTP error: {e.response.status_code})"
+        )
+        return {
+            "norad_id": norad_id,
+            "url": url,
+            "success": False,
+            "no_gp": False,
+            "content": "",
+        }
+    except httpx.RequestError as e:
+        print(f"  Failed to fetch NORAD {norad_id} (Request error: {e})")
+        return {
+            "norad_id": norad_id,
+            "url": url,
+            "success": False,
+            "no_gp": False,
+            "content": "",
+        }
+
+
+def create_tle_client(max_concurrency=16, timeout=30):
+    """
+    Create the HTTP client shared by every TLE request in a run.
+
+    The client speaks HTTP/2 and keeps connections alive, so retries and
+    bulk requests reuse the same connections to Celestrak.
+    """
+    return httpx.AsyncClient(
+        http2=True,
+        timeout=httpx.Timeout(timeout),
+        limits=httpx.Limits(
+            max_connections=max_concurrency,
+            max_keepalive_connections=max_concurrency,
+        ),
+    )
+
+
+# Async function to fetch all TLE URLs concurrently with retries
+async def fetch_all_tles(
+    client, requests, max_attempts=3, base_delay=5, max_concurrency=16
+):
+    remaining_requests = list(requests)
+    results = {}
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch_bounded(request):
+        async with semaphore:
+            return await fetch_tle(client, request)
+
+    for attempt in range(max_attempts):
+        if not remaining_requests:
+            break
+
+        print(
+            f"Fetching TLE data (attempt {attempt + 1}/{max_attempts}) for {len(remaining_requests)} satellites..."
+        )
+        tasks = [fetch_bounded(request) for request in remaining_requests]
+        attempt_results = await asyncio.gather(*tasks)
+
+        remaining_requests = []
+        for result in attempt_results:
+            results[result["norad_id"]] = result
+            if not result["success"] and not result["no_gp"]:
+                remaining_requests.append(
+                    {"norad_id": result["norad_id"], "url": result["url"]}
+                )
+
+        if remaining_requests and attempt < max_attempts - 1:
+            delay = base_delay * (2**attempt)
+            print(f"Retrying {len(remaining_requests)} failed fetches in {delay}s...")
+            await asyncio.sleep(delay)
+
+    return results
+
+
+def read_text(path):
+    """Read a whole text file"""
+    with open(path) as f:
+        return f.read()
+
+
+async def fetch_tle_catalogue(client, source):
+    """
+    Fetch a bulk TLE catalogue: a Celestrak GP group URL or a local file.
+
+    Returns:
+        str: TLE text, empty if the catalogue could not be read
+    """
+    if not source.startswith(("http://", "https://")):
+        # Read local files in a thread to keep the event loop free for requests
+        try:
+            return await asyncio.to_thread(read_text, source)
+        except OSError as e:
+            print(f"  Failed to read TLE catalogue {source} ({e})")
+            return ""
+    try:
+        response = await client.get(source)
+        response.raise_for_status()
+        return response.text
+    except httpx.HTTPError as e:
+        print(f"  Failed to fetch TLE catalogue {source} ({e})")
+        return ""
+
+
+def catalogue_number(field):
+    """
+    NORAD ID of a TLE catalogue number field (line 1, columns 3-7).
+
+    Alpha-5 numbers above 99999 start with a letter, e.g. "A0001" is 100001.
+    """
+    field = field.strip()
+    if field[:1].isalpha():
+        return str(
+            (ALPHA5_LETTERS.index(field[0].upper()) + 10) * 10000 + int(field[1:])
+        )
+    return str(int(field))
+
+
+def split_tle_catalogue(text, norad_ids):
+    """
+    Pick our satellites out of a bulk TLE catalogue.
+
+    Returns:
+        dict: TLE text for each requested NORAD ID found in the catalogue
+    """
+    found = {}
+    for name, line1, line2 in parse_tle_text(text):
+        norad_id = catalogue_number(line1[2:7])
+        if norad_id in norad_ids:
+            found[norad_id] = "\n".join(filter(None, [name, line1, line2])) + "\n"
+    return found
+
+
+async def fetch_bulk_tles(client, requests, sources):
+    """
+    Fetch TLEs for many satellites from bulk catalogues in a few requests.
+
+    Args:
+        client: Shared HTTP client
+        requests: List of TLE requests (norad_id, url)
+        sources: Celestrak GP group URLs and/or local catalogue files
+
+    Returns:
+        dict: Fetch results keyed by NORAD ID for the satellites found in the
+        catalogues, as from fetch_all_tles()
+    """
+    urls = {request["norad_id"]: request["url"] for request in requests}
+    catalogues = await asyncio.gather(
+        *[fetch_tle_catalogue(client, source) for source in sources]
+    )
+    results = {}
+    for catalogue in catalogues:
+        for norad_id, content in split_tle_catalogue(catalogue, urls).items():
+            results.setdefault(
+                norad_id,
+                {
+                    "norad_id": norad_id,
+                    "url": urls[norad_id],
+                    "success": True,
+                    "no_gp": False,
+                    "content": content,
+                },
+            )
+    print(f"{len(results)}/{len(requests)} TLEs found in bulk catalogues")
+    return results
+
+
+def tle_epoch(line1):
+    """Parse the epoch (columns 19-32, YYDDD.DDDDDDDD) of a TLE line 1"""
+    year = int(line1[18:20])
+    year += 2000 if year < 57 else 1900
+    day_of_year = float(line1[20:32])
+    return datetime(year, 1, 1, tzinfo=timezone.utc) + timedelta(days=day_of_year - 1)
+
+
+def load_tle_cache(path=tle_cache_path):
+    """Load the on-disk TLE cache, keyed by NORAD ID"""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_tle_cache(cache, path=tle_cache_path):
+    """Write the TLE cache back to disk"""
+    with open(path, "w") as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+
+
+def is_tle_fresh(entry, now, max_age):
+    """
+    Check whether a cached TLE can be served without refetching.
+
+    An entry is fresh if its element set epoch is younger than max_age, or if
+    it was fetched within TLE_MIN_REFRESH (Celestrak won't have anything newer).
+    A max_age of zero refetches every TLE, however recently it was fetched.
+    """
+    epoch_age = now - datetime.fromisoformat(entry["epoch"])
+    fetch_age = now - datetime.fromisoformat(entry["fetched_at"])
+    return epoch_age <= max_age or (
+        max_age > timedelta(0) and fetch_age <= TLE_MIN_REFRESH
+    )
+
+
+# Async function to fetch TLEs through the on-disk cache
+async def fetch_all_tles_cached(
+    requests,
+    cache,
+    max_age,
+    offline=False,
+    bulk_sources=(),
+    max_concurrency=16,
+    timeout=30,
+):
+    """
+    Fetch TLE data, skipping the network for satellites with a fresh cache entry.
+
+    Remaining satellites are looked up in the bulk catalogues first; only
+    satellites missing from them are requested one by one.
+
+    Successful fetches update the cache in place. When a fetch fails, the
+    cached element set (if any) is served as a stale fallback.
+
+    Args:
+        requests: List of TLE requests (norad_id, url)
+        cache: TLE cache from load_tle_cache()
+        max_age: timedelta, maximum TLE epoch age served from the cache
+        offline: Serve everything from the cache and never hit the network
+        bulk_sources: Celestrak GP group URLs and/or local catalogue files
+            tried before falling back to one request per satellite
+        max_concurrency: Maximum number of concurrent requests
+        timeout: Per-request timeout in seconds
+
+    Returns:
+        dict: Fetch results keyed by NORAD ID, as from fetch_all_tles(), with
+        "cached" and "stale" flags added
+    """
+    now = datetime.now(timezone.utc)
+    results = {}
+    to_fetch = []
+    for request in requests:
+        entry = cache.get(request["norad_id"])
+        if entry is not None and is_tle_fresh(entry, now, max_age):
+            results[request["norad_id"]] = {
+                "norad_id": request["norad_id"],
+                "url": request["url"],
+                "success": True,
+                "no_gp": False,
+                "content": entry["content"],
+                "cached": True,
+                "stale": False,
+            }
+        else:
+            to_fetch.append(request)
+    print(f"{len(results)} TLEs fresh in cache, {len(to_fetch)} to fetch")
+
+    fetched = {}
+    if offline:
+        # Local catalogue files are still allowed offline
+        bulk_sources = [
+            source
+            for source in bulk_sources
+            if not source.startswith(("http://", "https://"))
+        ]
+    async with create_tle_client(max_concurrency, timeout) as client:
+        if to_fetch and bulk_sources:
+            fetched.update(await fetch_bulk_tles(client, to_fetch, bulk_sources))
+        to_fetch = [
+            request for request in to_fetch if request["norad_id"] not in fetched
+        ]
+        if to_fetch and not offline:
+            fetched.update(
+                await fetch_all_tles(client, to_fetch, max_concurrency=max_concurrency)
+            )
+    for request in to_fetch:
+        fetched.setdefault(
+            request["norad_id"],
+            {
+                "norad_id": request["norad_id"],
+                "url": request["url"],
+                "success": False,
+                "no_gp": False,
+                "content": "",
+            },
+        )
+
+    for norad_id, result in fetched.items():
+        result["cached"] = False
+        result["stale"] = False
+        records = parse_tle_text(result["content"]) if result["success"] else []
+        if records:
+            cache[norad_id] = {
+                "content": result["content"],
+                "epoch": tle_epoch(records[0][1]).isoformat(),
+                "fetched_at": now.isoformat(),
+            }
+        elif not result["no_gp"] and norad_id in cache:
+            # Fetch failed: fall back to the last element set we have
+            print(f"  Using stale cached TLE for NORAD {norad_id}")
+            result.update(
+                success=True,
+                content=cache[norad_id]["content"],
+                cached=True,
+                stale=True,
+            )
+        results[norad_id] = result
+
+    # Keep results in request order
+    return {request["norad_id"]: results[request["norad_id"]] for request in requests}
@@ -0,0 +1,154 @@
+"""
+GeoParquet storage of path segments.
+
+Segments are written with a fixed Arrow schema: strings repeated on every
+segment (satellite, constellation, operator, data_repo_url, ...) are
+dictionary-encoded and read back as pandas categoricals, start and end times
+are UTC timestamps, and footprints are WKB geometries with GeoParquet
+metadata, so any GeoParquet reader (GeoPandas, DuckDB, QGIS) can open the file.
+
+Example:
+    segments = load_path_segments(
+        "satellite_paths.parquet",
+        columns=["norad_id", "start_time", "end_time", "geometry"],
+    )
+"""
+
+import json
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pyproj import CRS
+
+CATEGORY = pa.dictionary(pa.int32(), pa.string())
+TIMESTAMP = pa.timestamp("us", tz="UTC")
+
+# Arrow type of every path segment column. Batches appended to one file must
+# share these; a whole frame written at once keeps its own numeric types
+SEGMENT_SCHEMA = pa.schema(
+    [
+        ("norad_id", CATEGORY),
+        ("layer", CATEGORY),
+        ("satellite", CATEGORY),
+        ("start_time", TIMESTAMP),
+        ("end_time", TIMESTAMP),
+        ("geometry", pa.binary()),
+        ("swath_km", pa.float64()),
+        ("constellation", CATEGORY),
+        ("operator", CATEGORY),
+        ("sensor_type", CATEGORY),
+        ("spatial_res_m", pa.float64()),
+        ("data_access", CATEGORY),
+        ("data_repo_type", CATEGORY),
+        ("data_repo_url", CATEGORY),
+        ("tasking", pa.bool_()),
+        ("is_daytime", pa.bool_()),
+    ]
+)
+
+
+def geo_metadata(crs="EPSG:4326"):
+    """GeoParquet 1.0 file metadata for a WKB geometry column"""
+    return {
+        "version": "1.0.0",
+        "primary_column": "geometry",
+        "columns": {
+            "geometry": {
+                "encoding": "WKB",
+                "geometry_types": ["Polygon", "MultiPolygon"],
+                "crs": CRS.from_user_input(crs).to_json_dict(),
+            }
+        },
+    }
+
+
+def segment_schema(columns, crs="EPSG:4326"):
+    """
+    Arrow schema of path segments with the given columns, in that order.
+
+    Args:
+        columns: Column names, all of them in SEGMENT_SCHEMA
+        crs: CRS of the footprints
+
+    Returns:
+        pyarrow.Schema: Schema with GeoParquet metadata
+    """
+    return pa.schema(
+        [SEGMENT_SCHEMA.field(column) for column in columns],
+        metadata={"geo": json.dumps(geo_metadata(crs))},
+    )
+
+
+def segment_table(path_gdf, schema=None):
+    """
+    Convert path segments to an Arrow table.
+
+    Args:
+        path_gdf: Path segments as from generate_path_segments()
+        schema: Table schema (default: the string and time types of
+            segment_schema(), and the frame's own types for other columns,
+            so numbers read back with the same dtype)
+
+    Returns:
+        pyarrow.Table: Segments with WKB footprints
+    """
+    frame = path_gdf.to_wkb()
+    if schema is None:
+        fixed = segment_schema(path_gdf.columns, path_gdf.crs or "EPSG:4326")
+        inferred = pa.Schema.from_pandas(frame, preserve_index=False)
+        schema = pa.schema(
+            [
+                field
+                if field.name == "geometry" or field.type in (CATEGORY, TIMESTAMP)
+                else inferred.field(field.name)
+                for field in fixed
+            ],
+            metadata=fixed.metadata,
+        )
+    # Categoricals from plain strings have sorted categories, so the
+    # dictionaries read back in the same order as the strings sort
+    for field in schema:
+        if pa.types.is_dictionary(field.type):
+            frame[field.name] = frame[field.name].astype("category")
+    return pa.Table.from_pandas(frame, schema=schema, preserve_index=False)
+
+
+def write_path_segments(path_gdf, path):
+    """Write path segments to a GeoParquet file"""
+    pq.write_table(segment_table(path_gdf), path)
+
+
+def path_segments_writer(path, columns, crs="EPSG:4326"):
+    """
+    Open a GeoParquet file to append batches of path segments to.
+
+    Each segment_table() written to it (with the writer's schema) becomes one
+    or more row groups. The caller closes the writer.
+
+    Returns:
+        pyarrow.parquet.ParquetWriter: Writer with segment_schema()
+    """
+    return pq.ParquetWriter(path, segment_schema(columns, crs))
+
+
+def load_path_segments(path, columns=None, filters=None):
+    """
+    Load path segments from a GeoParquet file, memory-mapping it.
+
+    Args:
+        path: File written by write_path_segments() or path_segments_writer()
+        columns: Columns to read (default: all). Include "geometry" to get a
+            GeoDataFrame
+        filters: Row filters in pyarrow.parquet.read_table() form, e.g.
+            [("constellation", "==", "Sentinel-2")]
+
+    Returns:
+        GeoDataFrame: Segments with categorical string columns and
+        datetime64[us, UTC] times (a DataFrame without geometry)
+    """
+    if columns is not None and "geometry" not in columns:
+        return pd.read_parquet(path, columns=columns, filters=filters, memory_map=True)
+    import geopandas as gpd
+
+    return gpd.read_parquet(path, columns=columns, filters=filters, memory_map=True)
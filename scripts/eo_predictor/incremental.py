@@ -0,0 +1,228 @@
+"""
+Incremental runs: slide the previous run's prediction window forward, reusing
+cached path segments of satellites whose inputs did not change.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+
+import geopandas as gpd
+import pandas as pd
+
+from .geoparquet import load_path_segments, write_path_segments
+from .paths import segment_cache_dir
+from .propagation import STEP_MINUTES
+from .run_report import stage
+from .segments import SEGMENT_COLUMNS, generate_path_segments_parallel
+
+# Bump when a change to the pipeline invalidates cached path segments
+SEGMENT_CACHE_VERSION = 3
+
+
+def floor_time(time, step_minutes=STEP_MINUTES):
+    """Round a UTC datetime down onto the sampling grid"""
+    return pd.Timestamp(time).floor(f"{step_minutes}min").to_pydatetime()
+
+
+def satellite_fingerprint(
+    record, daylight_mode, max_error_km=None, field_of_regard=False
+):
+    """
+    Hash everything a satellite's path segments depend on, apart from time.
+
+    Args:
+        record: (name, line1, line2, sat_props) satellite record
+        daylight_mode: "ephemeris" or "subsolar", see is_daytime()
+        max_error_km: Adaptive sampling error, see generate_path_segments()
+        field_of_regard: Whether field of regard footprints are built
+
+    Returns:
+        str: Hex digest identifying the satellite's inputs
+    """
+    name, line1, line2, sat_props = record
+    inputs = {
+        "version": SEGMENT_CACHE_VERSION,
+        "tle": [name, line1, line2],
+        "properties": sat_props,
+        "daylight_mode": daylight_mode,
+        "max_error_km": max_error_km,
+        "field_of_regard": field_of_regard,
+    }
+    return hashlib.sha256(
+        json.dumps(inputs, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def load_segment_cache(cache_dir=segment_cache_dir):
+    """
+    Load path segments and their index from the previous run.
+
+    Returns:
+        tuple: (GeoDataFrame of cached segments or None, index dict with the
+        cached window's start_time and end_time and per-satellite
+        fingerprints keyed by NORAD ID)
+    """
+    segments_path = os.path.join(cache_dir, "segments.parquet")
+    index_path = os.path.join(cache_dir, "index.json")
+    if not (os.path.exists(segments_path) and os.path.exists(index_path)):
+        return None, {}
+    with open(index_path) as f:
+        index = json.load(f)
+    return load_path_segments(segments_path), index
+
+
+def save_segment_cache(
+    path_gdf,
+    start_time,
+    end_time,
+    fingerprints,
+    output_options=None,
+    cache_dir=segment_cache_dir,
+):
+    """
+    Write path segments, their window, input fingerprints and the options
+    of the outputs written from them for the next run.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    write_path_segments(path_gdf, os.path.join(cache_dir, "segments.parquet"))
+    index = {
+        "start_time": start_time.isoformat(),
+        "end_time": end_time.isoformat(),
+        "fingerprints": fingerprints,
+        "output_options": output_options,
+    }
+    with open(os.path.join(cache_dir, "index.json"), "w") as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+
+
+def generate_path_segments_incremental(
+    satellite_records,
+    start_time,
+    end_time,
+    daylight_mode,
+    workers,
+    max_error_km=None,
+    field_of_regard=False,
+    output_options=None,
+):
+    """
+    Slide the previous run's prediction window forward to [start_time, end_time].
+
+    Cached segments that fall before start_time are trimmed. Satellites whose
+    fingerprint (TLE, constellation properties, sampling and daylight modes)
+    is unchanged
+    keep their cached segments and only the new tail after the cached window
+    is propagated. Changed satellites are recomputed over the whole window.
+    start_time and end_time must lie on the sampling grid (see floor_time()),
+    so tail segments line up with the cached ones.
+
+    Args:
+        output_options: JSON-serializable options of the files written from
+            the segments (tiles format, time slices, ...); if they differ
+            from the previous run's, its outputs are out of date even when
+            the segments are not
+
+    Returns:
+        tuple: (GeoDataFrame as from generate_path_segments(), bool that is
+        True if nothing changed since the previous run)
+    """
+    fingerprints = {
+        str(record[3]["norad_id"]): satellite_fingerprint(
+            record, daylight_mode, max_error_km, field_of_regard
+        )
+        for record in satellite_records
+    }
+    with stage("segment_cache") as record:
+        cached_gdf, index = load_segment_cache()
+        record["items"] = 0 if cached_gdf is None else len(cached_gdf)
+    cached_fingerprints = {}
+    cached_start = cached_end = None
+    if cached_gdf is not None:
+        cached_start = datetime.fromisoformat(index["start_time"])
+        cached_end = datetime.fromisoformat(index["end_time"])
+        # The cache is only usable if the new window starts inside it
+        if cached_start <= start_time < cached_end:
+            cached_fingerprints = index["fingerprints"]
+
+    unchanged = {
+        norad_id
+        for norad_id, fingerprint in fingerprints.items()
+        if cached_fingerprints.get(norad_id) == fingerprint
+    }
+    changed_records = [
+        record
+        for record in satellite_records
+        if str(record[3]["norad_id"]) not in unchanged
+    ]
+    unchanged_records = [
+        record
+        for record in satellite_records
+        if str(record[3]["norad_id"]) in unchanged
+    ]
+    print(
+        f"\n{len(unchanged)} satellites unchanged since the last run, "
+        f"{len(changed_records)} to recompute"
+    )
+
+    results = []
+    tail_start = None
+    if unchanged:
+        # Trim the expired head (and anything past a shortened window),
+        # keeping adaptively sampled segments that straddle the window start
+        results.append(
+            cached_gdf[
+                cached_gdf["norad_id"].isin(unchanged)
+                & (cached_gdf["end_time"] > start_time)
+                & (cached_gdf["start_time"] < end_time)
+            ]
+        )
+        if cached_end < end_time:
+            tail_start = cached_end
+            print(
+                f"Propagating the new tail {tail_start.isoformat()} to "
+                f"{end_time.isoformat()} for unchanged satellites"
+            )
+            results.append(
+                generate_path_segments_parallel(
+                    unchanged_records,
+                    tail_start,
+                    end_time,
+                    daylight_mode,
+                    workers,
+                    max_error_km,
+                    field_of_regard,
+                )
+            )
+    if changed_records:
+        results.append(
+            generate_path_segments_parallel(
+                changed_records,
+                start_time,
+                end_time,
+                daylight_mode,
+                workers,
+                max_error_km,
+                field_of_regard,
+            )
+        )
+    if results:
+        path_gdf = gpd.GeoDataFrame(
+            pd.concat(results, ignore_index=True), geometry="geometry", crs="EPSG:4326"
+        ).sort_values(["satellite", "start_time"], kind="stable", ignore_index=True)
+    else:
+        path_gdf = gpd.GeoDataFrame(
+            columns=SEGMENT_COLUMNS, geometry="geometry", crs="EPSG:4326"
+        )
+
+    with stage("segment_cache") as record:
+        save_segment_cache(path_gdf, start_time, end_time, fingerprints, output_options)
+        record["items"] = len(path_gdf)
+    up_to_date = (
+        not changed_records
+        and fingerprints.keys() == cached_fingerprints.keys()
+        and (cached_start, cached_end) == (start_time, end_time)
+        and index.get("output_options") == output_options
+    )
+    return path_gdf, up_to_date
@@ -0,0 +1,249 @@
+"""
+Summaries of path segments and newline-delimited GeoJSON output, including
+streaming generation that holds one shard of segments in memory at a time.
+"""
+
+import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+
+import geopandas as gpd
+import pandas as pd
+import shapely
+
+from .geoparquet import path_segments_writer, segment_table
+from .pass_index import PASS_INDEX_COLUMNS, build_pass_index
+from .propagation import SATELLITE_METADATA_COLUMNS
+from .run_report import configure_profiling, merge_stages, profiling_options, stage
+from .segments import SEGMENT_COLUMNS, TILE_LAYER, process_shard
+
+# Path segment properties summarized into the metadata file, in order of
+# first appearance
+SUMMARY_COLUMNS = [
+    "satellite",
+    "constellation",
+    "operator",
+    "sensor_type",
+    "data_access",
+    "spatial_res_m",
+]
+
+
+# Properties of path segments written with a satellite table: the satellite's
+# NORAD ID, and what varies along its track
+COMPACT_COLUMNS = ["sat_id", "start_time", "end_time", "geometry", "is_daytime"]
+
+
+def summarize_path_segments(path_gdf, summary=None):
+    """
+    Summarize path segments for the metadata file.
+
+    Args:
+        path_gdf: Path segments as from generate_path_segments()
+        summary: Summary of earlier path segments to extend, if any
+
+    Returns:
+        dict: Unique values of each SUMMARY_COLUMNS column, the time range
+        (min_time, max_time), the start of the last segment (last_start_time),
+        the segment count, and the satellite table: the properties
+        (SATELLITE_METADATA_COLUMNS) of each satellite keyed by NORAD ID
+    """
+    if summary is None:
+        summary = {column: [] for column in SUMMARY_COLUMNS}
+        summary.update(
+            min_time=None,
+            max_time=None,
+            last_start_time=None,
+            count=0,
+            satellite_table={},
+        )
+    if path_gdf.empty:
+        return summary
+
+    for column in SUMMARY_COLUMNS:
+        summary[column] = list(
+            dict.fromkeys(summary[column] + path_gdf[column].unique().tolist())
+        )
+    min_time = path_gdf["start_time"].min()
+    max_time = path_gdf["end_time"].max()
+    last_start_time = path_gdf["start_time"].max()
+    if summary["count"]:
+        min_time = min(summary["min_time"], min_time)
+        max_time = max(summary["max_time"], max_time)
+        last_start_time = max(summary["last_start_time"], last_start_time)
+    summary.update(
+        min_time=min_time, max_time=max_time, last_start_time=last_start_time
+    )
+    summary["count"] += len(path_gdf)
+
+    satellites = path_gdf.drop_duplicates("norad_id")
+    satellites = satellites[["norad_id", *SATELLITE_METADATA_COLUMNS]].astype(object)
+    satellites = satellites.where(satellites.notna(), None)
+    for record in satellites.to_dict("records"):
+        summary["satellite_table"][str(record.pop("norad_id"))] = record
+    return summary
+
+
+def compact_segments(path_gdf):
+    """
+    Reduce path segments to the properties of COMPACT_COLUMNS, for output
+    with a satellite table. sat_id is the NORAD ID, which keys the table of
+    the other properties in the metadata file, see summarize_path_segments().
+    """
+    compact_gdf = path_gdf.rename(columns={"norad_id": "sat_id"})
+    compact_gdf["sat_id"] = compact_gdf["sat_id"].astype(str).astype(int)
+    layer_columns = ["layer"] if "layer" in compact_gdf else []
+    return compact_gdf[[*layer_columns, *COMPACT_COLUMNS]]
+
+
+def layer_frames(path_gdf):
+    """
+    Split path segments by tile layer.
+
+    Returns:
+        dict: Frame of each layer's footprints, without the layer column,
+        keyed by layer name
+    """
+    return {
+        layer: group.drop(columns="layer")
+        for layer, group in path_gdf.groupby("layer", sort=False)
+    }
+
+
+def format_timestamps(timestamps):
+    """
+    Format UTC timestamps like the GeoJSON driver does: ISO 8601 with
+    milliseconds (omitted when zero) and a Z suffix. The map filters compare
+    these strings against JavaScript ISO strings.
+    """
+    text = timestamps.dt.strftime("%Y-%m-%dT%H:%M:%S.%f").str[:-3]
+    return text.str.removesuffix(".000") + "Z"
+
+
+def write_ndjson_features(path_gdf, f):
+    """Append path segments to an open newline-delimited GeoJSON file"""
+    properties = path_gdf.drop(columns="geometry")
+    for column in ["start_time", "end_time"]:
+        properties[column] = format_timestamps(properties[column])
+    properties = properties.astype(object).where(properties.notna(), None)
+    geometries = shapely.to_geojson(path_gdf.geometry.to_numpy())
+    for record, geometry in zip(properties.to_dict("records"), geometries):
+        f.write(
+            f'{{"type": "Feature", "properties": {json.dumps(record)}, '
+            f'"geometry": {geometry}}}\n'
+        )
+
+
+def bounded_map(executor, fn, shards, arguments, window):
+    """
+    Like executor.map(fn, shards), with at most window shards in flight.
+
+    Results are yielded in order, and a shard is only submitted once an
+    earlier result has been taken, so finished results never pile up ahead
+    of the consumer.
+    """
+    pending = deque()
+    for shard in shards:
+        pending.append(executor.submit(fn, shard, *arguments))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def stream_path_segments(
+    satellite_records,
+    start_time,
+    end_time,
+    daylight_mode,
+    workers,
+    output_paths,
+    max_error_km=None,
+    pass_index_zoom=None,
+    field_of_regard=False,
+    geoparquet_output=None,
+    satellite_table=False,
+):
+    """
+    Generate path segments one satellite at a time, appending each satellite's
+    segments to newline-delimited GeoJSON files as soon as they are built.
+
+    Only one satellite's positions and segments are held in memory at a time
+    (about two per worker with a process pool, see bounded_map()). Satellites are processed in name
+    order, so features come out in the same order as a non-streaming run.
+
+    Args:
+        output_paths: Output file of each tile layer, keyed by layer name
+        pass_index_zoom: If given, also build a pass index at this grid zoom
+            from each satellite's segments, see build_pass_index()
+        field_of_regard: Also build field of regard footprints, see
+            generate_path_segments()
+        geoparquet_output: If given, also append every satellite's segments
+            to this GeoParquet file, one row group per satellite
+        satellite_table: Write only COMPACT_COLUMNS, see compact_segments()
+
+    Returns:
+        tuple: (dict summary of all written swath segments, see
+        summarize_path_segments(), and the pass index DataFrame or None)
+    """
+    satellite_records = sorted(satellite_records, key=lambda record: record[0] or "")
+    shards = [[record] for record in satellite_records]
+    arguments = [start_time, end_time, daylight_mode, max_error_km, field_of_regard]
+    if workers > 1:
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=configure_profiling,
+            initargs=profiling_options(),
+        )
+        results = bounded_map(executor, process_shard, shards, arguments, 2 * workers)
+    else:
+        executor = None
+        results = (process_shard(shard, *arguments) for shard in shards)
+
+    print(f"\nStreaming path segments to {', '.join(output_paths.values())}...")
+    summary = summarize_path_segments(gpd.GeoDataFrame())
+    pass_indexes = []
+    writer = None
+    with ExitStack() as stack:
+        if executor is not None:
+            stack.callback(executor.shutdown)
+        files = {
+            layer: stack.enter_context(open(path, "w"))
+            for layer, path in output_paths.items()
+        }
+        if geoparquet_output is not None:
+            writer = stack.enter_context(
+                path_segments_writer(geoparquet_output, SEGMENT_COLUMNS)
+            )
+        for path_gdf, stages in results:
+            merge_stages(stages)
+            if writer is not None and not path_gdf.empty:
+                with stage("geoparquet_write") as record:
+                    writer.write_table(segment_table(path_gdf, writer.schema))
+                    record["items"] = len(path_gdf)
+            layers = layer_frames(path_gdf)
+            swath_gdf = layers.get(TILE_LAYER, path_gdf.iloc[:0])
+            if pass_index_zoom is not None:
+                with stage("pass_index") as record:
+                    pass_indexes.append(build_pass_index(swath_gdf, pass_index_zoom))
+                    record["items"] = len(pass_indexes[-1])
+            with stage("ndjson_write") as record:
+                for layer, layer_gdf in layers.items():
+                    if satellite_table:
+                        layer_gdf = compact_segments(layer_gdf)
+                    else:
+                        layer_gdf = layer_gdf.drop(columns="norad_id")
+                    write_ndjson_features(layer_gdf, files[layer])
+                record["items"] = len(path_gdf)
+            summary = summarize_path_segments(swath_gdf, summary)
+    print(f"Wrote {summary['count']} path segments")
+
+    pass_index = None
+    if pass_index_zoom is not None and not pass_indexes:
+        pass_index = pd.DataFrame(columns=PASS_INDEX_COLUMNS)
+    elif pass_index_zoom is not None:
+        pass_index = pd.concat(pass_indexes, ignore_index=True).sort_values(
+            ["cell", "start_time"], kind="stable", ignore_index=True
+        )
+    return summary, pass_index
@@ -0,0 +1,643 @@
+"""
+Pass events: when each satellite can image each area of interest (AOI).
+
+A satellite can image a site while the off-nadir angle it would have to
+point at is within its field of regard: the larger of the constellation's
+off_nadir_deg and the angle to the edge of its swath. For every satellite
+and site, a pass event records the entry and exit times of that interval,
+the time of closest approach and the off-nadir angle needed at closest
+approach. Polygon and line AOIs can be imaged while any part of them is in
+reach: their entry and exit times come from points along their outline and
+from the track crossing polygons, and closest approach from their centroid.
+
+Tracks are propagated on a coarse time grid that is shared by all sites.
+Candidate passes come from local minima of the angular distance between
+site and sub-satellite point. Closest approach is then refined by golden-
+section search, and entry and exit by bisection, propagating all candidate
+events of a satellite together at each step. Off-nadir angles are measured
+from the geocentric nadir.
+
+Example:
+    aois = load_aois("sites.csv")
+    events = find_pass_events(satellite, aois, start_time, end_time)
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from skyfield.api import wgs84
+from skyfield.constants import DAY_S
+from skyfield.sgp4lib import theta_GMST1982
+
+from .run_report import (
+    collect_stages,
+    configure_profiling,
+    merge_stages,
+    profiling_options,
+    stage,
+)
+from .tle import create_satellite
+
+# Mean Earth radius, used to convert swath widths to angles
+EARTH_RADIUS_KM = 6371.0
+
+# First eccentricity squared of the WGS84 ellipsoid
+WGS84_E2 = 6.69437999014e-3
+
+# Coarse sampling interval of the tracks before refinement
+PASS_EVENT_STEP_SECONDS = 60
+
+# Precision of the refined entry, exit and closest approach times
+PASS_EVENT_TOLERANCE_SECONDS = 0.1
+
+# Spacing of the points along polygon and line AOIs, about 11 km
+AOI_BOUNDARY_SPACING_DEG = 0.1
+
+# Sites processed at once, bounding the (sites x samples) working arrays
+PASS_EVENT_CHUNK_SIZE = 1000
+
+PASS_EVENT_COLUMNS = [
+    "aoi_id",
+    "norad_id",
+    "satellite",
+    "constellation",
+    "entry_time",
+    "closest_time",
+    "exit_time",
+    "off_nadir_deg",
+    "field_of_regard_deg",
+]
+
+# Golden ratio conjugate for golden-section search
+INVERSE_PHI = (np.sqrt(5) - 1) / 2
+
+
+def load_aois(path, id_column="id"):
+    """
+    Load areas of interest from a CSV of points or any file GeoPandas reads.
+
+    CSV files need lat and lon columns (or latitude and longitude). Polygons
+    and lines are targeted at their centroid and at points every
+    AOI_BOUNDARY_SPACING_DEG along their outline, see find_pass_events().
+
+    Args:
+        path: AOI file path
+        id_column: Column identifying each AOI (default: row number)
+
+    Returns:
+        DataFrame: One row per target point (aoi_id, lat, lon, centroid,
+        geometry), indexed by AOI row number so that the points of an AOI
+        share their index label. geometry is set on the centroid rows of
+        polygons and lines
+    """
+    if os.path.splitext(path)[1].lower() == ".csv":
+        aois = pd.read_csv(path).rename(columns={"latitude": "lat", "longitude": "lon"})
+        aoi_ids = aois[id_column] if id_column in aois else pd.RangeIndex(len(aois))
+        return pd.DataFrame(
+            {
+                "aoi_id": np.asarray(aoi_ids).astype(str),
+                "lat": aois["lat"].to_numpy().astype(float),
+                "lon": aois["lon"].to_numpy().astype(float),
+                "centroid": True,
+            }
+        )
+
+    # GeoPandas is only needed for non-CSV files
+    import geopandas as gpd
+    import shapely
+
+    aois = gpd.read_file(path).to_crs("EPSG:4326")
+    aoi_ids = aois[id_column] if id_column in aois else pd.RangeIndex(len(aois))
+    aoi_ids = np.asarray(aoi_ids).astype(str)
+    geometries = aois.geometry.to_numpy()
+    centroids = shapely.centroid(geometries)
+    outlined = np.flatnonzero(shapely.get_dimensions(geometries) > 0)
+    outlines, outline_index = shapely.get_coordinates(
+        shapely.segmentize(geometries[outlined], AOI_BOUNDARY_SPACING_DEG),
+        return_index=True,
+    )
+    outline_index = outlined[outline_index]
+    return pd.concat(
+        [
+            pd.DataFrame(
+                {
+                    "aoi_id": aoi_ids,
+                    "lat": shapely.get_y(centroids).astype(float),
+                    "lon": shapely.get_x(centroids).astype(float),
+                    "centroid": True,
+                    "geometry": np.where(
+                        shapely.get_dimensions(geometries) > 0, geometries, None
+                    ),
+                }
+            ),
+            pd.DataFrame(
+                {
+                    "aoi_id": aoi_ids[outline_index],
+                    "lat": outlines[:, 1].astype(float),
+                    "lon": outlines[:, 0].astype(float),
+                    "centroid": False,
+                    "geometry": None,
+                },
+                index=outline_index,
+            ),
+        ]
+    )
+
+
+def field_of_regard_deg(off_nadir_deg, swath_km, altitude_km):
+    """
+    Largest off-nadir angle at which a satellite can image a site.
+
+    Satellites that cannot point off nadir (off_nadir_deg of 0) still image
+    everything inside their swath, so the field of regard is never narrower
+    than the swath.
+    """
+    half_swath = swath_km / 2 / EARTH_RADIUS_KM
+    swath_angle = np.degrees(
+        np.arctan2(
+            EARTH_RADIUS_KM * np.sin(half_swath),
+            EARTH_RADIUS_KM + altitude_km - EARTH_RADIUS_KM * np.cos(half_swath),
+        )
+    )
+    return max(off_nadir_deg or 0, swath_angle)
+
+
+def off_nadir_angle(cos_distance, satellite_radius, site_radius):
+    """
+    Off-nadir angle in radians from satellite to site.
+
+    Args:
+        cos_distance: Cosine of the angular distance between the site and the
+            sub-satellite point, seen from the Earth's centre
+        satellite_radius: Geocentric distance of the satellite in km
+        site_radius: Geocentric distance of the site in km
+
+    Returns:
+        ndarray: Off-nadir angles, or pi where the site is below the horizon
+    """
+    sin_distance = np.sqrt(np.clip(1 - cos_distance**2, 0, None))
+    angle = np.arctan2(
+        site_radius * sin_distance, satellite_radius - site_radius * cos_distance
+    )
+    return np.where(cos_distance * satellite_radius > site_radius, angle, np.pi)
+
+
+def max_ground_distance(off_nadir, satellite_radius, site_radius):
+    """Angular distance in radians from the sub-satellite point at an off-nadir angle"""
+    sin_site = np.minimum(satellite_radius / site_radius * np.sin(off_nadir), 1)
+    return np.arcsin(sin_site) - off_nadir
+
+
+def time_origin(sat, start_time):
+    """
+    SGP4 time origin of a prediction window.
+
+    Returns:
+        tuple: (UTC Julian date and day fraction of start_time, UT1 - UTC in
+        days)
+    """
+    day_ns = 86_400 * 10**9
+    days, remainder = divmod(pd.Timestamp(start_time).value, day_ns)
+    dut1 = sat.epoch.ts.from_datetime(start_time).dut1
+    return 2440587.5 + days, remainder / day_ns, dut1 / DAY_S
+
+
+def satellite_xyz(model, origin, seconds):
+    """
+    Earth-fixed positions in km of a satellite, shape (3, len(seconds)).
+
+    SGP4 output is rotated by Greenwich mean sidereal time alone, skipping
+    the precession-nutation round trip through GCRS that dominates the cost
+    of Skyfield's ITRS positions (they agree to well under a metre).
+
+    Args:
+        model: SGP4 model of the satellite (sat.model)
+        origin: Time origin from time_origin()
+        seconds: Offsets in seconds from the origin
+    """
+    jd, fraction, ut1_offset = origin
+    fraction = fraction + np.asarray(seconds, dtype=float) / DAY_S
+    whole = np.full(fraction.shape, jd)
+    _, position, _ = model.sgp4_array(whole, fraction)
+    theta, _ = theta_GMST1982(whole, fraction + ut1_offset)
+    x, y, z = position.T
+    return np.array(
+        [
+            np.cos(theta) * x + np.sin(theta) * y,
+            np.cos(theta) * y - np.sin(theta) * x,
+            z,
+        ]
+    )
+
+
+def subsatellite_point(model, origin, seconds):
+    """
+    Geodetic latitudes and longitudes in degrees of the geocentric nadir of a
+    satellite, see satellite_xyz()
+    """
+    x, y, z = satellite_xyz(model, origin, seconds)
+    lat = np.arctan(z / np.hypot(x, y) / (1 - WGS84_E2))
+    return np.degrees(lat), np.degrees(np.arctan2(y, x))
+
+
+def event_off_nadir(model, origin, seconds, site_xyz):
+    """Off-nadir angles in radians from a satellite to one site per time"""
+    position = satellite_xyz(model, origin, seconds)
+    satellite_radius = np.linalg.norm(position, axis=0)
+    site_radius = np.linalg.norm(site_xyz, axis=0)
+    cos_distance = np.sum(position * site_xyz, axis=0) / (
+        satellite_radius * site_radius
+    )
+    return off_nadir_angle(cos_distance, satellite_radius, site_radius)
+
+
+def minimize_off_nadir(model, origin, lo, hi, site_xyz, tolerance):
+    """
+    Golden-section search for the time of smallest off-nadir angle.
+
+    Every event is searched at once: each iteration propagates the satellite
+    once for all events.
+
+    Returns:
+        tuple: (times in seconds, off-nadir angles in radians)
+    """
+    lo, hi = lo.astype(float), hi.astype(float)
+    iterations = int(
+        np.ceil(
+            np.log(tolerance / max(np.max(hi - lo), tolerance)) / np.log(INVERSE_PHI)
+        )
+    )
+    a = hi - INVERSE_PHI * (hi - lo)
+    b = lo + INVERSE_PHI * (hi - lo)
+    fa = event_off_nadir(model, origin, a, site_xyz)
+    fb = event_off_nadir(model, origin, b, site_xyz)
+    for _ in range(iterations):
+        left = fa <= fb
+        hi = np.where(left, b, hi)
+        lo = np.where(left, lo, a)
+        # The surviving interior point is reused; only one new point per event
+        new = np.where(left, hi - INVERSE_PHI * (hi - lo), lo + INVERSE_PHI * (hi - lo))
+        f_new = event_off_nadir(model, origin, new, site_xyz)
+        a, b, fa, fb = (
+            np.where(left, new, b),
+            np.where(left, a, new),
+            np.where(left, f_new, fb),
+            np.where(left, fa, f_new),
+        )
+    left = fa <= fb
+    return np.where(left, a, b), np.where(left, fa, fb)
+
+
+def bisect_crossing(model, origin, outside, inside, site_xyz, limit, tolerance):
+    """
+    Bisect for the time the off-nadir angle crosses limit.
+
+    Args:
+        outside: Times in seconds where the angle exceeds limit
+        inside: Times in seconds where it does not (before or after outside)
+
+    Returns:
+        ndarray: Crossing times in seconds
+    """
+    outside, inside = outside.astype(float), inside.astype(float)
+    width = np.max(np.abs(inside - outside), initial=0)
+    for _ in range(int(np.ceil(np.log2(max(width / tolerance, 1))))):
+        middle = (outside + inside) / 2
+        is_outside = event_off_nadir(model, origin, middle, site_xyz) > limit
+        outside = np.where(is_outside, middle, outside)
+        inside = np.where(is_outside, inside, middle)
+    return (outside + inside) / 2
+
+
+def find_crossings(model, origin, closest, width, duration, site_xyz, limit, tolerance):
+    """
+    Find when passes enter (negative width) or leave (positive width) reach.
+
+    Each pass is bracketed between its closest approach and width seconds
+    before or after it, widening the bracket until the far end is out of
+    reach. Passes still in reach at the edge of the window are clipped to it.
+
+    Returns:
+        ndarray: Crossing times in seconds
+    """
+    width = np.full(len(closest), float(width))
+    while True:
+        bound = np.clip(closest + width, 0, duration)
+        inside = event_off_nadir(model, origin, bound, site_xyz) <= limit
+        widen = inside & (bound > 0) & (bound < duration)
+        if not widen.any():
+            break
+        width[widen] *= 2
+
+    crossing = bound.copy()
+    crossing[~inside] = bisect_crossing(
+        model,
+        origin,
+        bound[~inside],
+        closest[~inside],
+        site_xyz[:, ~inside],
+        limit,
+        tolerance,
+    )
+    return crossing
+
+
+def find_pass_events(
+    sat,
+    aois,
+    start_time,
+    end_time,
+    step_seconds=PASS_EVENT_STEP_SECONDS,
+    tolerance_seconds=PASS_EVENT_TOLERANCE_SECONDS,
+    chunk_size=PASS_EVENT_CHUNK_SIZE,
+):
+    """
+    Find every pass of a satellite over a batch of AOIs.
+
+    Args:
+        sat: Skyfield satellite with constellation properties attached
+        aois: AOIs from load_aois(). Rows sharing an index label are points
+            of one AOI, see merge_aoi_events()
+        start_time: datetime in UTC
+        end_time: datetime in UTC
+        step_seconds: Coarse sampling interval of the track
+        tolerance_seconds: Precision of the refined event times
+        chunk_size: Number of AOIs processed at once
+
+    Returns:
+        DataFrame: Pass events (PASS_EVENT_COLUMNS). Passes already in
+        progress at start_time or still in progress at end_time are clipped
+        to the window
+    """
+    field_of_regard = field_of_regard_deg(
+        sat.off_nadir_deg, sat.swath_km, sat.altitude_km
+    )
+    limit = np.radians(field_of_regard)
+    duration = (end_time - start_time).total_seconds()
+    seconds = np.append(np.arange(0, duration, step_seconds), duration)
+    model, origin = sat.model, time_origin(sat, start_time)
+    position = satellite_xyz(model, origin, seconds)
+    satellite_radius = np.linalg.norm(position, axis=0)
+    direction = position / satellite_radius
+
+    # The track moves at most step_distance (angularly) between samples, so
+    # the closest sample to a pass is at most half of it further away than
+    # the point of closest approach
+    step_distance = np.arccos(
+        np.clip(np.sum(direction[:, 1:] * direction[:, :-1], axis=0), -1, 1)
+    )
+    margin = np.max(step_distance, initial=0) / 2
+    speed = np.min(step_distance / np.diff(seconds), initial=np.inf)
+
+    site_xyz_all = wgs84.latlon(aois["lat"].to_numpy(), aois["lon"].to_numpy())
+    site_xyz_all = site_xyz_all.itrs_xyz.km
+    events = []
+    for chunk_start in range(0, len(aois), chunk_size):
+        site_xyz = site_xyz_all[:, chunk_start : chunk_start + chunk_size]
+        site_radius = np.linalg.norm(site_xyz, axis=0)
+        reach = max_ground_distance(
+            limit, np.max(satellite_radius), np.min(site_radius)
+        )
+
+        # Candidate passes: local minima of the distance to the track (maxima
+        # of its cosine) that may come within reach between samples
+        cos_distance = (site_xyz / site_radius).T @ direction
+        previous = np.pad(cos_distance, ((0, 0), (1, 0)), constant_values=-np.inf)
+        following = np.pad(cos_distance, ((0, 0), (0, 1)), constant_values=-np.inf)
+        candidates = (
+            (cos_distance > previous[:, :-1])
+            & (cos_distance >= following[:, 1:])
+            & (cos_distance >= np.cos(min(reach + margin, np.pi)))
+        )
+        sites, samples = np.nonzero(candidates)
+        if not len(sites):
+            continue
+
+        event_xyz = site_xyz[:, sites]
+        closest, closest_angle = minimize_off_nadir(
+            model,
+            origin,
+            seconds[np.maximum(samples - 1, 0)],
+            seconds[np.minimum(samples + 1, len(seconds) - 1)],
+            event_xyz,
+            tolerance_seconds,
+        )
+        visible = closest_angle <= limit
+        sites, event_xyz = sites[visible], event_xyz[:, visible]
+        closest, closest_angle = closest[visible], closest_angle[visible]
+
+        # Within reach the site is at most reach from the track at closest
+        # approach, so it is out of reach again once the track has moved
+        # twice that far
+        width = max(2 * reach / speed, step_seconds)
+        entry, exit_ = (
+            find_crossings(
+                model,
+                origin,
+                closest,
+                side * width,
+                duration,
+                event_xyz,
+                limit,
+                tolerance_seconds,
+            )
+            for side in (-1, 1)
+        )
+
+        events.append(
+            pd.DataFrame(
+                {
+                    "target": chunk_start + sites,
+                    "aoi_id": aois["aoi_id"].to_numpy()[chunk_start + sites],
+                    "entry_time": entry,
+                    "closest_time": closest,
+                    "exit_time": exit_,
+                    "off_nadir_deg": np.degrees(closest_angle),
+                }
+            )
+        )
+
+    if not events:
+        return pd.DataFrame(columns=PASS_EVENT_COLUMNS)
+    events = merge_aoi_events(
+        pd.concat(events, ignore_index=True), aois, model, origin, duration
+    )
+    start = pd.Timestamp(start_time)
+    for column in ["entry_time", "closest_time", "exit_time"]:
+        events[column] = start + pd.to_timedelta(events[column], unit="s")
+    events = events.assign(
+        norad_id=str(sat.model.satnum),
+        satellite=sat.name,
+        constellation=sat.constellation,
+        field_of_regard_deg=field_of_regard,
+    )
+    return events[PASS_EVENT_COLUMNS]
+
+
+def merge_aoi_events(events, aois, model, origin, duration):
+    """
+    Merge the pass events of the points of each AOI into passes over the AOI.
+
+    Events of points sharing an AOI index label are one pass while they
+    overlap, or while the track is inside the AOI's polygon in between (its
+    interior is in reach even when no outline point is). Passes run from the
+    earliest entry to the latest exit, and their closest approach and
+    off-nadir angle are those of the AOI's centroid, or of its nearest point
+    when the centroid stays out of reach.
+
+    Args:
+        events: Events with times in seconds and the row ("target") of the
+            point in aois
+        aois: AOIs from load_aois()
+        model: SGP4 model of the satellite (sat.model)
+        origin: Time origin from time_origin()
+        duration: Length of the window in seconds
+
+    Returns:
+        DataFrame: Events with one row per pass over each AOI
+    """
+    if aois.index.is_unique:
+        return events.drop(columns="target")
+    centroid = aois["centroid"] if "centroid" in aois else pd.Series(True, aois.index)
+    events = events.assign(
+        aoi=aois.index.to_numpy()[events["target"]],
+        centroid=centroid.to_numpy()[events["target"]],
+    ).sort_values(["aoi", "entry_time"], kind="stable", ignore_index=True)
+
+    # Latest exit so far of each AOI, and whether the track is inside the
+    # AOI's polygon then and at the start of the window
+    latest_exit = events.groupby("aoi", sort=False)["exit_time"].cummax()
+    inside_exit = np.zeros(len(events), dtype=bool)
+    inside_start = np.zeros(len(events), dtype=bool)
+    if "geometry" in aois:
+        import shapely
+
+        polygons = aois.loc[aois["geometry"].notna(), "geometry"]
+        polygons = polygons[~polygons.index.duplicated()]
+        polygons = polygons.reindex(events["aoi"]).to_numpy()
+        has_polygon = pd.notna(polygons)
+        if has_polygon.any():
+            lat, lon = subsatellite_point(model, origin, latest_exit)
+            inside_exit[has_polygon] = shapely.contains_xy(
+                polygons[has_polygon], lon[has_polygon], lat[has_polygon]
+            )
+            lat, lon = subsatellite_point(model, origin, np.zeros(1))
+            inside_start[has_polygon] = shapely.contains_xy(
+                polygons[has_polygon], lon[0], lat[0]
+            )
+
+    # A new pass starts after the previous events have all been exited, with
+    # the track outside the polygon
+    previous_exit = latest_exit.groupby(events["aoi"]).shift()
+    previous_inside = (
+        pd.Series(inside_exit).groupby(events["aoi"]).shift(fill_value=False)
+    )
+    events["pass"] = (
+        ~((events["entry_time"] <= previous_exit) | previous_inside)
+    ).cumsum()
+    # Passes the window starts or ends inside the polygon of are clipped to it
+    first = ~events["aoi"].duplicated()
+    last = ~events["aoi"].duplicated(keep="last")
+    events.loc[first & inside_start, "entry_time"] = 0.0
+    events.loc[last & inside_exit, "exit_time"] = duration
+
+    passes = events.groupby("pass")
+    return (
+        events.sort_values(
+            ["pass", "centroid", "off_nadir_deg"],
+            ascending=[True, False, True],
+            kind="stable",
+        )
+        .drop_duplicates("pass")
+        .assign(
+            entry_time=lambda df: df["pass"].map(passes["entry_time"].min()),
+            exit_time=lambda df: df["pass"].map(passes["exit_time"].max()),
+        )
+        .drop(columns=["target", "aoi", "centroid", "pass"])
+        .reset_index(drop=True)
+    )
+
+
+def find_all_pass_events(satellites, aois, start_time, end_time, **kwargs):
+    """
+    Find the passes of every satellite over a batch of AOIs.
+
+    Returns:
+        DataFrame: Pass events (PASS_EVENT_COLUMNS) ordered by closest
+        approach time
+    """
+    events = [
+        find_pass_events(sat, aois, start_time, end_time, **kwargs)
+        for sat in satellites
+    ]
+    if not events:
+        return pd.DataFrame(columns=PASS_EVENT_COLUMNS)
+    return pd.concat(events, ignore_index=True).sort_values(
+        ["closest_time", "aoi_id", "satellite"], kind="stable", ignore_index=True
+    )
+
+
+def process_pass_events_shard(satellite_records, aois, start_time, end_time):
+    """
+    Worker entry point: find pass events for a shard of satellites.
+
+    Returns:
+        tuple: (DataFrame as from find_all_pass_events(), dict of the stages
+        run, for merge_stages() in the parent process)
+    """
+    with collect_stages() as stages, stage("pass_events") as record:
+        satellites = [create_satellite(*args) for args in satellite_records]
+        events = find_all_pass_events(satellites, aois, start_time, end_time)
+        record["items"] = len(events)
+    return events, stages
+
+
+def find_pass_events_parallel(satellite_records, aois, start_time, end_time, workers):
+    """
+    Shard satellites across a process pool to find their pass events over AOIs.
+
+    Returns:
+        DataFrame: Pass events ordered by closest approach time, see
+        find_all_pass_events()
+    """
+    if workers <= 1 or len(satellite_records) <= 1:
+        events, stages = process_pass_events_shard(
+            satellite_records, aois, start_time, end_time
+        )
+        merge_stages(stages)
+        return events
+
+    n_shards = min(len(satellite_records), workers * 4)
+    shards = [
+        [satellite_records[i] for i in shard]
+        for shard in np.array_split(np.arange(len(satellite_records)), n_shards)
+    ]
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=configure_profiling,
+        initargs=profiling_options(),
+    ) as executor:
+        results = []
+        for events, stages in executor.map(
+            process_pass_events_shard,
+            shards,
+            [aois] * len(shards),
+            [start_time] * len(shards),
+            [end_time] * len(shards),
+        ):
+            merge_stages(stages)
+            results.append(events)
+
+    return pd.concat(results, ignore_index=True).sort_values(
+        ["closest_time", "aoi_id", "satellite"], kind="stable", ignore_index=True
+    )
+
+
+def write_pass_events(events, path):
+    """Write pass events to CSV if path ends in .csv, otherwise to Parquet"""
+    if os.path.splitext(path)[1].lower() == ".csv":
+        events.to_csv(path, index=False, date_format="%Y-%m-%dT%H:%M:%S.%fZ")
+    else:
+        events.to_parquet(path, index=False)
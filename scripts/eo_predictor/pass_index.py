@@ -0,0 +1,283 @@
+"""
+Pass index: when each satellite's swath covers each cell of a global grid.
+
+Cells are Web Mercator tiles at a single zoom level, identified by their
+quadkey read as a base-4 integer. The index holds one row per pass interval
+(cell, norad_id, satellite, constellation, start_time, end_time), sorted by
+cell then start time, so finding the passes over a cell is a binary search.
+Queries are answered at cell resolution: a pass over any part of a cell that
+touches the area of interest is returned.
+
+Example:
+    index = load_pass_index("../public/pass_index.parquet")
+    passes = query_passes(index, (-112.2, 40.5, -111.7, 40.9), hours=24)
+"""
+
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import shapely
+
+# Default grid zoom: tiles are ~600 km across at the equator
+PASS_INDEX_ZOOM = 6
+
+# Latitude limit of the Web Mercator grid
+MAX_LATITUDE = 85.0511287798066
+
+PASS_INDEX_COLUMNS = [
+    "cell",
+    "norad_id",
+    "satellite",
+    "constellation",
+    "start_time",
+    "end_time",
+]
+
+
+def lon_to_tile_x(lon_degrees, zoom):
+    """Tile column of each longitude at a zoom level"""
+    n = 2**zoom
+    x = np.floor((np.asarray(lon_degrees) + 180) / 360 * n)
+    return np.clip(x, 0, n - 1).astype(np.int64)
+
+
+def lat_to_tile_y(lat_degrees, zoom):
+    """Tile row of each latitude at a zoom level (row 0 is the north edge)"""
+    n = 2**zoom
+    lat = np.radians(np.clip(lat_degrees, -MAX_LATITUDE, MAX_LATITUDE))
+    y = np.floor((1 - np.arcsinh(np.tan(lat)) / np.pi) / 2 * n)
+    return np.clip(y, 0, n - 1).astype(np.int64)
+
+
+def tile_bounds(x, y, zoom):
+    """
+    Bounds of tiles in degrees.
+
+    Returns:
+        tuple: (west, south, east, north) arrays
+    """
+    n = 2**zoom
+    west = np.asarray(x) / n * 360 - 180
+    east = (np.asarray(x) + 1) / n * 360 - 180
+    north = np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * np.asarray(y) / n))))
+    south = np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * (np.asarray(y) + 1) / n))))
+    return west, south, east, north
+
+
+def tile_cells(x, y, zoom):
+    """
+    Cell IDs of tiles: their quadkeys read as base-4 integers.
+
+    Interleaving the bits of x and y keeps nearby tiles close together in the
+    sorted index.
+    """
+    x = np.asarray(x, dtype=np.int64)
+    y = np.asarray(y, dtype=np.int64)
+    cells = np.zeros(np.broadcast(x, y).shape, dtype=np.int64)
+    for bit in range(zoom):
+        cells |= ((x >> bit) & 1) << (2 * bit)
+        cells |= ((y >> bit) & 1) << (2 * bit + 1)
+    return cells
+
+
+def cell_quadkey(cell, zoom):
+    """Quadkey string of a cell ID"""
+    return np.base_repr(cell, 4).zfill(zoom) if zoom else ""
+
+
+def cells_for_bbox(bbox, zoom=PASS_INDEX_ZOOM):
+    """
+    Cell IDs of all tiles that intersect a bounding box.
+
+    Args:
+        bbox: (west, south, east, north) in degrees. If west > east the box
+            crosses the antimeridian
+        zoom: Grid zoom level
+
+    Returns:
+        ndarray: Sorted cell IDs
+    """
+    west, south, east, north = bbox
+    if west > east:
+        return np.union1d(
+            cells_for_bbox((west, south, 180, north), zoom),
+            cells_for_bbox((-180, south, east, north), zoom),
+        )
+    x = np.arange(lon_to_tile_x(west, zoom), lon_to_tile_x(east, zoom) + 1)
+    y = np.arange(lat_to_tile_y(north, zoom), lat_to_tile_y(south, zoom) + 1)
+    xx, yy = np.meshgrid(x, y)
+    return np.unique(tile_cells(xx.ravel(), yy.ravel(), zoom))
+
+
+@lru_cache(maxsize=4)
+def grid_tiles(zoom):
+    """
+    All tiles of the grid at a zoom level.
+
+    Returns:
+        tuple: (x, y) tile arrays and an STRtree of the tile boxes
+    """
+    x, y = np.meshgrid(np.arange(2**zoom), np.arange(2**zoom))
+    x, y = x.ravel(), y.ravel()
+    return x, y, shapely.STRtree(shapely.box(*tile_bounds(x, y, zoom)))
+
+
+def covering_cells(geometries, zoom):
+    """
+    Find the grid cells each geometry intersects, in bulk.
+
+    Geometries are matched against every tile of the grid through a spatial
+    index, in one query.
+
+    Returns:
+        tuple: (geometry positions, cell IDs) arrays, one entry per
+        intersecting geometry/cell pair
+    """
+    x, y, tiles = grid_tiles(zoom)
+    positions, tile_positions = tiles.query(geometries, predicate="intersects")
+    return positions, tile_cells(x[tile_positions], y[tile_positions], zoom)
+
+
+def build_pass_index(path_gdf, zoom=PASS_INDEX_ZOOM):
+    """
+    Build pass intervals per grid cell from path segments.
+
+    Consecutive segments of a satellite over the same cell are merged into a
+    single pass interval.
+
+    Args:
+        path_gdf: Path segments with norad_id, satellite, constellation,
+            start_time, end_time and swath footprint geometry
+        zoom: Grid zoom level
+
+    Returns:
+        DataFrame: Pass intervals (PASS_INDEX_COLUMNS) sorted by cell then
+        start time
+    """
+    if path_gdf.empty:
+        return pd.DataFrame(columns=PASS_INDEX_COLUMNS)
+
+    positions, cells = covering_cells(path_gdf.geometry.to_numpy(), zoom)
+    pairs = (
+        path_gdf.iloc[positions][PASS_INDEX_COLUMNS[1:]]
+        .assign(cell=cells)
+        .sort_values(["cell", "norad_id", "start_time"], kind="stable")
+    )
+
+    # A new pass starts wherever the cell or satellite changes, or there is a
+    # gap since the previous segment of the same satellite over the cell
+    same_track = (pairs["cell"] == pairs["cell"].shift()) & (
+        pairs["norad_id"] == pairs["norad_id"].shift()
+    )
+    pass_id = (~same_track | (pairs["start_time"] > pairs["end_time"].shift())).cumsum()
+    passes = pairs.groupby(pass_id.to_numpy(), sort=False).agg(
+        cell=("cell", "first"),
+        norad_id=("norad_id", "first"),
+        satellite=("satellite", "first"),
+        constellation=("constellation", "first"),
+        start_time=("start_time", "min"),
+        end_time=("end_time", "max"),
+    )
+    return passes.sort_values(["cell", "start_time"], kind="stable", ignore_index=True)
+
+
+def write_pass_index(index, path, zoom=PASS_INDEX_ZOOM):
+    """Write a pass index to Parquet, recording its grid zoom in the metadata"""
+    table = pa.Table.from_pandas(index, preserve_index=False)
+    metadata = {**(table.schema.metadata or {}), b"pass_index_zoom": str(zoom).encode()}
+    pq.write_table(table.replace_schema_metadata(metadata), path)
+
+
+def load_pass_index(path):
+    """
+    Load a pass index written by write_pass_index().
+
+    Returns:
+        DataFrame: Pass intervals sorted by cell then start time, with the
+        grid zoom in attrs["zoom"]
+    """
+    table = pq.read_table(path)
+    index = table.to_pandas()
+    index.attrs["zoom"] = int(table.schema.metadata[b"pass_index_zoom"])
+    return index
+
+
+def to_utc_timestamp(value):
+    """Convert a datetime or ISO string to a UTC Timestamp (naive means UTC)"""
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is None:
+        return timestamp.tz_localize("UTC")
+    return timestamp.tz_convert("UTC")
+
+
+def query_passes(
+    index, bbox=None, start_time=None, end_time=None, hours=24, cells=None
+):
+    """
+    Find the satellite passes over an area within a time range.
+
+    Each cell's passes are found by binary search in the sorted index. Passes
+    of the same satellite over neighbouring cells are merged, so each pass
+    over the area is returned once.
+
+    Args:
+        index: Pass index from load_pass_index() or build_pass_index()
+        bbox: (west, south, east, north) in degrees
+        start_time: datetime in UTC (default: now)
+        end_time: datetime in UTC (default: start_time + hours)
+        hours: Length of the time range when end_time is not given
+            (default: 24)
+        cells: Cell IDs to query instead of a bbox
+
+    Returns:
+        DataFrame: Passes (norad_id, satellite, constellation, start_time,
+        end_time) ordered by start time
+    """
+    zoom = index.attrs.get("zoom", PASS_INDEX_ZOOM)
+    if cells is None:
+        if bbox is None:
+            raise ValueError("Either bbox or cells is required")
+        cells = cells_for_bbox(bbox, zoom)
+    start_time = to_utc_timestamp(start_time or datetime.now(timezone.utc))
+    if end_time is not None:
+        end_time = to_utc_timestamp(end_time)
+    else:
+        end_time = start_time + timedelta(hours=hours)
+
+    index_cells = index["cell"].to_numpy()
+    index_starts = (
+        index["start_time"].dt.tz_convert(None).to_numpy().astype("datetime64[ns]")
+    )
+    lo = np.searchsorted(index_cells, cells, side="left")
+    hi = np.searchsorted(index_cells, cells, side="right")
+    rows = []
+    for cell_lo, cell_hi in zip(lo, hi):
+        # Passes in a cell are sorted by start time: skip those starting
+        # after the range, then check the end times of the rest
+        cell_hi = cell_lo + np.searchsorted(
+            index_starts[cell_lo:cell_hi],
+            end_time.tz_convert(None).to_datetime64(),
+            side="left",
+        )
+        rows.append(np.arange(cell_lo, cell_hi))
+    candidates = index.iloc[np.concatenate(rows) if rows else []]
+    candidates = candidates[candidates["end_time"] > start_time]
+
+    # Merge overlapping passes of the same satellite over different cells
+    candidates = candidates.sort_values(["norad_id", "start_time"], kind="stable")
+    running_end = candidates.groupby("norad_id")["end_time"].cummax()
+    new_pass = (candidates["norad_id"] != candidates["norad_id"].shift()) | (
+        candidates["start_time"] > running_end.groupby(candidates["norad_id"]).shift()
+    )
+    passes = candidates.groupby(new_pass.cumsum().to_numpy(), sort=False).agg(
+        norad_id=("norad_id", "first"),
+        satellite=("satellite", "first"),
+        constellation=("constellation", "first"),
+        start_time=("start_time", "min"),
+        end_time=("end_time", "max"),
+    )
+    return passes.sort_values("start_time", kind="stable", ignore_index=True)
@@ -0,0 +1,38 @@
+"""
+Default locations of the generator's inputs, caches and outputs.
+
+Caches and intermediate files live next to the scripts; the files the
+frontend loads are written to the project's public/ directory.
+"""
+
+import os
+
+# Get the absolute path of the scripts directory containing the package
+script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Get the absolute path of the project root
+project_root = os.path.dirname(script_dir)
+
+# Constellation files
+satellites_dir = os.path.join(script_dir, "satellites")
+
+# Define absolute paths for output files
+public_dir = os.path.join(project_root, "public")
+local_metadata_path = os.path.join(public_dir, "satellite_paths_metadata.json")
+fetch_status_path = os.path.join(public_dir, "satellite_fetch_status.json")
+tiles_dir = os.path.join(public_dir, "tiles")
+pmtiles_path = os.path.join(public_dir, "satellite_paths.pmtiles")
+mbtiles_path = os.path.join(public_dir, "satellite_paths.mbtiles")
+time_slices_dir = os.path.join(public_dir, "slices")
+combined_tle_path = os.path.join(script_dir, "combined_tle.txt")
+geojson_path = os.path.join(script_dir, "satellite_paths.geojson")
+ndjson_path = os.path.join(script_dir, "satellite_paths.ndjson")
+geoparquet_path = os.path.join(script_dir, "satellite_paths.parquet")
+field_of_regard_geojson_path = os.path.join(script_dir, "field_of_regard.geojson")
+field_of_regard_ndjson_path = os.path.join(script_dir, "field_of_regard.ndjson")
+tle_cache_path = os.path.join(script_dir, "tle_cache.json")
+validation_cache_path = os.path.join(script_dir, "validation_cache.json")
+segment_cache_dir = os.path.join(script_dir, "segment_cache")
+pass_index_path = os.path.join(public_dir, "pass_index.parquet")
+pass_events_path = os.path.join(script_dir, "pass_events.parquet")
+run_report_path = os.path.join(public_dir, "satellite_run_report.json")
+profile_dir = os.path.join(script_dir, "profiles")
@@ -0,0 +1,750 @@
+"""
+The generator pipeline as composable stage functions.
+
+Each stage function does one step of a run and records it in the run report
+(see run_report.py). Stages import the modules they need when they run, so
+GeoPandas, Shapely and the solar ephemeris are only loaded by the stages that
+use them. run() chains the stages the way the command line does.
+
+Example:
+    satellite_info = expand_constellations_to_satellites(load_constellations())
+    tle_results = fetch_tles(satellite_info, offline=True)
+    satellite_records, satellites = load_satellites(
+        combine_tles(tle_results), satellite_info
+    )
+    start_time, end_time = prediction_window(24)
+    path_gdf, _ = generate_segments(satellite_records, start_time, end_time)
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+from skyfield.api import EarthSatellite
+
+from .constellations import expand_constellations_to_satellites, load_constellations
+from .fetch import CELESTRAK_URL, fetch_all_tles_cached, load_tle_cache, save_tle_cache
+from .paths import (
+    combined_tle_path,
+    fetch_status_path,
+    field_of_regard_geojson_path,
+    field_of_regard_ndjson_path,
+    geojson_path,
+    geoparquet_path,
+    local_metadata_path,
+    ndjson_path,
+    pass_index_path,
+    tiles_dir,
+    time_slices_dir,
+    tle_cache_path,
+)
+from .run_report import stage
+from .tle import add_satellite_properties, parse_tle_text, timescale
+
+# Instrumented pipeline stages, in the order they run, see run_report.py
+PIPELINE_STAGES = [
+    "fetch",
+    "tle_parse",
+    "ephemeris",
+    "pass_events",
+    "segment_cache",
+    "propagation",
+    "segment_build",
+    "daylight",
+    "buffering",
+    "pass_index",
+    "geoparquet_write",
+    "geojson_write",
+    "ndjson_write",
+    "constellation_split",
+    "time_split",
+    "tippecanoe",
+]
+
+
+# Command line options that change the GeoJSON and tiles written from the
+# same segments, so an incremental run only keeps its previous outputs if
+# they are unchanged
+INCREMENTAL_OUTPUT_OPTIONS = [
+    "tiles_format",
+    "parallel_tiles",
+    "time_slices",
+    "satellite_table",
+    "skip_tiles",
+]
+
+
+def format_percent(value):
+    percent = value * 100
+    if percent >= 99.5:
+        return "100%"
+    if percent == 0:
+        return "0%"
+    return f"{percent:.1g}%"
+
+
+def fetch_tles(
+    satellite_info,
+    celestrak_url=CELESTRAK_URL,
+    max_age_hours=12,
+    offline=False,
+    tle_groups=(),
+    tle_catalogues=(),
+    max_concurrency=16,
+    timeout=30,
+    cache_path=tle_cache_path,
+):
+    """
+    Fetch the TLE of every satellite through the on-disk TLE cache.
+
+    Args:
+        satellite_info: Satellite records from expand_constellations_to_satellites()
+        celestrak_url: Base URL of the Celestrak GP API
+        max_age_hours: Serve cached TLEs whose epoch is younger than this
+        offline: Use only cached TLEs
+        tle_groups: Celestrak GP groups to fetch in bulk first
+        tle_catalogues: Local TLE catalogue files to read first
+        max_concurrency: Maximum number of concurrent requests
+        timeout: Per-request timeout in seconds
+        cache_path: TLE cache file
+
+    Returns:
+        dict: Fetch result per NORAD ID, see fetch_all_tles_cached()
+    """
+    # List of satellite TLE data URLs from Celestrak
+    tle_requests = []
+    for sat in satellite_info:
+        tle_requests.append(
+            {
+                "norad_id": str(sat["norad_id"]),
+                "url": f"{celestrak_url}/NORAD/elements/gp.php?CATNR={sat['norad_id']}&FORMAT=tle",
+            }
+        )
+
+    # Run the async fetching through the on-disk TLE cache
+    with stage("fetch") as record:
+        tle_cache = load_tle_cache(cache_path)
+        tle_results = asyncio.run(
+            fetch_all_tles_cached(
+                tle_requests,
+                tle_cache,
+                max_age=timedelta(hours=max_age_hours),
+                offline=offline,
+                bulk_sources=[
+                    f"{celestrak_url}/NORAD/elements/gp.php?GROUP={group}&FORMAT=tle"
+                    for group in tle_groups
+                ]
+                + list(tle_catalogues),
+                max_concurrency=max_concurrency,
+                timeout=timeout,
+            )
+        )
+        save_tle_cache(tle_cache, cache_path)
+        record["items"] = len(tle_requests)
+    return tle_results
+
+
+def combine_tles(tle_results):
+    """Concatenate the successfully fetched TLEs into one TLE text"""
+    return "\n".join(
+        [result["content"] for result in tle_results.values() if result["success"]]
+    )
+
+
+def load_satellites(tle_text, satellite_info):
+    """
+    Build the satellites listed in the constellation files from TLE text.
+
+    Returns:
+        tuple: (satellite_records, satellites): the raw (name, line1, line2,
+        sat_props) records, from which worker processes rebuild satellites,
+        and the Skyfield satellites with their constellation properties
+    """
+    # Create a mapping from NORAD ID to satellite data from your JSON
+    satellite_data_map = {str(sat["norad_id"]): sat for sat in satellite_info}
+
+    # Filter satellites to only include those from your JSON list and add properties.
+    # Keep the raw TLE records too, so satellites can be rebuilt in worker processes
+    satellite_records = []
+    satellites = []
+    with stage("tle_parse") as record:
+        for name, line1, line2 in parse_tle_text(tle_text):
+            # Use the actual satellite name from TLE data
+            sat = EarthSatellite(line1, line2, name, timescale())
+            # Skyfield's sat.model.satnum is the NORAD ID
+            if str(sat.model.satnum) in satellite_data_map:
+                sat_props = satellite_data_map[str(sat.model.satnum)]
+                satellite_records.append((name, line1, line2, sat_props))
+                satellites.append(add_satellite_properties(sat, sat_props))
+        record["items"] = len(satellites)
+    return satellite_records, satellites
+
+
+def build_fetch_status(satellite_info, satellites, tle_results):
+    """Summarize which satellites were fetched, cached, stale or missing"""
+    expected_norad_ids = {str(sat["norad_id"]) for sat in satellite_info}
+    loaded_norad_ids = {str(sat.model.satnum) for sat in satellites}
+    no_gp_norad_ids = sorted(
+        [int(norad_id) for norad_id, result in tle_results.items() if result["no_gp"]]
+    )
+    failed_fetch_norad_ids = sorted(
+        [
+            int(norad_id)
+            for norad_id, result in tle_results.items()
+            if not result["success"] and not result["no_gp"]
+        ]
+    )
+    missing_active_norad_ids = sorted(
+        [
+            int(norad_id)
+            for norad_id in expected_norad_ids
+            - loaded_norad_ids
+            - {str(norad_id) for norad_id in no_gp_norad_ids}
+        ]
+    )
+    cached_norad_ids = sorted(
+        [
+            int(norad_id)
+            for norad_id, result in tle_results.items()
+            if result["cached"] and not result["stale"]
+        ]
+    )
+    stale_norad_ids = sorted(
+        [int(norad_id) for norad_id, result in tle_results.items() if result["stale"]]
+    )
+    expected_count = len(expected_norad_ids)
+    active_expected_count = expected_count - len(no_gp_norad_ids)
+    fetched_count = len(loaded_norad_ids)
+    success_rate = fetched_count / active_expected_count if active_expected_count else 0
+
+    return {
+        "expectedCount": expected_count,
+        "activeExpectedCount": active_expected_count,
+        "fetchedCount": fetched_count,
+        "missingNoradIds": missing_active_norad_ids,
+        "noGpDataNoradIds": no_gp_norad_ids,
+        "failedFetchNoradIds": failed_fetch_norad_ids,
+        "cachedNoradIds": cached_norad_ids,
+        "staleTleNoradIds": stale_norad_ids,
+        "successRate": success_rate,
+        "lastUpdated": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def write_fetch_status(fetch_status, path=fetch_status_path):
+    """Write the fetch status file and print a summary of it"""
+    with open(path, "w") as f:
+        json.dump(fetch_status, f, indent=2)
+    print(
+        "Fetch summary: "
+        f"{fetch_status['fetchedCount']}/{fetch_status['activeExpectedCount']} "
+        "satellites predicted "
+        f"({format_percent(fetch_status['successRate'])} of active), "
+        f"{len(fetch_status['noGpDataNoradIds'])} no GP data, "
+        f"{len(fetch_status['failedFetchNoradIds'])} failed fetches, "
+        f"{len(fetch_status['cachedNoradIds'])} served from cache, "
+        f"{len(fetch_status['staleTleNoradIds'])} stale cached TLEs used."
+    )
+    print(f"Fetch status saved to: {path}")
+
+    if fetch_status["successRate"] <= 0.9:
+        print(
+            "WARNING: TLE fetch success rate for active satellites did not exceed 90%. "
+            "Deploying with the satellites that were fetched; "
+            "see satellite_fetch_status.json for details."
+        )
+
+
+def prediction_window(window_hours, incremental=False, now=None):
+    """
+    Start and end time of the prediction.
+
+    Incremental runs start on the sampling grid so the window can slide
+    without resampling cached segments.
+    """
+    start_time = now or datetime.now(timezone.utc)
+    end_time = start_time + timedelta(hours=window_hours)
+    if incremental:
+        from .incremental import floor_time
+
+        start_time, end_time = floor_time(start_time), floor_time(end_time)
+    return start_time, end_time
+
+
+def load_daylight(daylight_mode="ephemeris"):
+    """
+    Load the solar ephemeris for daytime calculations (not needed for the
+    subsolar-point approximation). Loading it before segments are generated
+    downloads it before any worker process needs it.
+    """
+    if daylight_mode == "ephemeris":
+        from .daylight import load_ephemeris
+
+        with stage("ephemeris"):
+            load_ephemeris()
+
+
+def find_passes(
+    satellite_records,
+    aoi_path,
+    start_time,
+    end_time,
+    output_path,
+    workers=1,
+    id_column="id",
+):
+    """Find pass events over the areas of interest in aoi_path and write them"""
+    from .pass_events import find_pass_events_parallel, load_aois, write_pass_events
+
+    aois = load_aois(aoi_path, id_column)
+    print(f"\nFinding pass events over {aois.index.nunique()} areas of interest...")
+    pass_events = find_pass_events_parallel(
+        satellite_records, aois, start_time, end_time, workers
+    )
+    write_pass_events(pass_events, output_path)
+    print(f"Wrote {len(pass_events)} pass events to {output_path}")
+    return pass_events
+
+
+def generate_segments(
+    satellite_records,
+    start_time,
+    end_time,
+    daylight_mode="ephemeris",
+    workers=1,
+    max_error_km=None,
+    field_of_regard=False,
+    incremental=False,
+    output_options=None,
+):
+    """
+    Generate the path segments of every satellite, optionally reusing the
+    previous run's segments.
+
+    Args:
+        output_options: Options of the files written from the segments,
+            compared with the previous incremental run's, see
+            generate_path_segments_incremental()
+
+    Returns:
+        tuple: (path_gdf, up_to_date): the segments, see
+        generate_path_segments(), and whether no satellite inputs changed
+        since the previous incremental run
+    """
+    if incremental:
+        from .incremental import generate_path_segments_incremental
+
+        return generate_path_segments_incremental(
+            satellite_records,
+            start_time,
+            end_time,
+            daylight_mode,
+            workers,
+            max_error_km,
+            field_of_regard,
+            output_options,
+        )
+
+    from .segments import generate_path_segments_parallel
+
+    path_gdf = generate_path_segments_parallel(
+        satellite_records,
+        start_time,
+        end_time,
+        daylight_mode,
+        workers,
+        max_error_km,
+        field_of_regard,
+    )
+    return path_gdf, False
+
+
+def write_geoparquet(path_gdf, path=geoparquet_path):
+    """Write path segments to GeoParquet, see geoparquet.py"""
+    from .geoparquet import write_path_segments
+
+    with stage("geoparquet_write") as record:
+        write_path_segments(path_gdf, path)
+        record["items"] = len(path_gdf)
+    print(f"\nWrote {len(path_gdf)} path segments to {path}")
+
+
+def index_passes(swath_gdf, zoom):
+    """Build the pass index of swath segments, see pass_index.py"""
+    from .pass_index import build_pass_index
+
+    print("\nBuilding pass index...")
+    with stage("pass_index") as record:
+        pass_index = build_pass_index(swath_gdf, zoom)
+        record["items"] = len(pass_index)
+    return pass_index
+
+
+def build_metadata(
+    summary,
+    tiles_url,
+    field_of_regard=False,
+    time_slices=None,
+    satellite_table=False,
+):
+    """
+    Metadata file contents of the frontend, from summarize_path_segments().
+
+    Args:
+        time_slices: Index of the time slice tilesets, if tiles are sliced,
+            see time_slice_index()
+        satellite_table: Include the summary's satellite table, for segments
+            reduced to a sat_id, see output.compact_segments()
+    """
+    # Calculate spatial resolution ranges
+    spatial_resolution_ranges = []
+    for res in summary["spatial_res_m"]:
+        if res < 5:
+            range_category = "high"
+        elif res <= 30:
+            range_category = "medium"
+        else:
+            range_category = "low"
+        spatial_resolution_ranges.append(range_category)
+
+    # Generate base metadata with tiles URL template
+    return {
+        "satellites": summary["satellite"],
+        "constellations": summary["constellation"],
+        "operators": summary["operator"],
+        "sensor_types": summary["sensor_type"],
+        "data_access_options": summary["data_access"],
+        "spatial_resolution_ranges": list(set(spatial_resolution_ranges)),
+        "minTime": summary["min_time"].isoformat(),
+        "maxTime": summary["max_time"].isoformat(),
+        "lastUpdated": datetime.now(timezone.utc).isoformat(),
+        "tilesUrl": tiles_url,
+        "fieldOfRegard": field_of_regard,
+        **({"timeSlices": time_slices} if time_slices is not None else {}),
+        **({"satelliteTable": summary["satellite_table"]} if satellite_table else {}),
+    }
+
+
+def write_geojson(path_gdf, geojson_paths):
+    """
+    Write path segments to GeoJSON, one file per tile layer.
+
+    Returns:
+        list: (layer, path) of every file written
+    """
+    from .output import layer_frames
+
+    print("\nSaving paths to GeoJSON file...")
+    layer_paths = []
+    with stage("geojson_write") as record:
+        for layer, layer_gdf in layer_frames(path_gdf).items():
+            layer_gdf.to_file(geojson_paths[layer], driver="GeoJSON")
+            print(f"\nSuccessfully generated {geojson_paths[layer]}")
+            layer_paths.append((layer, geojson_paths[layer]))
+        record["items"] = len(path_gdf)
+    return layer_paths
+
+
+def time_slice_index(slices, tiles_format="pmtiles"):
+    """
+    Metadata index of time slice tilesets: the time range and tiles URL of
+    each slice, see tiles.time_slices().
+    """
+    from .tiles import time_slice_output
+
+    return [
+        {
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "tilesUrl": time_slice_output(name, tiles_format)[1],
+        }
+        for name, start, end in slices
+    ]
+
+
+def generate_tiles(
+    layer_paths,
+    tiles_format="pmtiles",
+    parallel=False,
+    workers=1,
+    path_gdf=None,
+    time_slices=None,
+    satellite_table=None,
+):
+    """
+    Generate tiles from the GeoJSON or NDJSON file of each layer.
+
+    Args:
+        layer_paths: (layer, path) of every input file
+        tiles_format: One of TILES_OUTPUTS
+        parallel: Run tippecanoe per constellation and merge with tile-join
+        workers: Maximum number of tippecanoe processes at a time
+        path_gdf: Path segments of the input files, if in memory; parallel
+            and time-sliced runs split these instead of the input files
+        time_slices: (name, start, end) of each time slice, see
+            tiles.time_slices(); writes one tileset per slice to
+            time_slices_dir instead of a single tileset
+        satellite_table: Satellite table of segments reduced to a sat_id,
+            see summarize_path_segments(), for splitting them by constellation
+
+    Returns:
+        str: Path of the tiles
+    """
+    import shutil
+
+    from .tiles import (
+        TILES_OUTPUTS,
+        generate_tiles_parallel,
+        generate_time_slice_tiles,
+        run_tippecanoe,
+        split_ndjson_by_constellation,
+        split_ndjson_by_time_slice,
+        write_constellation_ndjson,
+        write_time_slice_ndjson,
+    )
+
+    if time_slices is not None:
+        print(f"\nGenerating {tiles_format} tiles for each time slice...")
+        # Remove slices of earlier runs, which the metadata no longer lists
+        if os.path.exists(time_slices_dir):
+            shutil.rmtree(time_slices_dir)
+        os.makedirs(time_slices_dir)
+        with tempfile.TemporaryDirectory() as split_dir:
+            with stage("time_split") as record:
+                if path_gdf is None:
+                    inputs = split_ndjson_by_time_slice(
+                        layer_paths, time_slices, split_dir
+                    )
+                else:
+                    inputs = write_time_slice_ndjson(path_gdf, time_slices, split_dir)
+                record["items"] = len(inputs)
+            with stage("tippecanoe") as record:
+                generate_time_slice_tiles(inputs, tiles_format, workers)
+                record["items"] = len(inputs)
+        print(f"\nSuccessfully generated tiles in {time_slices_dir}")
+        return time_slices_dir
+
+    tiles_path = TILES_OUTPUTS[tiles_format][0]
+    print(f"\nGenerating {tiles_format} tiles from GeoJSON...")
+
+    # Remove existing tiles directory if it exists
+    if tiles_format == "directory" and os.path.exists(tiles_dir):
+        shutil.rmtree(tiles_dir)
+
+    if parallel:
+        constellations = None
+        if satellite_table is not None:
+            constellations = {
+                int(sat_id): properties["constellation"]
+                for sat_id, properties in satellite_table.items()
+            }
+        with tempfile.TemporaryDirectory() as split_dir:
+            with stage("constellation_split") as record:
+                if path_gdf is None:
+                    inputs = split_ndjson_by_constellation(
+                        layer_paths, split_dir, constellations
+                    )
+                else:
+                    inputs = write_constellation_ndjson(
+                        path_gdf, split_dir, constellations
+                    )
+                record["items"] = len(inputs)
+            with stage("tippecanoe") as record:
+                generate_tiles_parallel(inputs, tiles_path, tiles_format, workers)
+                record["items"] = len(inputs)
+    else:
+        with stage("tippecanoe") as record:
+            run_tippecanoe(layer_paths, tiles_path, tiles_format)
+            record["items"] = len(layer_paths)
+    print(f"\nSuccessfully generated tiles in {tiles_path}")
+    return tiles_path
+
+
+def run(args):
+    """Run the whole pipeline with parsed command line arguments"""
+    # Load constellation data from folder structure
+    constellations = load_constellations()
+    satellite_info = expand_constellations_to_satellites(constellations)
+
+    # Fetch and combine TLE data
+    print("Fetching TLE data...")
+    tle_results = fetch_tles(
+        satellite_info,
+        celestrak_url=args.celestrak_url,
+        max_age_hours=args.tle_max_age,
+        offline=args.offline,
+        tle_groups=args.tle_group,
+        tle_catalogues=args.tle_catalogue,
+        max_concurrency=args.max_concurrency,
+        timeout=args.request_timeout,
+    )
+    combined_tle_content = combine_tles(tle_results)
+
+    with open(combined_tle_path, "w") as outfile:
+        outfile.write(combined_tle_content)
+
+    # Load satellites from the TLE data
+    print("Loading satellites from TLE file...")
+    satellite_records, satellites = load_satellites(
+        combined_tle_content, satellite_info
+    )
+    print(f"{len(satellites)} satellites loaded and filtered.")
+
+    write_fetch_status(build_fetch_status(satellite_info, satellites, tle_results))
+
+    # Set up the time range for the prediction
+    time_1, time_2 = prediction_window(args.window_hours, args.incremental)
+
+    load_daylight(args.daylight_mode)
+
+    workers = args.workers or os.cpu_count()
+
+    if args.aoi:
+        find_passes(
+            satellite_records,
+            args.aoi,
+            time_1,
+            time_2,
+            args.pass_events_output,
+            workers,
+            args.aoi_id_column,
+        )
+
+    from .segments import FIELD_OF_REGARD_LAYER, TILE_LAYER
+    from .tiles import TILES_OUTPUTS, time_slice_output, time_slices
+
+    # Intermediate file of each tile layer
+    ndjson_paths = {TILE_LAYER: ndjson_path}
+    geojson_paths = {TILE_LAYER: geojson_path}
+    if args.field_of_regard:
+        ndjson_paths[FIELD_OF_REGARD_LAYER] = field_of_regard_ndjson_path
+        geojson_paths[FIELD_OF_REGARD_LAYER] = field_of_regard_geojson_path
+
+    up_to_date = False
+    pass_index_zoom = args.pass_index_zoom if args.pass_index else None
+    pass_index = None
+    path_gdf = None
+    if args.stream:
+        from .output import stream_path_segments
+
+        summary, pass_index = stream_path_segments(
+            satellite_records,
+            time_1,
+            time_2,
+            args.daylight_mode,
+            workers,
+            ndjson_paths,
+            args.max_error_km,
+            pass_index_zoom,
+            args.field_of_regard,
+            geoparquet_path if args.geoparquet else None,
+            args.satellite_table,
+        )
+    else:
+        from .output import compact_segments, summarize_path_segments
+
+        path_gdf, up_to_date = generate_segments(
+            satellite_records,
+            time_1,
+            time_2,
+            args.daylight_mode,
+            workers,
+            args.max_error_km,
+            args.field_of_regard,
+            args.incremental,
+            {option: getattr(args, option) for option in INCREMENTAL_OUTPUT_OPTIONS},
+        )
+        if args.geoparquet:
+            write_geoparquet(path_gdf)
+        swath_gdf = path_gdf[path_gdf["layer"] == TILE_LAYER]
+        if pass_index_zoom is not None:
+            pass_index = index_passes(swath_gdf, pass_index_zoom)
+        summary = summarize_path_segments(swath_gdf)
+        if args.satellite_table:
+            path_gdf = compact_segments(path_gdf)
+        else:
+            path_gdf = path_gdf.drop(columns="norad_id")
+
+    tiles_path, tiles_url = TILES_OUTPUTS[args.tiles_format]
+    if not summary["count"]:
+        print("\nNo satellite paths were generated. Exiting.")
+        return
+
+    slices = slice_index = None
+    if args.time_slices:
+        # Sliced runs write no single tileset for the metadata to point at
+        tiles_path, tiles_url = time_slices_dir, None
+        slices = time_slices(
+            summary["min_time"], summary["last_start_time"], args.time_slices
+        )
+        slice_index = time_slice_index(slices, args.tiles_format)
+
+    # Save metadata
+    print("\nSaving metadata...")
+    base_metadata = build_metadata(
+        summary,
+        tiles_url,
+        args.field_of_regard,
+        slice_index,
+        args.satellite_table,
+    )
+
+    # Save local copy first
+    with open(local_metadata_path, "w") as f:
+        json.dump(base_metadata, f, indent=2)
+    print(f"\nSuccessfully generated local {local_metadata_path}")
+
+    if pass_index is not None:
+        from .pass_index import write_pass_index
+
+        write_pass_index(pass_index, pass_index_path, pass_index_zoom)
+        print(
+            f"\nWrote {len(pass_index)} passes at zoom {pass_index_zoom} "
+            f"to {pass_index_path}"
+        )
+
+    # Existing outputs are only kept if every file this run writes is there
+    outputs = list(geojson_paths.values())
+    if pass_index is not None:
+        outputs.append(pass_index_path)
+    if args.geoparquet:
+        outputs.append(geoparquet_path)
+    if slices is not None and not args.skip_tiles:
+        outputs += [
+            time_slice_output(name, args.tiles_format)[0] for name, _, _ in slices
+        ]
+    elif not args.skip_tiles:
+        outputs.append(tiles_path)
+    if up_to_date and all(os.path.exists(path) for path in outputs):
+        print(
+            "\nNo satellite inputs or output options changed; keeping existing "
+            "GeoJSON and tiles"
+        )
+        return
+
+    if args.stream:
+        # Segments were already streamed to newline-delimited GeoJSON
+        layer_paths = list(ndjson_paths.items())
+    else:
+        layer_paths = write_geojson(path_gdf, geojson_paths)
+
+    if args.skip_tiles:
+        print("\nSkipping tiles (--skip-tiles)")
+        return
+
+    # Generate tiles from the GeoJSON
+    generate_tiles(
+        layer_paths,
+        args.tiles_format,
+        args.parallel_tiles,
+        workers,
+        path_gdf,
+        slices,
+        summary["satellite_table"] if args.satellite_table else None,
+    )
+
+    print("\nTiles generated successfully and ready for GitHub hosting")
+    print(f"Metadata saved to: {local_metadata_path}")
+    print(f"Tiles: {tiles_path}")
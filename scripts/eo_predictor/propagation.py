@@ -0,0 +1,286 @@
+"""
+Propagation of satellites to ground track samples, on a fixed time grid or
+adaptively refined where the track curves.
+"""
+
+from datetime import timedelta
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from skyfield.api import wgs84
+
+from .daylight import to_skyfield_time
+
+# Sampling interval of the ground tracks
+STEP_MINUTES = 5
+
+# Finest and coarsest sampling intervals of adaptively sampled ground tracks
+ADAPTIVE_MIN_STEP_MINUTES = 1
+ADAPTIVE_MAX_STEP_MINUTES = 15
+
+# Satellites refined at once, bounding the (satellites x samples) working
+# arrays of adaptive_steps()
+ADAPTIVE_CHUNK_SIZE = 100
+
+# Mean Earth radius, used for ground track error estimates
+EARTH_RADIUS_KM = 6371.0
+
+
+# Per-satellite properties carried onto every path segment
+SATELLITE_METADATA_COLUMNS = [
+    "satellite",
+    "swath_km",
+    "constellation",
+    "operator",
+    "sensor_type",
+    "spatial_res_m",
+    "data_access",
+    "data_repo_type",
+    "data_repo_url",
+    "tasking",
+]
+
+
+@lru_cache(maxsize=8)
+def build_time_grid(start_time, end_time, step_minutes):
+    """
+    Build the shared sample times for the prediction window.
+
+    Cached, so satellites processed one at a time (--stream) share one Time
+    vector and Skyfield computes its Earth rotation only once.
+
+    Args:
+        start_time: datetime object in UTC
+        end_time: datetime object in UTC (inclusive)
+        step_minutes: Sampling interval in minutes
+
+    Returns:
+        tuple: (DatetimeIndex of UTC timestamps, matching Skyfield Time vector)
+    """
+    timestamps = pd.date_range(
+        start_time, end_time, freq=pd.Timedelta(minutes=step_minutes)
+    )
+    times = to_skyfield_time(timestamps)
+    return timestamps, times
+
+
+def satellite_metadata_frame(satellites):
+    """Build one row of segment properties per satellite, keyed by NORAD ID"""
+    return pd.DataFrame(
+        [
+            {
+                "norad_id": str(sat.model.satnum),
+                "satellite": sat.name,
+                "swath_km": sat.swath_km,
+                "constellation": sat.constellation,
+                "operator": sat.operator,
+                "sensor_type": sat.sensor_type,
+                "spatial_res_m": sat.spatial_res_m,  # Use meters
+                "data_access": sat.data_access,
+                "data_repo_type": sat.data_repo_type,
+                "data_repo_url": sat.data_repo_url,
+                "tasking": getattr(sat, "tasking", None),
+            }
+            for sat in satellites
+        ],
+        columns=["norad_id", *SATELLITE_METADATA_COLUMNS],
+    )
+
+
+def get_satellite_positions(sat, times):
+    """
+    Propagate a satellite over a whole Skyfield Time vector in one call.
+
+    Returns:
+        tuple: (latitudes, longitudes) as NumPy arrays in degrees
+    """
+    lat, lon = wgs84.latlon_of(sat.at(times))
+    return lat.degrees, lon.degrees
+
+
+def propagate_satellites(satellites, timestamps, times, quiet=False):
+    """
+    Propagate every satellite over the shared time grid, printing progress
+    unless quiet.
+
+    Returns:
+        DataFrame: Columnar ground track with one row per satellite and sample,
+        ordered by satellite then time (norad_id, timestamp, lat, lon)
+    """
+    n_times = len(timestamps)
+    lats = np.empty((len(satellites), n_times))
+    lons = np.empty((len(satellites), n_times))
+    for i, sat in enumerate(satellites):
+        if not quiet:
+            print(f"  ({i + 1}/{len(satellites)}) Calculating positions for {sat.name}")
+        lats[i], lons[i] = get_satellite_positions(sat, times)
+
+    return pd.DataFrame(
+        {
+            "norad_id": np.repeat(
+                [str(sat.model.satnum) for sat in satellites], n_times
+            ),
+            "timestamp": timestamps[np.tile(np.arange(n_times), len(satellites))],
+            "lat": lats.ravel(),
+            "lon": lons.ravel(),
+        }
+    )
+
+
+def cross_track_km(lat, lon, start_lat, start_lon, end_lat, end_lon):
+    """
+    Distance in km from points to straight latitude/longitude segments.
+
+    Uses a local equirectangular projection around each segment's start, which
+    is accurate for the short segments of a ground track.
+    """
+    scale = np.cos(np.radians(start_lat))
+    segment_x = (end_lon - start_lon) * scale
+    segment_y = end_lat - start_lat
+    point_x = (lon - start_lon) * scale
+    point_y = lat - start_lat
+    length = segment_x**2 + segment_y**2
+    along = np.clip(
+        (point_x * segment_x + point_y * segment_y) / np.where(length > 0, length, 1),
+        0,
+        1,
+    )
+    offset = np.hypot(point_x - along * segment_x, point_y - along * segment_y)
+    return np.radians(offset) * EARTH_RADIUS_KM
+
+
+def adaptive_steps(lats, lons, max_error_km, max_step):
+    """
+    Find the longest step from every sample of densely sampled tracks.
+
+    A step of k samples is allowed if the straight latitude/longitude segment
+    between its endpoints stays within max_error_km of every sample it skips.
+    Evaluated for all tracks and samples at once.
+
+    Args:
+        lats: Array of latitudes in degrees, one row per satellite
+        lons: Array of longitudes in degrees, one row per satellite
+        max_error_km: Maximum allowed distance from the true track in km
+        max_step: Longest step to consider, in samples
+
+    Returns:
+        ndarray: Longest allowed step in samples, same shape as lats
+    """
+    n_times = lats.shape[1]
+    lons = np.degrees(np.unwrap(np.radians(lons), axis=1))
+    steps = np.ones(lats.shape, dtype=int)
+    for k in range(2, min(max_step, n_times - 1) + 1):
+        start_lat, end_lat = lats[:, :-k], lats[:, k:]
+        start_lon, end_lon = lons[:, :-k], lons[:, k:]
+        allowed = np.ones(start_lat.shape, dtype=bool)
+        for m in range(1, k):
+            error = cross_track_km(
+                lats[:, m : n_times - k + m],
+                lons[:, m : n_times - k + m],
+                start_lat,
+                start_lon,
+                end_lat,
+                end_lon,
+            )
+            allowed &= error <= max_error_km
+        # Steps are tried shortest first, so the longest allowed one wins
+        steps[:, :-k][allowed] = k
+    return steps
+
+
+def select_samples(steps):
+    """
+    Walk a track taking the longest allowed step from each kept sample.
+
+    The first and last samples are padding (see generate_path_segments()) and
+    are always kept, as are the window's own first and last samples.
+
+    Args:
+        steps: Longest allowed step from each sample, from adaptive_steps()
+
+    Returns:
+        list: Indices of the samples to keep
+    """
+    last = len(steps) - 2
+    kept = [0]
+    i = 1
+    while i < last:
+        kept.append(i)
+        i = min(i + steps[i], last)
+    kept.extend([last, last + 1])
+    return kept
+
+
+def propagate_satellites_adaptive(
+    satellites, start_time, end_time, max_error_km, quiet=False
+):
+    """
+    Propagate every satellite with an adaptive time step.
+
+    Tracks are propagated on a fine grid (ADAPTIVE_MIN_STEP_MINUTES), then
+    thinned to the samples needed to keep straight segments within
+    max_error_km of the true track, with steps of at most
+    ADAPTIVE_MAX_STEP_MINUTES. The grid is padded by one fine step on each
+    side of the window. Satellites are processed ADAPTIVE_CHUNK_SIZE at a
+    time. Progress is printed unless quiet.
+
+    Returns:
+        DataFrame: Columnar ground track as from propagate_satellites(), with
+        each satellite sampled at its own times
+    """
+    step = timedelta(minutes=ADAPTIVE_MIN_STEP_MINUTES)
+    timestamps, times = build_time_grid(
+        start_time - step, end_time + step, ADAPTIVE_MIN_STEP_MINUTES
+    )
+    if not satellites:
+        return pd.DataFrame(
+            {
+                "norad_id": np.array([], dtype=str),
+                "timestamp": timestamps[:0],
+                "lat": np.array([], dtype=float),
+                "lon": np.array([], dtype=float),
+            }
+        )
+
+    kept, kept_lats, kept_lons = [], [], []
+    for chunk_start in range(0, len(satellites), ADAPTIVE_CHUNK_SIZE):
+        chunk = satellites[chunk_start : chunk_start + ADAPTIVE_CHUNK_SIZE]
+        lats = np.empty((len(chunk), len(timestamps)))
+        lons = np.empty((len(chunk), len(timestamps)))
+        for i, sat in enumerate(chunk):
+            if not quiet:
+                print(
+                    f"  ({chunk_start + i + 1}/{len(satellites)}) "
+                    f"Calculating positions for {sat.name}"
+                )
+            lats[i], lons[i] = get_satellite_positions(sat, times)
+
+        if not quiet:
+            print("Selecting adaptive time steps...")
+        steps = adaptive_steps(
+            lats,
+            lons,
+            max_error_km,
+            ADAPTIVE_MAX_STEP_MINUTES // ADAPTIVE_MIN_STEP_MINUTES,
+        )
+        for i, satellite_steps in enumerate(steps):
+            kept.append(select_samples(satellite_steps))
+            kept_lats.append(lats[i, kept[-1]])
+            kept_lons.append(lons[i, kept[-1]])
+
+    if not quiet:
+        print(
+            f"Kept {sum(map(len, kept))} of {len(satellites) * len(timestamps)} "
+            f"samples (max error {max_error_km} km)"
+        )
+    return pd.DataFrame(
+        {
+            "norad_id": np.repeat(
+                [str(sat.model.satnum) for sat in satellites], list(map(len, kept))
+            ),
+            "timestamp": timestamps[np.concatenate(kept)],
+            "lat": np.concatenate(kept_lats),
+            "lon": np.concatenate(kept_lons),
+        }
+    )
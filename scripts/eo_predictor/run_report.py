@@ -0,0 +1,229 @@
+"""
+Per-stage timing and memory instrumentation of the generator.
+
+Wrap each pipeline stage in stage(), which records its wall time, CPU time
+(including finished child processes such as tippecanoe), peak RSS and item
+count. Stages that run more than once, e.g. once per shard, are accumulated
+into a single entry. Worker processes collect their stages with
+collect_stages() and the parent adds them with merge_stages().
+
+Optionally, one stage can be profiled with cProfile or pyinstrument, see
+configure_profiling().
+
+Example:
+    with stage("propagation") as record:
+        positions = propagate_satellites(satellites, timestamps, times)
+        record["items"] = len(positions)
+    write_run_report("run_report.json")
+"""
+
+import json
+import os
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+PROFILERS = ["cprofile", "pyinstrument"]
+
+# Stages recorded in this process, keyed by name in order of first run
+_stages = {}
+_started_at = datetime.now(timezone.utc)
+_started = time.perf_counter()
+
+# Profiling settings, see configure_profiling()
+_profile_stage = None
+_profiler_name = None
+_profile_dir = None
+_profilers = {}
+
+
+def peak_rss_mb(who=resource.RUSAGE_SELF):
+    """Peak resident set size in MiB of this process or its finished children"""
+    peak = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def cpu_seconds():
+    """User and system CPU time of this process and its finished children"""
+    total = 0.0
+    for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN):
+        usage = resource.getrusage(who)
+        total += usage.ru_utime + usage.ru_stime
+    return total
+
+
+def configure_profiling(stage_name, profiler="cprofile", output_dir="."):
+    """
+    Profile every run of one stage.
+
+    Also the initializer of worker processes, so stages that run in workers
+    are profiled there. Each process writes its own profile, accumulated
+    over all runs of the stage: {stage}-{pid}.prof (cProfile, for pstats or
+    snakeviz) or {stage}-{pid}.html (pyinstrument).
+
+    Args:
+        stage_name: Stage to profile, or None to profile nothing
+        profiler: One of PROFILERS
+        output_dir: Directory to write profiles to
+    """
+    global _profile_stage, _profiler_name, _profile_dir
+    if profiler not in PROFILERS:
+        raise ValueError(f"Unknown profiler {profiler!r}, expected one of {PROFILERS}")
+    _profile_stage, _profiler_name, _profile_dir = stage_name, profiler, output_dir
+    _profilers.clear()
+
+
+def profiling_options():
+    """Arguments that reproduce configure_profiling() in a worker process"""
+    return _profile_stage, _profiler_name or "cprofile", _profile_dir or "."
+
+
+def _start_profiler(name):
+    """Start (or resume) the profiler of a stage"""
+    profiler = _profilers.get(name)
+    if profiler is None:
+        if _profiler_name == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+            except ImportError as e:
+                raise RuntimeError(
+                    "pyinstrument is not installed; run with "
+                    "`uv run --with pyinstrument` or use the cprofile profiler"
+                ) from e
+            profiler = Profiler()
+        else:
+            import cProfile
+
+            profiler = cProfile.Profile()
+        _profilers[name] = profiler
+    if _profiler_name == "pyinstrument":
+        profiler.start()
+    else:
+        profiler.enable()
+    return profiler
+
+
+def _stop_profiler(name, profiler):
+    """Pause the profiler of a stage and write everything it has recorded"""
+    os.makedirs(_profile_dir, exist_ok=True)
+    path = os.path.join(_profile_dir, f"{name}-{os.getpid()}")
+    if _profiler_name == "pyinstrument":
+        profiler.stop()
+        with open(f"{path}.html", "w") as f:
+            f.write(profiler.output_html())
+    else:
+        profiler.disable()
+        profiler.dump_stats(f"{path}.prof")
+
+
+def merge_stages(stages, into=None):
+    """
+    Add stage records, e.g. from a worker process, to this process's stages.
+
+    Times and item counts are summed, so the wall time of a stage that ran
+    in several workers at once is the sum over workers. Peak RSS is the
+    largest of any process.
+    """
+    into = _stages if into is None else into
+    for name, record in stages.items():
+        total = into.setdefault(name, {"calls": 0, "wallSeconds": 0.0})
+        total["calls"] += record["calls"]
+        total["wallSeconds"] += record["wallSeconds"]
+        for key in ["cpuSeconds", "items"]:
+            if record.get(key) is not None:
+                total[key] = total.get(key, 0) + record[key]
+        for key in ["peakRssMb", "childrenPeakRssMb"]:
+            if record.get(key) is not None:
+                total[key] = max(total.get(key, 0), record[key])
+
+
+@contextmanager
+def stage(name):
+    """
+    Time a pipeline stage.
+
+    Yields a dict; set its "items" to the number of things the stage
+    processed (satellites, segments, features). Peak RSS is the process's
+    high-water mark when the stage ends, so the stage that raises it is the
+    one whose peak is higher than all earlier stages'.
+    """
+    record = {"items": None}
+    profiler = _start_profiler(name) if name == _profile_stage else None
+    wall_start = time.perf_counter()
+    cpu_start = cpu_seconds()
+    try:
+        yield record
+    finally:
+        if profiler is not None:
+            _stop_profiler(name, profiler)
+        record.update(
+            calls=1,
+            wallSeconds=time.perf_counter() - wall_start,
+            cpuSeconds=cpu_seconds() - cpu_start,
+            peakRssMb=peak_rss_mb(),
+            childrenPeakRssMb=peak_rss_mb(resource.RUSAGE_CHILDREN),
+        )
+        merge_stages({name: record})
+
+
+@contextmanager
+def collect_stages():
+    """
+    Collect the stages run inside the block separately from the others.
+
+    Yields the dict the stages are recorded in, for a worker to return to
+    the parent process.
+    """
+    global _stages
+    outer, _stages = _stages, {}
+    try:
+        yield _stages
+    finally:
+        _stages = outer
+
+
+def run_report(**extra):
+    """
+    Build the run report.
+
+    Args:
+        **extra: Additional top-level fields, e.g. the run's options
+
+    Returns:
+        dict: Start and finish times, totals and the stages in order of
+        first run
+    """
+    finished_at = datetime.now(timezone.utc)
+    return {
+        "startedAt": _started_at.isoformat(),
+        "finishedAt": finished_at.isoformat(),
+        "wallSeconds": time.perf_counter() - _started,
+        "cpuSeconds": cpu_seconds(),
+        "peakRssMb": peak_rss_mb(),
+        "childrenPeakRssMb": peak_rss_mb(resource.RUSAGE_CHILDREN),
+        **extra,
+        "stages": [{"name": name, **record} for name, record in _stages.items()],
+    }
+
+
+def write_run_report(path, **extra):
+    """Write the run report to a JSON file and print a summary of the stages"""
+    report = run_report(**extra)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, default=str)
+
+    print(
+        f"\n{'Stage':<20} {'Calls':>6} {'Wall s':>9} {'CPU s':>9} {'Peak MiB':>9} Items"
+    )
+    for record in report["stages"]:
+        items = "" if record.get("items") is None else record["items"]
+        print(
+            f"{record['name']:<20} {record['calls']:>6} "
+            f"{record['wallSeconds']:>9.2f} {record['cpuSeconds']:>9.2f} "
+            f"{record['peakRssMb']:>9.0f} {items}"
+        )
+    print(f"Run report saved to: {path}")
+    return report
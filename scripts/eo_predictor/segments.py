@@ -0,0 +1,484 @@
+"""
+Path segments: ground track segments between consecutive samples, with swath
+footprints (and optionally field of regard footprints) split at the
+antimeridian, in one process or sharded across a process pool.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+from pyproj import Geod
+
+from .daylight import is_daytime
+from .pass_events import max_ground_distance
+from .propagation import (
+    EARTH_RADIUS_KM,
+    SATELLITE_METADATA_COLUMNS,
+    STEP_MINUTES,
+    build_time_grid,
+    propagate_satellites,
+    propagate_satellites_adaptive,
+    satellite_metadata_frame,
+)
+from .run_report import (
+    collect_stages,
+    configure_profiling,
+    merge_stages,
+    profiling_options,
+    stage,
+)
+from .tle import create_satellite
+
+
+def build_path_segments(positions):
+    """
+    Build ground-track segments between consecutive samples of each satellite.
+
+    Works on whole columns at once: segment endpoints are array slices of the
+    propagated track.
+
+    Args:
+        positions: Columnar ground track ordered by satellite then time
+            (norad_id, timestamp, lat, lon)
+
+    Returns:
+        DataFrame: One row per segment with norad_id, start_time, end_time,
+        the row positions of its endpoints in positions (start_index,
+        end_index) and the segment center point (center_lat, center_lon)
+    """
+    norad_ids = positions["norad_id"].to_numpy()
+    timestamps = pd.DatetimeIndex(positions["timestamp"])
+    lon = positions["lon"].to_numpy()
+    lat = positions["lat"].to_numpy()
+
+    # Segments join each sample to the next one of the same satellite
+    start = np.flatnonzero(norad_ids[:-1] == norad_ids[1:])
+    end = start + 1
+
+    # Unwrap the end longitude so segments that cross the antimeridian stay
+    # continuous (e.g. 179° -> 181° rather than 179° -> -179°)
+    center_lon = (lon[start] + unwrap_longitude(lon[end], lon[start])) / 2
+    return pd.DataFrame(
+        {
+            "norad_id": norad_ids[start],
+            "start_time": timestamps[start],
+            "end_time": timestamps[end],
+            "start_index": start,
+            "end_index": end,
+            "center_lat": (lat[start] + lat[end]) / 2,
+            "center_lon": (center_lon + 180) % 360 - 180,
+        }
+    )
+
+
+def unwrap_longitude(lon_degrees, reference_degrees):
+    """Shift longitudes by whole turns to lie within ±180° of a reference"""
+    return lon_degrees - 360 * np.round((lon_degrees - reference_degrees) / 360)
+
+
+# WGS84 ellipsoid for geodesic swath edges
+GEOD = Geod(ellps="WGS84")
+
+
+def swath_edges(positions, half_swath_m):
+    """
+    Compute the left and right swath edge points of every ground-track sample.
+
+    The heading at each sample is the geodesic azimuth between its neighbours
+    on the same track; edge points are offset perpendicular to it along the
+    WGS84 ellipsoid, so the swath keeps its true width at all latitudes.
+
+    Args:
+        positions: Columnar ground track ordered by satellite then time
+        half_swath_m: Half the swath width in meters, one value per sample
+
+    Returns:
+        tuple: (left_lon, left_lat, right_lon, right_lat) arrays in degrees
+    """
+    norad_ids = positions["norad_id"].to_numpy()
+    lon = positions["lon"].to_numpy()
+    lat = positions["lat"].to_numpy()
+
+    index = np.arange(len(positions))
+    previous = index.copy()
+    following = index.copy()
+    same_satellite = norad_ids[:-1] == norad_ids[1:]
+    previous[1:][same_satellite] -= 1
+    following[:-1][same_satellite] += 1
+
+    heading, _, _ = GEOD.inv(
+        lon[previous], lat[previous], lon[following], lat[following]
+    )
+    left_lon, left_lat, _ = GEOD.fwd(lon, lat, heading - 90, half_swath_m)
+    right_lon, right_lat, _ = GEOD.fwd(lon, lat, heading + 90, half_swath_m)
+    return left_lon, left_lat, right_lon, right_lat
+
+
+def build_swath_polygons(positions, segments, half_swath_m):
+    """
+    Build each segment's swath footprint quad in bulk.
+
+    Args:
+        positions: Columnar ground track ordered by satellite then time
+        segments: Segment frame from build_path_segments()
+        half_swath_m: Half the swath width in meters, one value per sample
+
+    Returns:
+        ndarray: One Polygon per segment. Quads crossing the antimeridian
+        extend past ±180° and must be cut with split_antimeridian()
+    """
+    left_lon, left_lat, right_lon, right_lat = swath_edges(positions, half_swath_m)
+    start = segments["start_index"].to_numpy()
+    end = segments["end_index"].to_numpy()
+
+    # Corners in ring order, unwrapped around the segment's start point
+    reference = positions["lon"].to_numpy()[start]
+    corners = [
+        (left_lon[start], left_lat[start]),
+        (left_lon[end], left_lat[end]),
+        (right_lon[end], right_lat[end]),
+        (right_lon[start], right_lat[start]),
+    ]
+    coords = np.stack(
+        [
+            np.column_stack([unwrap_longitude(corner_lon, reference), corner_lat])
+            for corner_lon, corner_lat in corners
+        ],
+        axis=1,
+    )
+    polygons = shapely.polygons(coords)
+
+    # Where the track turns sharply (wide swaths near the poles) the inner
+    # edge can fold over itself; fall back to the quad's convex hull
+    invalid = ~shapely.is_valid(polygons)
+    polygons[invalid] = shapely.convex_hull(shapely.multipoints(coords[invalid]))
+    return polygons
+
+
+def split_antimeridian(gdf, half_width=180.0):
+    """
+    Cut geometries that extend past the antimeridian into one piece per side.
+
+    Geometries are expected in a continuous ("unwrapped") x range. Any part
+    beyond ±half_width is clipped off and shifted back by a full world width,
+    so each crossing feature becomes two features that meet at the
+    antimeridian. All geometries are clipped and shifted in bulk.
+
+    Args:
+        gdf: GeoDataFrame to split
+        half_width: x coordinate of the antimeridian in the frame's CRS
+
+    Returns:
+        GeoDataFrame: Rows of gdf, with crossing rows repeated once per piece
+    """
+    geometries = gdf.geometry.to_numpy()
+    bounds = shapely.bounds(geometries)
+    crossing = (bounds[:, 0] < -half_width) | (bounds[:, 2] > half_width)
+    if not crossing.any():
+        return gdf
+
+    crossing_index = np.flatnonzero(crossing)
+    crossing_geometries = geometries[crossing_index]
+    ymin = bounds[crossing_index, 1].min() - 1
+    ymax = bounds[crossing_index, 3].max() + 1
+
+    row_index = [np.flatnonzero(~crossing)]
+    pieces = [geometries[~crossing]]
+    for shift in (0.0, 2 * half_width, -2 * half_width):
+        shifted = shapely.transform(
+            crossing_geometries, lambda coords, shift=shift: coords + [shift, 0]
+        )
+        clipped = shapely.clip_by_rect(shifted, -half_width, ymin, half_width, ymax)
+        non_empty = ~shapely.is_empty(clipped)
+        row_index.append(crossing_index[non_empty])
+        pieces.append(clipped[non_empty])
+
+    row_index = np.concatenate(row_index)
+    order = np.argsort(row_index, kind="stable")
+    split = gdf.iloc[row_index[order]].reset_index(drop=True)
+    return split.set_geometry(np.concatenate(pieces)[order], crs=gdf.crs)
+
+
+# Columns of the path segment frame written to GeoJSON and tiles
+PATH_COLUMNS = [
+    "satellite",
+    "start_time",
+    "end_time",
+    "geometry",
+    *SATELLITE_METADATA_COLUMNS[1:],
+    "is_daytime",
+]
+
+
+# Tile layers: nadir swath footprints, and the wider area tasking satellites
+# can image off nadir
+TILE_LAYER = "satellite_paths"
+FIELD_OF_REGARD_LAYER = "field_of_regard"
+
+# Columns of the path segment frame: norad_id and the tile layer of each
+# footprint, followed by what is written to GeoJSON and tiles
+SEGMENT_COLUMNS = ["norad_id", "layer", *PATH_COLUMNS]
+
+
+def field_of_regard_half_width_km(sat):
+    """
+    Ground distance from the track to the edge of a satellite's field of regard.
+
+    Returns:
+        float: Distance in km at which the satellite sees a site at its
+        maximum off-nadir angle from altitude_km
+    """
+    return EARTH_RADIUS_KM * max_ground_distance(
+        np.radians(sat.off_nadir_deg),
+        EARTH_RADIUS_KM + sat.altitude_km,
+        EARTH_RADIUS_KM,
+    )
+
+
+def build_footprints(
+    satellites, positions, segments, field_of_regard=False, quiet=False
+):
+    """
+    Buffer path segments into swath (and field of regard) footprints.
+
+    Args:
+        satellites: Skyfield satellites with constellation properties
+        positions: Columnar ground track, see propagate_satellites()
+        segments: Segments of the track, see build_path_segments(), with
+            is_daytime
+        field_of_regard: Also build FIELD_OF_REGARD_LAYER footprints
+        quiet: Don't print progress
+
+    Returns:
+        GeoDataFrame: Footprints with satellite properties (SEGMENT_COLUMNS),
+        ordered by satellite name then time and cut at the antimeridian
+    """
+    if not quiet:
+        print("\nBuilding swath polygons...")
+    satellite_metadata = satellite_metadata_frame(satellites)
+    swath_km = positions["norad_id"].map(
+        satellite_metadata.set_index("norad_id")["swath_km"]
+    )
+    footprints = [
+        gpd.GeoDataFrame(
+            segments.assign(layer=TILE_LAYER),
+            # Half of swath_km, converting km to meters
+            geometry=build_swath_polygons(positions, segments, swath_km * 500),
+            crs="EPSG:4326",
+        )
+    ]
+
+    if field_of_regard:
+        # Same segments, widened to the off-nadir reach of tasking satellites
+        half_width_km = {}
+        for sat in satellites:
+            if getattr(sat, "tasking", False):
+                width_km = field_of_regard_half_width_km(sat)
+                if width_km > sat.swath_km / 2:
+                    half_width_km[str(sat.model.satnum)] = width_km
+        half_width_km = pd.Series(half_width_km, dtype=float)
+        wide = segments["norad_id"].isin(half_width_km.index).to_numpy()
+        if wide.any():
+            if not quiet:
+                print("Building field of regard polygons...")
+            half_width_m = positions["norad_id"].map(half_width_km).fillna(0) * 1000
+            footprints.append(
+                gpd.GeoDataFrame(
+                    segments[wide].assign(layer=FIELD_OF_REGARD_LAYER),
+                    geometry=build_swath_polygons(
+                        positions, segments[wide], half_width_m
+                    ),
+                    crs="EPSG:4326",
+                )
+            )
+
+    # Join per-satellite properties once, after all segments are built,
+    # keeping features ordered by satellite name then time
+    path_gdf = (
+        pd.concat(footprints, ignore_index=True)
+        .merge(satellite_metadata, on="norad_id")
+        .sort_values(["satellite", "start_time"], kind="stable", ignore_index=True)
+        .loc[:, SEGMENT_COLUMNS]
+    )
+
+    # Cut footprints that cross the antimeridian at ±180°
+    return split_antimeridian(path_gdf)
+
+
+def generate_path_segments(
+    satellites,
+    start_time,
+    end_time,
+    daylight_mode,
+    max_error_km=None,
+    field_of_regard=False,
+    quiet=False,
+):
+    """
+    Run propagation, segment building, daylight and swath stages.
+
+    Args:
+        satellites: Skyfield satellites with constellation properties
+        start_time: datetime object in UTC
+        end_time: datetime object in UTC
+        daylight_mode: "ephemeris" or "subsolar", see is_daytime()
+        max_error_km: If set, sample tracks adaptively within this error, see
+            propagate_satellites_adaptive(). Otherwise use STEP_MINUTES steps
+        field_of_regard: Also build FIELD_OF_REGARD_LAYER footprints for
+            tasking satellites that can point beyond their swath
+        quiet: Don't print progress, e.g. when serving requests
+
+    Returns:
+        GeoDataFrame: Swath footprint per segment (SEGMENT_COLUMNS), followed
+        by its field of regard footprint if any, ordered by satellite name
+        then time. Empty if no segments were generated
+    """
+    # Calculate positions for all satellites. Pad the window by one sample on
+    # each side so its first and last samples get a heading from both
+    # neighbours, like every other sample
+    if not quiet:
+        print("\nCalculating satellite positions...")
+    with stage("propagation") as record:
+        if max_error_km is None:
+            step = timedelta(minutes=STEP_MINUTES)
+            timestamps, times = build_time_grid(
+                start_time - step, end_time + step, STEP_MINUTES
+            )
+            positions = propagate_satellites(satellites, timestamps, times, quiet)
+        else:
+            positions = propagate_satellites_adaptive(
+                satellites, start_time, end_time, max_error_km, quiet
+            )
+        record["items"] = len(positions)
+
+    # Create path segments for each satellite, dropping the padding segments
+    if not quiet:
+        print("Creating path segments for each satellite...")
+    with stage("segment_build") as record:
+        segments = build_path_segments(positions)
+        segments = segments[
+            (segments["start_time"] >= start_time) & (segments["end_time"] <= end_time)
+        ].reset_index(drop=True)
+        record["items"] = len(segments)
+    if segments.empty:
+        return gpd.GeoDataFrame(
+            columns=SEGMENT_COLUMNS, geometry="geometry", crs="EPSG:4326"
+        )
+
+    # Calculate if observation occurs during daytime, in one vectorized pass.
+    # Use the center point of the line segment and middle time
+    if not quiet:
+        print("\nClassifying daytime segments...")
+    with stage("daylight") as record:
+        middle_times = (
+            segments["start_time"] + (segments["end_time"] - segments["start_time"]) / 2
+        )
+        segments["is_daytime"] = is_daytime(
+            segments["center_lat"],
+            segments["center_lon"],
+            middle_times,
+            mode=daylight_mode,
+        )
+        record["items"] = len(segments)
+
+    # Build the swath footprint of each segment from geodesic swath edges
+    with stage("buffering") as record:
+        path_gdf = build_footprints(
+            satellites, positions, segments, field_of_regard, quiet
+        )
+        record["items"] = len(path_gdf)
+    return path_gdf
+
+
+def process_shard(
+    satellite_records,
+    start_time,
+    end_time,
+    daylight_mode,
+    max_error_km=None,
+    field_of_regard=False,
+):
+    """
+    Worker entry point: generate path segments for a shard of satellites.
+
+    Satellites are passed as (name, line1, line2, sat_props) records because
+    Skyfield satellites cannot be pickled across processes.
+
+    Returns:
+        tuple: (GeoDataFrame as from generate_path_segments(), dict of the
+        stages run, for merge_stages() in the parent process)
+    """
+    with collect_stages() as stages:
+        with stage("tle_parse") as record:
+            satellites = [create_satellite(*args) for args in satellite_records]
+            record["items"] = len(satellites)
+        path_gdf = generate_path_segments(
+            satellites,
+            start_time,
+            end_time,
+            daylight_mode,
+            max_error_km,
+            field_of_regard,
+        )
+    return path_gdf, stages
+
+
+def generate_path_segments_parallel(
+    satellite_records,
+    start_time,
+    end_time,
+    daylight_mode,
+    workers,
+    max_error_km=None,
+    field_of_regard=False,
+):
+    """
+    Shard satellites across a process pool and merge the per-shard results.
+
+    Shards are contiguous runs of satellite_records and are merged in shard
+    order, so the output is identical to a serial run. With a single worker
+    the satellites are processed serially in this process.
+    """
+    if workers <= 1 or len(satellite_records) <= 1:
+        path_gdf, stages = process_shard(
+            satellite_records,
+            start_time,
+            end_time,
+            daylight_mode,
+            max_error_km,
+            field_of_regard,
+        )
+        merge_stages(stages)
+        return path_gdf
+
+    n_shards = min(len(satellite_records), workers * 4)
+    shards = [
+        [satellite_records[i] for i in shard]
+        for shard in np.array_split(np.arange(len(satellite_records)), n_shards)
+    ]
+    print(f"\nProcessing {len(shards)} shards with {workers} workers...")
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=configure_profiling,
+        initargs=profiling_options(),
+    ) as executor:
+        results = []
+        for path_gdf, stages in executor.map(
+            process_shard,
+            shards,
+            [start_time] * len(shards),
+            [end_time] * len(shards),
+            [daylight_mode] * len(shards),
+            [max_error_km] * len(shards),
+            [field_of_regard] * len(shards),
+        ):
+            merge_stages(stages)
+            results.append(path_gdf)
+
+    return gpd.GeoDataFrame(
+        pd.concat(results, ignore_index=True), geometry="geometry", crs="EPSG:4326"
+    ).sort_values(["satellite", "start_time"], kind="stable", ignore_index=True)
@@ -0,0 +1,416 @@
+"""
+On-demand predictions for one satellite, constellation or area.
+
+PredictionService answers small requests, e.g. the next 6 hours of one
+constellation or the passes over one area, without rerunning the global
+pipeline. Satellites are built from a local TLE file (by default the
+combined_tle.txt of the last run), which is reread when it changes. Skyfield
+satellites and the path segments of each satellite and window are kept in
+LRU caches, and the solar ephemeris is loaded once, so repeated requests
+are answered from memory. Windows start on the 5 minute sampling grid, so
+requests within the same 5 minutes share cached segments.
+
+serve() exposes the service over HTTP (see `eo-predictor serve --help`):
+
+    GET /satellites
+    GET /paths?norad_id=39634&hours=6
+    GET /paths?constellation=Sentinel-2&bbox=5.9,45.8,10.5,47.8
+    GET /passes?bbox=5.9,45.8,10.5,47.8&hours=24
+    GET /passes?lat=46.95&lon=7.45&constellation=ICEYE
+
+Example:
+    service = PredictionService("combined_tle.txt")
+    segments = service.paths(norad_ids=[39634], hours=6)
+    passes = service.passes(bbox=(5.9, 45.8, 10.5, 47.8), hours=24)
+"""
+
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import geopandas as gpd
+import pandas as pd
+import shapely
+
+from .constellations import expand_constellations_to_satellites, load_constellations
+from .daylight import load_ephemeris
+from .incremental import floor_time
+from .output import format_timestamps, write_ndjson_features
+from .pass_events import find_all_pass_events
+from .paths import combined_tle_path, satellites_dir
+from .pipeline import load_satellites
+from .segments import SEGMENT_COLUMNS, TILE_LAYER, generate_path_segments
+from .tle import create_satellite
+
+# Default and longest prediction window of a request
+DEFAULT_HOURS = 6
+MAX_HOURS = 48
+
+# Skyfield satellites kept in memory
+SATELLITE_CACHE_SIZE = 4096
+
+# (satellite, window) path segment sets kept in memory
+SEGMENT_CACHE_SIZE = 4096
+
+PASS_COLUMNS = ["norad_id", "satellite", "constellation", "start_time", "end_time"]
+
+
+def satellite_key(record):
+    """Hashable (name, line1, line2, properties JSON) of a satellite record"""
+    name, line1, line2, sat_props = record
+    return name, line1, line2, json.dumps(sat_props, sort_keys=True)
+
+
+@lru_cache(maxsize=SATELLITE_CACHE_SIZE)
+def cached_satellite(name, line1, line2, properties):
+    """
+    Skyfield satellite of a TLE, built once per TLE.
+
+    Args:
+        properties: Constellation properties as a JSON string, see
+            satellite_key()
+    """
+    return create_satellite(name, line1, line2, json.loads(properties))
+
+
+def bbox_geometry(bbox):
+    """Polygon of a (west, south, east, north) box that may cross the antimeridian"""
+    west, south, east, north = bbox
+    if not (-90 <= south <= north <= 90):
+        raise ValueError(f"Invalid bbox {bbox}")
+    if west > east:
+        return shapely.union(
+            shapely.box(west, south, 180, north), shapely.box(-180, south, east, north)
+        )
+    return shapely.box(west, south, east, north)
+
+
+def merge_passes(segments):
+    """
+    Merge consecutive path segments of each satellite into passes.
+
+    Returns:
+        DataFrame: Passes (PASS_COLUMNS) ordered by start time
+    """
+    if segments.empty:
+        return pd.DataFrame(columns=PASS_COLUMNS)
+    segments = segments.sort_values(["norad_id", "start_time"], kind="stable")
+    # A new pass starts wherever the satellite changes or the previous
+    # segment of the same satellite ended earlier
+    new_pass = (segments["norad_id"] != segments["norad_id"].shift()) | (
+        segments["start_time"] != segments["end_time"].shift()
+    )
+    return (
+        segments.groupby(new_pass.cumsum(), sort=False)
+        .agg(
+            norad_id=("norad_id", "first"),
+            satellite=("satellite", "first"),
+            constellation=("constellation", "first"),
+            start_time=("start_time", "first"),
+            end_time=("end_time", "last"),
+        )
+        .sort_values(["start_time", "satellite"], kind="stable", ignore_index=True)
+    )
+
+
+class PredictionService:
+    """
+    Predictions of the satellites in the constellation files from a local
+    TLE file, cached in memory.
+
+    Args:
+        tle_path: TLE file (two- or three-line element sets)
+        satellites_dir: Constellation files
+        daylight_mode: "ephemeris" or "subsolar", see is_daytime()
+        field_of_regard: Also build field of regard footprints
+    """
+
+    def __init__(
+        self,
+        tle_path=combined_tle_path,
+        satellites_dir=satellites_dir,
+        daylight_mode="ephemeris",
+        field_of_regard=False,
+    ):
+        self.tle_path = tle_path
+        self.satellites_dir = satellites_dir
+        self.daylight_mode = daylight_mode
+        self.field_of_regard = field_of_regard
+        self._lock = threading.Lock()
+        self._records = {}
+        self._tle_mtime = None
+        self._segments = OrderedDict()
+        if daylight_mode == "ephemeris":
+            load_ephemeris()
+
+    def satellite_records(self):
+        """
+        (name, line1, line2, sat_props) record of every satellite, keyed by
+        NORAD ID. The TLE file is reread when it has changed.
+        """
+        mtime = os.stat(self.tle_path).st_mtime_ns
+        with self._lock:
+            if mtime != self._tle_mtime:
+                satellite_info = expand_constellations_to_satellites(
+                    load_constellations(self.satellites_dir)
+                )
+                with open(self.tle_path) as f:
+                    satellite_records, satellites = load_satellites(
+                        f.read(), satellite_info
+                    )
+                self._records = {
+                    str(sat.model.satnum): record
+                    for record, sat in zip(satellite_records, satellites)
+                }
+                self._tle_mtime = mtime
+                print(f"Loaded {len(self._records)} satellites from {self.tle_path}")
+            return self._records
+
+    def select(self, norad_ids=None, constellation=None):
+        """Records of the requested satellites, all of them by default"""
+        records = self.satellite_records()
+        if norad_ids is not None:
+            norad_ids = [str(norad_id) for norad_id in norad_ids]
+            missing = [norad_id for norad_id in norad_ids if norad_id not in records]
+            if missing:
+                raise KeyError(f"Unknown NORAD IDs: {', '.join(missing)}")
+            records = {norad_id: records[norad_id] for norad_id in norad_ids}
+        if constellation is not None:
+            records = {
+                norad_id: record
+                for norad_id, record in records.items()
+                if record[3]["constellation"] == constellation
+            }
+        return records
+
+    def window(self, start_time=None, hours=DEFAULT_HOURS):
+        """Prediction window starting on the sampling grid"""
+        if not 0 < hours <= MAX_HOURS:
+            raise ValueError(f"hours must be between 0 and {MAX_HOURS}")
+        start_time = floor_time(start_time or datetime.now(timezone.utc))
+        return start_time, start_time + timedelta(hours=hours)
+
+    def segments(self, records, start_time, end_time):
+        """
+        Path segments of the records over a window, generating those that
+        are not cached yet in one batch.
+        """
+        keys = {
+            norad_id: (*satellite_key(record), start_time, end_time)
+            for norad_id, record in records.items()
+        }
+        # Only hold the lock to read and insert cache entries, so requests
+        # for cached windows aren't blocked while another batch generates
+        with self._lock:
+            frames = {}
+            for norad_id, key in keys.items():
+                if key in self._segments:
+                    self._segments.move_to_end(key)
+                    frames[norad_id] = self._segments[key]
+        missing = [norad_id for norad_id in keys if norad_id not in frames]
+        if missing:
+            satellites = [
+                cached_satellite(*satellite_key(records[norad_id]))
+                for norad_id in missing
+            ]
+            path_gdf = generate_path_segments(
+                satellites,
+                start_time,
+                end_time,
+                self.daylight_mode,
+                field_of_regard=self.field_of_regard,
+                quiet=True,
+            )
+            if path_gdf.empty:
+                path_gdf = gpd.GeoDataFrame(
+                    columns=SEGMENT_COLUMNS, geometry="geometry", crs="EPSG:4326"
+                )
+            groups = dict(list(path_gdf.groupby("norad_id", sort=False)))
+            with self._lock:
+                for norad_id in missing:
+                    frames[norad_id] = groups.get(norad_id, path_gdf.iloc[:0])
+                    self._segments[keys[norad_id]] = frames[norad_id]
+                while len(self._segments) > SEGMENT_CACHE_SIZE:
+                    self._segments.popitem(last=False)
+        if not frames:
+            return gpd.GeoDataFrame(
+                columns=SEGMENT_COLUMNS, geometry="geometry", crs="EPSG:4326"
+            )
+        return gpd.GeoDataFrame(
+            pd.concat(frames.values(), ignore_index=True),
+            geometry="geometry",
+            crs="EPSG:4326",
+        ).sort_values(["satellite", "start_time"], kind="stable", ignore_index=True)
+
+    def paths(
+        self,
+        norad_ids=None,
+        constellation=None,
+        bbox=None,
+        start_time=None,
+        hours=DEFAULT_HOURS,
+    ):
+        """
+        Path segments of the selected satellites.
+
+        Args:
+            norad_ids: NORAD IDs to predict (default: all)
+            constellation: Only predict this constellation
+            bbox: Only return segments intersecting (west, south, east, north)
+            start_time: datetime in UTC (default: now), rounded down to the
+                sampling grid
+            hours: Length of the window
+
+        Returns:
+            GeoDataFrame: Path segments (SEGMENT_COLUMNS)
+        """
+        records = self.select(norad_ids, constellation)
+        path_gdf = self.segments(records, *self.window(start_time, hours))
+        if bbox is not None:
+            path_gdf = path_gdf[path_gdf.intersects(bbox_geometry(bbox))]
+        return path_gdf
+
+    def passes(
+        self,
+        bbox=None,
+        lat=None,
+        lon=None,
+        norad_ids=None,
+        constellation=None,
+        start_time=None,
+        hours=DEFAULT_HOURS,
+    ):
+        """
+        Passes over a bounding box or a point.
+
+        Over a bbox, a pass is a run of consecutive swath segments that
+        intersect it. Over a point, passes are pass events (entry, closest
+        approach and exit within the field of regard), see
+        find_pass_events().
+
+        Returns:
+            DataFrame: Passes (PASS_COLUMNS) or pass events (PASS_EVENT_COLUMNS)
+            ordered by time
+        """
+        if lat is not None and lon is not None:
+            records = self.select(norad_ids, constellation)
+            start_time, end_time = self.window(start_time, hours)
+            satellites = [
+                cached_satellite(*satellite_key(record)) for record in records.values()
+            ]
+            aois = pd.DataFrame({"aoi_id": ["aoi"], "lat": [lat], "lon": [lon]})
+            return find_all_pass_events(satellites, aois, start_time, end_time)
+        if bbox is None:
+            raise ValueError("Either bbox or lat and lon are required")
+        path_gdf = self.paths(norad_ids, constellation, bbox, start_time, hours)
+        return merge_passes(path_gdf[path_gdf["layer"] == TILE_LAYER])
+
+
+def feature_collection(path_gdf):
+    """Path segments as a GeoJSON FeatureCollection string"""
+    features = io.StringIO()
+    write_ndjson_features(path_gdf, features)
+    return (
+        '{"type": "FeatureCollection", "features": ['
+        + ",".join(features.getvalue().splitlines())
+        + "]}"
+    )
+
+
+def records_json(frame):
+    """A DataFrame as a JSON array, with times formatted like the GeoJSON"""
+    frame = frame.copy()
+    for column in frame.columns:
+        if column.endswith("_time"):
+            frame[column] = format_timestamps(pd.to_datetime(frame[column], utc=True))
+    return frame.to_json(orient="records")
+
+
+def parse_query(query):
+    """Request arguments of PredictionService.paths() and passes()"""
+    params = {key: values[-1] for key, values in parse_qs(query).items()}
+    args = {"hours": float(params.get("hours", DEFAULT_HOURS))}
+    if "norad_id" in params:
+        args["norad_ids"] = params["norad_id"].split(",")
+    if "constellation" in params:
+        args["constellation"] = params["constellation"]
+    if "bbox" in params:
+        bbox = [float(value) for value in params["bbox"].split(",")]
+        if len(bbox) != 4:
+            raise ValueError("bbox must be west,south,east,north")
+        args["bbox"] = bbox
+    if "start" in params:
+        start_time = pd.Timestamp(params["start"])
+        if start_time.tzinfo is None:
+            start_time = start_time.tz_localize("UTC")
+        args["start_time"] = start_time.tz_convert("UTC").to_pydatetime()
+    return args, params
+
+
+class PredictionHandler(BaseHTTPRequestHandler):
+    """HTTP requests to a PredictionService, see the module docstring"""
+
+    service = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        try:
+            args, params = parse_query(url.query)
+            if url.path == "/satellites":
+                records = self.service.select(
+                    args.get("norad_ids"), args.get("constellation")
+                )
+                body = json.dumps(
+                    [
+                        {
+                            "norad_id": norad_id,
+                            "satellite": name,
+                            "constellation": sat_props["constellation"],
+                        }
+                        for norad_id, (name, _, _, sat_props) in records.items()
+                    ]
+                )
+                content_type = "application/json"
+            elif url.path == "/paths":
+                body = feature_collection(self.service.paths(**args))
+                content_type = "application/geo+json"
+            elif url.path == "/passes":
+                if "lat" in params and "lon" in params:
+                    args.update(lat=float(params["lat"]), lon=float(params["lon"]))
+                body = records_json(self.service.passes(**args))
+                content_type = "application/json"
+            else:
+                self.send_error(404, f"Unknown path {url.path}")
+                return
+        except KeyError as e:
+            self.send_error(404, str(e).strip("'\""))
+            return
+        except ValueError as e:
+            self.send_error(400, str(e))
+            return
+
+        data = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def serve(service, host="127.0.0.1", port=8000):
+    """Serve a PredictionService over HTTP until interrupted"""
+    handler = type("Handler", (PredictionHandler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    print(f"Serving predictions on http://{host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,312 @@
+"""
+Vector tiles from GeoJSON or newline-delimited GeoJSON with tippecanoe, as a
+directory, PMTiles or MBTiles archive, optionally one constellation at a time
+merged with tile-join, or as one tileset per time slice.
+"""
+
+import bisect
+import json
+import os
+import re
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
+import pandas as pd
+
+from .output import layer_frames, write_ndjson_features
+from .paths import mbtiles_path, pmtiles_path, tiles_dir, time_slices_dir
+
+TIPPECANOE_OPTIONS = [
+    "-Z0",
+    "-z7",  # Changed from -z12 to -z7
+    "--simplification=10",
+    "--drop-densest-as-needed",
+    "--extend-zooms-if-still-dropping",
+    "--detect-longitude-wraparound",
+]
+
+# Time slices hold a few hours of segments each, so their tiles keep every
+# feature instead of dropping the densest at low zooms
+TIME_SLICE_TIPPECANOE_OPTIONS = [
+    "-Z0",
+    "-z7",
+    "--simplification=10",
+    "--no-feature-limit",
+    "--no-tile-size-limit",
+    "--detect-longitude-wraparound",
+]
+
+# Where each tiles format is written, and the URL the map loads it from.
+# MapLibre cannot load MBTiles, which are for tile servers and other tools,
+# so they have no URL
+TILES_OUTPUTS = {
+    "directory": (tiles_dir, "/tiles/{z}/{x}/{y}.pbf"),
+    "pmtiles": (pmtiles_path, "/satellite_paths.pmtiles"),
+    "mbtiles": (mbtiles_path, None),
+}
+
+# File name of each time slice's tileset in time_slices_dir, by tiles format.
+# Slices are only written in formats the map can load
+TIME_SLICE_FILES = {
+    "directory": "{name}/{{z}}/{{x}}/{{y}}.pbf",
+    "pmtiles": "{name}.pmtiles",
+}
+
+
+def tiles_output_options(output_path, tiles_format):
+    """tippecanoe/tile-join options that write output_path in tiles_format"""
+    if tiles_format == "directory":
+        # Uncompressed tiles are important for web hosting
+        return ["--no-tile-compression", "--output-to-directory", output_path]
+    return ["--output", output_path]
+
+
+def run_tippecanoe(layer_paths, output_path, tiles_format, options=TIPPECANOE_OPTIONS):
+    """
+    Tile input GeoJSON/NDJSON files, raising if tippecanoe fails.
+
+    Args:
+        layer_paths: (tile layer, file path) pairs; files of the same layer
+            are merged into it
+        output_path: Tiles output, see tiles_output_options()
+        tiles_format: "directory", "pmtiles" or "mbtiles"
+        options: tippecanoe zoom, simplification and dropping options
+    """
+    subprocess.run(
+        [
+            "tippecanoe",
+            *options,
+            *[f"--named-layer={layer}:{path}" for layer, path in layer_paths],
+            *tiles_output_options(output_path, tiles_format),
+            "--force",
+        ],
+        check=True,
+    )
+
+
+def constellation_file_name(constellation):
+    """File-system safe name for a constellation's intermediate files"""
+    return re.sub(r"[^A-Za-z0-9]+", "_", constellation).strip("_") or "unnamed"
+
+
+def write_constellation_ndjson(path_gdf, output_dir, constellations=None):
+    """
+    Write path segments to one newline-delimited GeoJSON file per constellation
+    and tile layer.
+
+    Args:
+        constellations: Constellation of each sat_id, if segments were
+            reduced to a sat_id, see output.compact_segments()
+
+    Returns:
+        dict: (tile layer, file path) pairs of each constellation, keyed by
+        its file name
+    """
+    inputs = {}
+    for layer, layer_gdf in layer_frames(path_gdf).items():
+        if constellations is None:
+            keys = layer_gdf["constellation"]
+        else:
+            keys = layer_gdf["sat_id"].map(constellations)
+        for constellation, group in layer_gdf.groupby(keys, sort=False):
+            name = constellation_file_name(constellation)
+            path = os.path.join(output_dir, f"{name}.{layer}.ndjson")
+            with open(path, "w") as f:
+                write_ndjson_features(group, f)
+            inputs.setdefault(name, []).append((layer, path))
+    return inputs
+
+
+def split_ndjson_by_constellation(layer_paths, output_dir, constellations=None):
+    """
+    Split newline-delimited GeoJSON files into one file per constellation and
+    tile layer, one line at a time.
+
+    Args:
+        layer_paths: (tile layer, file path) pairs to split
+        constellations: Constellation of each sat_id, if segments were
+            reduced to a sat_id, see output.compact_segments()
+
+    Returns:
+        dict: (tile layer, file path) pairs of each constellation, keyed by
+        its file name
+    """
+    inputs = {}
+    for layer, input_path in layer_paths:
+        files = {}
+        with ExitStack() as stack, open(input_path) as f:
+            for line in f:
+                properties = json.loads(line)["properties"]
+                if constellations is None:
+                    constellation = properties["constellation"]
+                else:
+                    constellation = constellations[properties["sat_id"]]
+                if constellation not in files:
+                    name = constellation_file_name(constellation)
+                    path = os.path.join(output_dir, f"{name}.{layer}.ndjson")
+                    files[constellation] = stack.enter_context(open(path, "w"))
+                    inputs.setdefault(name, []).append((layer, path))
+                files[constellation].write(line)
+    return inputs
+
+
+def generate_tiles_parallel(inputs, output_path, tiles_format, workers):
+    """
+    Tile each constellation in its own tippecanoe process, then join the
+    tilesets.
+
+    Up to workers tippecanoe processes run at once. Each writes an MBTiles
+    file to a temporary directory, and tile-join merges them, combining
+    layers of the same name.
+
+    Args:
+        inputs: (tile layer, file path) pairs of each constellation, keyed by
+            its file name, see write_constellation_ndjson()
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        layer_paths = [os.path.join(tmp_dir, f"{name}.mbtiles") for name in inputs]
+        print(
+            f"Running tippecanoe for {len(inputs)} constellations "
+            f"({workers} at a time)..."
+        )
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(
+                executor.map(
+                    run_tippecanoe,
+                    inputs.values(),
+                    layer_paths,
+                    ["mbtiles"] * len(inputs),
+                )
+            )
+
+        print("Joining constellation tilesets with tile-join...")
+        subprocess.run(
+            [
+                "tile-join",
+                "--no-tile-size-limit",
+                *tiles_output_options(output_path, tiles_format),
+                "--force",
+                *layer_paths,
+            ],
+            check=True,
+        )
+
+
+def time_slices(min_time, max_time, hours):
+    """
+    Time slices of the given length covering a time range, aligned to
+    multiples of hours since midnight UTC so slice names are stable between
+    runs.
+
+    Args:
+        min_time: Start time of the first segment
+        max_time: Start time of the last segment
+
+    Returns:
+        list: (name, start, end) of each slice, start inclusive and end
+        exclusive
+    """
+    length = pd.Timedelta(hours=hours)
+    start = pd.Timestamp(min_time).floor(length)
+    slices = []
+    while start <= max_time:
+        name = start.strftime("%Y%m%dT%H%MZ")
+        slices.append((name, start, start + length))
+        start += length
+    return slices
+
+
+def time_slice_output(name, tiles_format):
+    """
+    Where a time slice's tileset is written, and its URL relative to the
+    metadata file.
+
+    Returns:
+        tuple: (output path, URL)
+    """
+    url = "slices/" + TIME_SLICE_FILES[tiles_format].format(name=name)
+    if tiles_format == "directory":
+        return os.path.join(time_slices_dir, name), url
+    return os.path.join(time_slices_dir, os.path.basename(url)), url
+
+
+def write_time_slice_ndjson(path_gdf, slices, output_dir):
+    """
+    Write path segments to one newline-delimited GeoJSON file per time slice
+    and tile layer. A segment belongs to the slice its start time falls in.
+
+    Args:
+        slices: (name, start, end) of each slice, see time_slices()
+
+    Returns:
+        dict: (tile layer, file path) pairs of each slice, keyed by its name
+    """
+    starts = pd.DatetimeIndex([start for _, start, _ in slices])
+    inputs = {}
+    for layer, layer_gdf in layer_frames(path_gdf).items():
+        positions = starts.searchsorted(layer_gdf["start_time"], side="right") - 1
+        for position, group in layer_gdf.groupby(positions, sort=True):
+            name = slices[position][0]
+            path = os.path.join(output_dir, f"{name}.{layer}.ndjson")
+            with open(path, "w") as f:
+                write_ndjson_features(group, f)
+            inputs.setdefault(name, []).append((layer, path))
+    return inputs
+
+
+def split_ndjson_by_time_slice(layer_paths, slices, output_dir):
+    """
+    Split newline-delimited GeoJSON files into one file per time slice and
+    tile layer, one line at a time. A segment belongs to the slice its start
+    time falls in.
+
+    Args:
+        layer_paths: (tile layer, file path) pairs to split
+        slices: (name, start, end) of each slice, see time_slices()
+
+    Returns:
+        dict: (tile layer, file path) pairs of each slice, keyed by its name
+    """
+    # Segment times are ISO 8601 strings, so seconds-resolution prefixes
+    # sort like the times themselves
+    starts = [start.strftime("%Y-%m-%dT%H:%M:%S") for _, start, _ in slices]
+    inputs = {}
+    for layer, input_path in layer_paths:
+        files = {}
+        with ExitStack() as stack, open(input_path) as f:
+            for line in f:
+                start_time = json.loads(line)["properties"]["start_time"]
+                position = bisect.bisect_right(starts, start_time[:19]) - 1
+                if position not in files:
+                    name = slices[position][0]
+                    path = os.path.join(output_dir, f"{name}.{layer}.ndjson")
+                    files[position] = stack.enter_context(open(path, "w"))
+                    inputs.setdefault(name, []).append((layer, path))
+                files[position].write(line)
+    return dict(sorted(inputs.items()))
+
+
+def generate_time_slice_tiles(inputs, tiles_format, workers):
+    """
+    Tile each time slice in its own tippecanoe process, up to workers at a
+    time, writing the tilesets to time_slices_dir. No features are dropped,
+    see TIME_SLICE_TIPPECANOE_OPTIONS.
+
+    Args:
+        inputs: (tile layer, file path) pairs of each slice, keyed by its
+            name, see write_time_slice_ndjson()
+    """
+    output_paths = [time_slice_output(name, tiles_format)[0] for name in inputs]
+    print(f"Running tippecanoe for {len(inputs)} time slices ({workers} at a time)...")
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(
+            executor.map(
+                run_tippecanoe,
+                inputs.values(),
+                output_paths,
+                [tiles_format] * len(inputs),
+                [TIME_SLICE_TIPPECANOE_OPTIONS] * len(inputs),
+            )
+        )
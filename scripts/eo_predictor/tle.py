@@ -0,0 +1,64 @@
+"""
+Two-line element sets and the Skyfield satellites built from them.
+
+The Skyfield timescale is loaded on first use rather than on import.
+"""
+
+from functools import cache
+
+from skyfield.api import EarthSatellite, load
+
+
+@cache
+def timescale():
+    """Skyfield timescale, loaded on first use"""
+    return load.timescale()
+
+
+def parse_tle_text(text):
+    """
+    Split TLE text into (name, line1, line2) records.
+
+    Accepts both two-line and three-line (named) element sets, like
+    Skyfield's TLE file loader.
+    """
+    records = []
+    previous, current = "", ""
+    for line in text.splitlines():
+        line = line.rstrip()
+        if current.startswith("1 ") and line.startswith("2 "):
+            name = previous.strip() or None
+            if name and name.startswith("0 "):
+                name = name[2:]
+            if name and name.startswith(("1 ", "2 ")):
+                name = None
+            records.append((name, current, line))
+            previous, current = "", ""
+        else:
+            previous, current = current, line
+    return records
+
+
+def add_satellite_properties(sat, sat_props):
+    """Attach constellation properties from the JSON files to a satellite"""
+    sat.constellation = sat_props["constellation"]
+    sat.swath_km = sat_props["swath_km"]
+    sat.altitude_km = sat_props["altitude_km"]
+    sat.off_nadir_deg = sat_props["off_nadir_deg"]
+    sat.operator = sat_props["operator"]
+    sat.sensor_type = sat_props["sensor_type"]
+    sat.spatial_res_m = sat_props["spatial_res_cm"] / 100  # Convert cm to meters
+    sat.data_access = sat_props["data_access"]
+    sat.data_repo_type = sat_props.get("data_repo_type")
+    sat.data_repo_url = sat_props.get("data_repo_url")
+    # Add tasking field if it exists
+    if "tasking" in sat_props:
+        sat.tasking = sat_props["tasking"]
+    return sat
+
+
+def create_satellite(name, line1, line2, sat_props):
+    """Build a Skyfield satellite from a (name, line1, line2, sat_props) record"""
+    return add_satellite_properties(
+        EarthSatellite(line1, line2, name, timescale()), sat_props
+    )
@@ -0,0 +1,353 @@
+"""
+Validation of satellite constellation files.
+
+This module validates:
+1. JSON structure of all constellation files using Pydantic models
+2. Required fields are present
+3. NORAD ID uniqueness across all constellations
+4. Data type validation and constraints
+5. Optionally, NORAD IDs, names and altitudes against the local TLE cache
+
+Every file is validated and every error reported, rather than stopping at
+the first invalid file. Results of each file are cached by the file's hash,
+so only files that changed since the last run are validated again.
+
+Usage: uv run python -m eo_predictor validate [--check-tles]
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Annotated, List, Literal, Optional
+
+from pydantic import BaseModel, Field, HttpUrl, ValidationError
+
+from .paths import satellites_dir as default_satellites_dir
+from .paths import tle_cache_path, validation_cache_path
+
+# Bump when a change to validation invalidates cached results
+VALIDATION_CACHE_VERSION = 1
+
+# Largest difference between a constellation's altitude_km and the mean
+# altitude of a satellite's orbit before --check-tles warns about it
+ALTITUDE_TOLERANCE_KM = 100
+
+# Standard gravitational parameter of the Earth (km^3/s^2)
+EARTH_MU = 398600.4418
+
+
+class SatelliteConstellation(BaseModel):
+    """Model for satellite constellation data with validation rules."""
+
+    constellation: str = Field(
+        min_length=1, description="Human-readable constellation name"
+    )
+    operator: str = Field(
+        min_length=1, description="Organization that operates the satellites"
+    )
+    sensor_type: Literal["optical", "SAR", "hyperspectral"] = Field(
+        description="Type of sensor on the satellites"
+    )
+    spatial_res_cm: float = Field(gt=0, description="Spatial resolution in centimeters")
+    swath_km: float = Field(gt=0, description="Swath width in kilometers")
+    altitude_km: float = Field(description="Typical orbit altitude in kilometers")
+    off_nadir_deg: float = Field(
+        description="Maximum off-nadir viewing angle in degrees"
+    )
+    data_access: Literal["open", "commercial"] = Field(
+        description="Data access type - free (open) or paid (commercial)"
+    )
+    tasking: bool = Field(
+        description="Whether satellites can be tasked (true) or are pre-programmed (false)"
+    )
+    url: Optional[HttpUrl] = Field(
+        None, description="Optional link to constellation information page"
+    )
+    norad_ids: List[Annotated[int, Field(gt=0)]] = Field(
+        min_length=1, description="Array of NORAD catalog numbers"
+    )
+    data_repo_type: Optional[Literal["STAC", "API", "portal", "bucket", "other"]] = (
+        Field(None, description="Type of data repository. STAC is preferred.")
+    )
+    data_repo_url: Optional[HttpUrl] = Field(
+        None,
+        description="Link to get data. Preferred STAC catalog, can also be API, portal, bucket or other",
+    )
+
+    class ConfigDict:
+        extra = "forbid"  # Forbid extra fields to catch typos
+        use_enum_values = True
+
+
+def schema_fingerprint():
+    """Hash of the constellation schema, so cached results expire with it"""
+    schema = SatelliteConstellation.model_json_schema()
+    inputs = {"version": VALIDATION_CACHE_VERSION, "schema": schema}
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+
+
+def validate_file(file_path):
+    """
+    Validate one constellation file, collecting all of its errors.
+
+    Returns:
+        dict: Cacheable result: the file's error messages and, if it is
+        valid, its constellation name, altitude_km and NORAD IDs
+    """
+    result = {"errors": []}
+    try:
+        with open(file_path) as f:
+            data = json.load(f)
+        constellation = SatelliteConstellation.model_validate(data)
+    except json.JSONDecodeError as e:
+        result["errors"].append(f"invalid JSON: {e}")
+    except ValidationError as e:
+        for error in e.errors():
+            location = ".".join(str(part) for part in error["loc"]) or "file"
+            result["errors"].append(f"{location}: {error['msg']}")
+    else:
+        result.update(
+            constellation=constellation.constellation,
+            altitude_km=constellation.altitude_km,
+            norad_ids=constellation.norad_ids,
+        )
+    return result
+
+
+def file_hash(file_path):
+    with open(file_path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def load_validation_cache(path=validation_cache_path):
+    """
+    Load cached file results, keyed by file name, or an empty cache if it
+    was written for another schema.
+    """
+    if path is None or not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        cache = json.load(f)
+    if cache.get("schema") != schema_fingerprint():
+        return {}
+    return cache["files"]
+
+
+def save_validation_cache(files, path=validation_cache_path):
+    """Write file results for the next run, see load_validation_cache()"""
+    with open(path, "w") as f:
+        json.dump(
+            {"schema": schema_fingerprint(), "files": files},
+            f,
+            indent=2,
+            sort_keys=True,
+        )
+
+
+def name_token(name):
+    """Upper-case alphanumerics of a name's first word, for loose matching"""
+    first_word = re.split(r"[\s\-_(]+", name.strip())[0]
+    return re.sub(r"[^A-Z0-9]", "", first_word.upper())
+
+
+def format_examples(items, limit=5):
+    """Comma-separated items, cut off after limit"""
+    more = f" and {len(items) - limit} more" if len(items) > limit else ""
+    return ", ".join(items[:limit]) + more
+
+
+def mean_altitude_km(line2):
+    """Mean altitude of an orbit above the Earth's mean radius, from its TLE"""
+    from .propagation import EARTH_RADIUS_KM
+
+    mean_motion = float(line2[52:63]) * 2 * math.pi / 86400  # rad/s
+    return (EARTH_MU / mean_motion**2) ** (1 / 3) - EARTH_RADIUS_KM
+
+
+def cross_check_tles(files, tle_cache_path=tle_cache_path):
+    """
+    Cross-check valid files against the local TLE cache, in one pass over it.
+
+    Warns about NORAD IDs without a cached TLE, satellites whose TLE name
+    does not mention their constellation, and orbits further than
+    ALTITUDE_TOLERANCE_KM from the constellation's altitude_km. Warnings of
+    each kind are grouped per file.
+
+    Args:
+        files: Validation results keyed by file name, see validate_file()
+
+    Returns:
+        list: Warning messages
+    """
+    from .fetch import load_tle_cache
+    from .tle import parse_tle_text
+
+    tle_cache = load_tle_cache(tle_cache_path)
+    if not tle_cache:
+        return [f"no TLEs cached in {tle_cache_path}; run the generator first"]
+
+    # (name, line2) of every cached satellite
+    tles = {}
+    for norad_id, entry in tle_cache.items():
+        for name, _, line2 in parse_tle_text(entry["content"]):
+            tles[int(norad_id)] = (name or "", line2)
+
+    warnings = []
+    for filename, result in files.items():
+        if result["errors"]:
+            continue
+        missing, misnamed, off_altitude = [], [], []
+        token = name_token(result["constellation"])
+        for norad_id in result["norad_ids"]:
+            if norad_id not in tles:
+                missing.append(str(norad_id))
+                continue
+            name, line2 = tles[norad_id]
+            if token not in re.sub(r"[^A-Z0-9]", "", name.upper()):
+                misnamed.append(f"{norad_id} ({name})")
+            altitude = mean_altitude_km(line2)
+            if abs(altitude - result["altitude_km"]) > ALTITUDE_TOLERANCE_KM:
+                off_altitude.append(f"{norad_id} ({altitude:.0f} km)")
+        if missing:
+            warnings.append(
+                f"{filename}: {len(missing)} NORAD IDs have no cached TLE: "
+                f"{format_examples(missing)}"
+            )
+        if misnamed:
+            warnings.append(
+                f"{filename}: {len(misnamed)} TLE names do not mention "
+                f"{result['constellation']!r}: {format_examples(misnamed)}"
+            )
+        if off_altitude:
+            warnings.append(
+                f"{filename}: {len(off_altitude)} orbits are more than "
+                f"{ALTITUDE_TOLERANCE_KM} km from altitude_km "
+                f"{result['altitude_km']:g}: {format_examples(off_altitude)}"
+            )
+    return warnings
+
+
+def validate_constellations(
+    satellites_dir=default_satellites_dir,
+    cache_path=validation_cache_path,
+    check_tles=False,
+    tle_cache_path=tle_cache_path,
+    workers=1,
+):
+    """
+    Validate every constellation file in satellites_dir, collecting all
+    errors instead of stopping at the first.
+
+    Args:
+        satellites_dir: Directory of constellation files
+        cache_path: Where results are cached by file hash, or None to
+            validate every file
+        check_tles: Cross-check NORAD IDs, names and altitudes against
+            the TLE cache at tle_cache_path, see cross_check_tles()
+        workers: Number of processes validating changed files
+
+    Returns:
+        dict: Number of files, satellites and cached files, error messages
+        (invalid files and duplicate NORAD IDs) and warning messages (TLE
+        cross-checks)
+    """
+    if not os.path.exists(satellites_dir):
+        raise FileNotFoundError(f"Satellites directory not found: {satellites_dir}")
+
+    filenames = sorted(
+        filename
+        for filename in os.listdir(satellites_dir)
+        if filename.endswith(".json")
+    )
+    hashes = {
+        filename: file_hash(os.path.join(satellites_dir, filename))
+        for filename in filenames
+    }
+
+    # Reuse results of files that did not change
+    cache = load_validation_cache(cache_path)
+    files = {
+        filename: cache[filename]
+        for filename in filenames
+        if cache.get(filename, {}).get("sha256") == hashes[filename]
+    }
+    changed = [filename for filename in filenames if filename not in files]
+    paths = [os.path.join(satellites_dir, filename) for filename in changed]
+    if workers > 1 and len(changed) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(validate_file, paths))
+    else:
+        results = [validate_file(path) for path in paths]
+    for filename, result in zip(changed, results):
+        files[filename] = {**result, "sha256": hashes[filename]}
+    files = {filename: files[filename] for filename in filenames}
+
+    if cache_path is not None and changed:
+        save_validation_cache(files, cache_path)
+
+    errors = [
+        f"{filename}: {error}"
+        for filename, result in files.items()
+        for error in result["errors"]
+    ]
+
+    # Check for duplicate NORAD IDs across constellations
+    all_norad_ids = defaultdict(list)
+    for filename, result in files.items():
+        for norad_id in result.get("norad_ids", []):
+            all_norad_ids[norad_id].append(filename)
+    errors.extend(
+        f"Duplicate NORAD ID {norad_id} in: {', '.join(names)}"
+        for norad_id, names in all_norad_ids.items()
+        if len(names) > 1
+    )
+
+    warnings = cross_check_tles(files, tle_cache_path) if check_tles else []
+
+    return {
+        "files": len(files),
+        "cached": len(files) - len(changed),
+        "satellites": sum(len(r.get("norad_ids", [])) for r in files.values()),
+        "errors": errors,
+        "warnings": warnings,
+    }
+
+
+def print_validation_report(report, strict=False):
+    """
+    Print a validate_constellations() report.
+
+    Args:
+        strict: Fail on warnings as well as errors
+
+    Returns:
+        bool: Whether validation passed
+    """
+    for warning in report["warnings"]:
+        print(f"⚠️  {warning}")
+    for error in report["errors"]:
+        print(f"❌ {error}")
+    failures = len(report["errors"]) + (len(report["warnings"]) if strict else 0)
+    if failures:
+        print(f"❌ VALIDATION FAILED - {failures} problem(s)")
+        return False
+    print(
+        f"✅ VALIDATION PASSED - {report['files']} constellation files, "
+        f"{report['satellites']} satellites ({report['cached']} files unchanged)"
+    )
+    return True
+
+
+def main():
+    from .cli import main as cli_main
+
+    cli_main(["validate", *sys.argv[1:]])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,511 +1,13 @@
-import asyncio
-import json
-import os
-import subprocess
-from datetime import datetime, timedelta, timezone
+"""
+Generate satellite path predictions and map tiles.
 
-import geopandas as gpd
-import httpx
-import pandas as pd
-from shapely.geometry import LineString, Point
-from skyfield.api import load, wgs84
+Runs `python -m eo_predictor generate` with the same options; see
+eo_predictor/ for the pipeline.
+"""
 
-# Get the absolute path of the script's directory
-script_dir = os.path.dirname(os.path.abspath(__file__))
-# Get the absolute path of the project root
-project_root = os.path.dirname(script_dir)
+import sys
 
-# Define absolute paths for output files
-public_dir = os.path.join(project_root, "public")
-local_metadata_path = os.path.join(public_dir, "satellite_paths_metadata.json")
-tiles_dir = os.path.join(public_dir, "tiles")
-geojson_path = os.path.join(script_dir, "satellite_paths.geojson")
+from eo_predictor.cli import main
 
-
-def load_constellations():
-    """Load constellation data from individual JSON files in satellites/ folder"""
-    satellites_dir = os.path.join(script_dir, "satellites")
-    constellations = []
-
-    if not os.path.exists(satellites_dir):
-        raise FileNotFoundError(f"Satellites directory not found: {satellites_dir}")
-
-    for filename in os.listdir(satellites_dir):
-        if filename.endswith(".json"):
-            file_path = os.path.join(satellites_dir, filename)
-            with open(file_path, "r") as f:
-                constellation = json.load(f)
-                constellations.append(constellation)
-
-    print(f"Loaded {len(constellations)} constellations from {satellites_dir}")
-    return constellations
-
-
-def expand_constellations_to_satellites(constellations):
-    """Convert constellation files into individual satellite records"""
-    satellite_info = []
-
-    for constellation in constellations:
-        base_data = constellation.copy()
-        norad_ids = base_data.pop("norad_ids")  # Remove the array
-
-        for norad_id in norad_ids:
-            sat_data = base_data.copy()
-            sat_data["norad_id"] = norad_id
-            # Note: satellite name will be extracted from TLE data
-            sat_data["name"] = (
-                f"{constellation['constellation']}-{norad_id}"  # Temporary name
-            )
-            satellite_info.append(sat_data)
-
-    print(f"Expanded to {len(satellite_info)} individual satellites")
-    return satellite_info
-
-
-# Load constellation data from folder structure
-constellations = load_constellations()
-satellite_info = expand_constellations_to_satellites(constellations)
-
-# List of satellite TLE data URLs from Celestrak
-tle_requests = []
-for sat in satellite_info:
-    tle_requests.append(
-        {
-            "norad_id": str(sat["norad_id"]),
-            "url": f"https://celestrak.org/NORAD/elements/gp.php?CATNR={sat['norad_id']}&FORMAT=tle",
-        }
-    )
-
-
-# Async function to fetch a single TLE URL
-async def fetch_tle(client, request):
-    url = request["url"]
-    norad_id = request["norad_id"]
-    try:
-        response = await client.get(url)
-        response.raise_for_status()  # Raise an exception for 4xx or 5xx status codes
-        content = response.text.strip()
-        if not content:
-            print(f"  Empty response for NORAD {norad_id}")
-            return {
-                "norad_id": norad_id,
-                "url": url,
-                "success": False,
-                "no_gp": False,
-                "content": "",
-            }
-        if "no gp data found" in content.lower():
-            print(f"  No GP data found for NORAD {norad_id}")
-            return {
-                "norad_id": norad_id,
-                "url": url,
-                "success": False,
-                "no_gp": True,
-                "content": "",
-            }
-        print(f"  Successfully fetched NORAD {norad_id}")
-        return {
-            "norad_id": norad_id,
-            "url": url,
-            "success": True,
-            "no_gp": False,
-            "content": response.text,
-        }
-    except httpx.HTTPStatusError as e:
-        # Celestrak returns 404 (instead of 200 with a "no GP data" body) for
-        # catalog numbers with no GP data, e.g. decayed/deorbited satellites.
-        if (
-            e.response.status_code == 404
-            and "no gp data found" in e.response.text.lower()
-        ):
-            print(f"  No GP data found for NORAD {norad_id}")
-            return {
-                "norad_id": norad_id,
-                "url": url,
-                "success": False,
-                "no_gp": True,
-                "content": "",
-            }
-        print(
-            f"  Failed to fetch NORAD {norad_id} (HTTP error: {e.response.status_code})"
-        )
-        return {
-            "norad_id": norad_id,
-            "url": url,
-            "success": False,
-            "no_gp": False,
-            "content": "",
-        }
-    except httpx.RequestError as e:
-        print(f"  Failed to fetch NORAD {norad_id} (Request error: {e})")
-        return {
-            "norad_id": norad_id,
-            "url": url,
-            "success": False,
-            "no_gp": False,
-            "content": "",
-        }
-
-
-# Async function to fetch all TLE URLs concurrently with retries
-async def fetch_all_tles(requests, max_attempts=3, base_delay=5):
-    remaining_requests = list(requests)
-    results = {}
-
-    for attempt in range(max_attempts):
-        if not remaining_requests:
-            break
-
-        print(
-            f"Fetching TLE data (attempt {attempt + 1}/{max_attempts}) for {len(remaining_requests)} satellites..."
-        )
-        async with httpx.AsyncClient() as client:
-            tasks = [fetch_tle(client, request) for request in remaining_requests]
-            attempt_results = await asyncio.gather(*tasks)
-
-        remaining_requests = []
-        for result in attempt_results:
-            results[result["norad_id"]] = result
-            if not result["success"] and not result["no_gp"]:
-                remaining_requests.append(
-                    {"norad_id": result["norad_id"], "url": result["url"]}
-                )
-
-        if remaining_requests and attempt < max_attempts - 1:
-            delay = base_delay * (2**attempt)
-            print(f"Retrying {len(remaining_requests)} failed fetches in {delay}s...")
-            await asyncio.sleep(delay)
-
-    return results
-
-
-# Fetch and combine TLE data
-print("Fetching TLE data...")
-combined_tle_content = ""
-
-# Run the async fetching
-tle_results = asyncio.run(fetch_all_tles(tle_requests))
-combined_tle_content = "\n".join(
-    [result["content"] for result in tle_results.values() if result["success"]]
-)
-
-with open(os.path.join(script_dir, "combined_tle.txt"), "w") as outfile:
-    outfile.write(combined_tle_content)
-
-# Load satellites from the TLE file
-print("Loading satellites from TLE file...")
-satellites = load.tle_file(os.path.join(script_dir, "combined_tle.txt"))
-
-# Create a mapping from NORAD ID to satellite data from your JSON
-satellite_data_map = {str(sat["norad_id"]): sat for sat in satellite_info}
-
-# Filter satellites to only include those from your JSON list and add properties
-filtered_satellites = []
-for sat in satellites:
-    # Skyfield's sat.model.satnum is the NORAD ID
-    if str(sat.model.satnum) in satellite_data_map:
-        sat_props = satellite_data_map[str(sat.model.satnum)]
-        # Use the actual satellite name from TLE data (sat.name is set by Skyfield)
-        # sat.name already contains the correct name from TLE
-        sat.constellation = sat_props["constellation"]
-        sat.swath_km = sat_props["swath_km"]
-        sat.operator = sat_props["operator"]
-        sat.sensor_type = sat_props["sensor_type"]
-        sat.spatial_res_m = sat_props["spatial_res_cm"] / 100  # Convert cm to meters
-        sat.data_access = sat_props["data_access"]
-        sat.data_repo_type = sat_props.get("data_repo_type")
-        sat.data_repo_url = sat_props.get("data_repo_url")
-        # Add tasking field if it exists
-        if "tasking" in sat_props:
-            sat.tasking = sat_props["tasking"]
-        filtered_satellites.append(sat)
-satellites = filtered_satellites
-
-print(f"{len(satellites)} satellites loaded and filtered.")
-
-expected_norad_ids = {str(sat["norad_id"]) for sat in satellite_info}
-loaded_norad_ids = {str(sat.model.satnum) for sat in satellites}
-no_gp_norad_ids = sorted(
-    [int(norad_id) for norad_id, result in tle_results.items() if result["no_gp"]]
-)
-failed_fetch_norad_ids = sorted(
-    [
-        int(norad_id)
-        for norad_id, result in tle_results.items()
-        if not result["success"] and not result["no_gp"]
-    ]
-)
-missing_active_norad_ids = sorted(
-    [
-        int(norad_id)
-        for norad_id in expected_norad_ids
-        - loaded_norad_ids
-        - {str(norad_id) for norad_id in no_gp_norad_ids}
-    ]
-)
-expected_count = len(expected_norad_ids)
-active_expected_count = expected_count - len(no_gp_norad_ids)
-fetched_count = len(loaded_norad_ids)
-success_rate = fetched_count / active_expected_count if active_expected_count else 0
-
-
-def format_percent(value):
-    percent = value * 100
-    if percent >= 99.5:
-        return "100%"
-    if percent == 0:
-        return "0%"
-    return f"{percent:.1g}%"
-
-
-fetch_status = {
-    "expectedCount": expected_count,
-    "activeExpectedCount": active_expected_count,
-    "fetchedCount": fetched_count,
-    "missingNoradIds": missing_active_norad_ids,
-    "noGpDataNoradIds": no_gp_norad_ids,
-    "failedFetchNoradIds": failed_fetch_norad_ids,
-    "successRate": success_rate,
-    "lastUpdated": datetime.now(timezone.utc).isoformat(),
-}
-
-fetch_status_path = os.path.join(public_dir, "satellite_fetch_status.json")
-with open(fetch_status_path, "w") as f:
-    json.dump(fetch_status, f, indent=2)
-print(
-    "Fetch summary: "
-    f"{fetched_count}/{active_expected_count} satellites predicted "
-    f"({format_percent(success_rate)} of active), "
-    f"{len(no_gp_norad_ids)} no GP data, "
-    f"{len(failed_fetch_norad_ids)} failed fetches."
-)
-print(f"Fetch status saved to: {fetch_status_path}")
-
-if success_rate <= 0.9:
-    print(
-        "WARNING: TLE fetch success rate for active satellites did not exceed 90%. "
-        "Deploying with the satellites that were fetched; "
-        "see satellite_fetch_status.json for details."
-    )
-
-# Set up the time range for the prediction
-ts = load.timescale()
-now = datetime.now(timezone.utc)
-time_1 = now
-time_2 = now + timedelta(days=2)
-
-# Load solar ephemeris for daytime calculations
-eph = load("de421.bsp")
-earth = eph["earth"]
-sun = eph["sun"]
-
-
-def is_daytime(lat_degrees, lon_degrees, observation_time):
-    """
-    Determine if it's daytime at a given location and time.
-    Uses solar elevation > 0° as the threshold for daytime.
-
-    Args:
-        lat_degrees: Latitude in degrees
-        lon_degrees: Longitude in degrees
-        observation_time: datetime object in UTC
-
-    Returns:
-        bool: True if daytime, False if nighttime
-    """
-    # Create location on Earth's surface
-    location = earth + wgs84.latlon(lat_degrees, lon_degrees)
-
-    # Convert datetime to Skyfield time
-    t = ts.from_datetime(observation_time)
-
-    # Calculate solar position relative to the location
-    astrometric = location.at(t).observe(sun)
-    alt, az, distance = astrometric.apparent().altaz()
-
-    # Return True if sun is above horizon (elevation > 0°)
-    return alt.degrees > 0
-
-
-# Function to calculate satellite positions
-def get_satellite_positions(sat, start_time, end_time, step_minutes):
-    positions = []
-    current_time = start_time
-    while current_time <= end_time:
-        geocentric = sat.at(ts.from_datetime(current_time))
-        lat, lon = wgs84.latlon_of(geocentric)
-        positions.append(
-            {
-                "satellite": sat.name,
-                "timestamp": current_time,
-                "coordinates": Point(lon.degrees, lat.degrees),
-                "swath_km": sat.swath_km,
-                "constellation": sat.constellation,
-                "operator": sat.operator,
-                "sensor_type": sat.sensor_type,
-                "spatial_res_m": sat.spatial_res_m,  # Use meters
-                "data_access": sat.data_access,
-                "data_repo_type": sat.data_repo_type,
-                "data_repo_url": sat.data_repo_url,
-                "tasking": sat.tasking,
-            }
-        )
-        current_time += timedelta(minutes=step_minutes)
-    return positions
-
-
-# Calculate positions for all satellites
-print("\nCalculating satellite positions...")
-all_positions = []
-for i, sat in enumerate(satellites):
-    print(f"  ({i + 1}/{len(satellites)}) Calculating positions for {sat.name}")
-    all_positions.extend(get_satellite_positions(sat, time_1, time_2, 5))
-
-# Create a DataFrame from the positions
-print("\nCreating DataFrame from positions...")
-positions_df = pd.DataFrame(
-    all_positions,
-    columns=[
-        "satellite",
-        "timestamp",
-        "coordinates",
-        "swath_km",
-        "constellation",
-        "operator",
-        "sensor_type",
-        "spatial_res_m",
-        "data_access",
-        "data_repo_type",
-        "data_repo_url",
-        "tasking",
-    ],
-)
-
-# Create LineString paths for each satellite
-print("Creating LineString paths for each satellite...")
-path_segments = []
-for sat_name, group in positions_df.groupby("satellite"):
-    group = group.sort_values("timestamp").reset_index(drop=True)
-    for i in range(len(group) - 1):
-        pt0 = group.loc[i, "coordinates"]
-        pt1 = group.loc[i + 1, "coordinates"]
-
-        # Skip segments that cross the antimeridian
-        if abs(pt0.x - pt1.x) > 180:
-            continue
-
-        line = LineString([pt0, pt1])
-
-        # Calculate if observation occurs during daytime
-        # Use the center point of the line segment and middle time
-        center_lat = (pt0.y + pt1.y) / 2
-        center_lon = (pt0.x + pt1.x) / 2
-        middle_time = (
-            group.loc[i, "timestamp"]
-            + (group.loc[i + 1, "timestamp"] - group.loc[i, "timestamp"]) / 2
-        )
-        daytime = is_daytime(center_lat, center_lon, middle_time)
-
-        path_segments.append(
-            {
-                "satellite": sat_name,
-                "start_time": group.loc[i, "timestamp"],
-                "end_time": group.loc[i + 1, "timestamp"],
-                "geometry": line,
-                "swath_km": group.loc[i, "swath_km"],
-                "constellation": group.loc[i, "constellation"],
-                "operator": group.loc[i, "operator"],
-                "sensor_type": group.loc[i, "sensor_type"],
-                "spatial_res_m": group.loc[i, "spatial_res_m"],  # Use meters
-                "data_access": group.loc[i, "data_access"],
-                "data_repo_type": group.loc[i, "data_repo_type"],
-                "data_repo_url": group.loc[i, "data_repo_url"],
-                "tasking": group.loc[i, "tasking"],
-                "is_daytime": daytime,
-            }
-        )
-
-if not path_segments:
-    print("\nNo satellite paths were generated. Exiting.")
-else:
-    # Convert to a GeoDataFrame
-    path_gdf = gpd.GeoDataFrame(path_segments, geometry="geometry", crs="EPSG:4326")
-
-    # Buffer the lines to create polygons
-    print("\nBuffering paths to create polygons...")
-    path_gdf_proj = path_gdf.to_crs("EPSG:3395")
-    # Use swath_km for buffering, converting km to meters
-    path_gdf_proj["geometry"] = path_gdf_proj.apply(
-        lambda row: row.geometry.buffer(row["swath_km"] * 500), axis=1
-    )  # Half of swath_km for buffer
-    path_gdf = path_gdf_proj.to_crs("EPSG:4326")
-
-    # Save metadata
-    print("\nSaving metadata...")
-
-    # Calculate spatial resolution ranges
-    spatial_resolutions = path_gdf["spatial_res_m"].unique()
-    spatial_resolution_ranges = []
-    for res in spatial_resolutions:
-        if res < 5:
-            range_category = "high"
-        elif res <= 30:
-            range_category = "medium"
-        else:
-            range_category = "low"
-        spatial_resolution_ranges.append(range_category)
-
-    # Generate base metadata with tiles URL template
-    base_metadata = {
-        "satellites": path_gdf["satellite"].unique().tolist(),
-        "constellations": path_gdf["constellation"].unique().tolist(),
-        "operators": path_gdf["operator"].unique().tolist(),
-        "sensor_types": path_gdf["sensor_type"].unique().tolist(),
-        "data_access_options": path_gdf["data_access"].unique().tolist(),
-        "spatial_resolution_ranges": list(set(spatial_resolution_ranges)),
-        "minTime": path_gdf["start_time"].min().isoformat(),
-        "maxTime": path_gdf["end_time"].max().isoformat(),
-        "lastUpdated": datetime.now(timezone.utc).isoformat(),
-        "tilesUrl": "/tiles/{z}/{x}/{y}.pbf",
-    }
-
-    # Save local copy first
-    with open(local_metadata_path, "w") as f:
-        json.dump(base_metadata, f, indent=2)
-    print(f"\nSuccessfully generated local {local_metadata_path}")
-
-    # Save GeoJSON
-    print("\nSaving paths to GeoJSON file...")
-    path_gdf.to_file(geojson_path, driver="GeoJSON")
-    print(f"\nSuccessfully generated {geojson_path}")
-
-    # Generate directory tiles from the GeoJSON
-    print("\nGenerating directory tiles from GeoJSON...")
-
-    # Remove existing tiles directory if it exists
-    if os.path.exists(tiles_dir):
-        import shutil
-
-        shutil.rmtree(tiles_dir)
-
-    subprocess.run(
-        [
-            "tippecanoe",
-            "-Z0",
-            "-z7",  # Changed from -z12 to -z7
-            "--simplification=10",
-            "--drop-densest-as-needed",
-            "--extend-zooms-if-still-dropping",
-            "--detect-longitude-wraparound",
-            "--no-tile-compression",  # Important for web hosting
-            "--output-to-directory",
-            tiles_dir,
-            geojson_path,
-            "--force",
-        ]
-    )
-    print(f"\nSuccessfully generated tiles in {tiles_dir}")
-
-    print("\nTiles generated successfully and ready for GitHub hosting")
-    print(f"Metadata saved to: {local_metadata_path}")
-    print(f"Tiles directory: {tiles_dir}")
+if __name__ == "__main__":
+    main(["generate", *sys.argv[1:]])
@@ -0,0 +1,261 @@
+"""Offline tests of TLE fetching through the on-disk cache"""
+
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+
+from eo_predictor import fetch
+from eo_predictor.pipeline import build_fetch_status, fetch_tles, load_satellites
+
+TLE = (
+    "ISS (ZARYA)\n"
+    "1 25544U 98067A   08264.51782528 -.00002182  00000-0 -11606-4 0  2927\n"
+    "2 25544  51.6416 247.4627 0006703 130.5360 325.0288 15.72125391563537\n"
+)
+# The same element set under an Alpha-5 catalogue number (100001)
+ALPHA5_TLE = TLE.replace("1 25544U", "1 A0001U").replace("2 25544 ", "2 A0001 ")
+SATELLITE_INFO = [
+    {
+        "norad_id": 25544,
+        "constellation": "ISS",
+        "swath_km": 10,
+        "altitude_km": 420,
+        "off_nadir_deg": 0,
+        "operator": "NASA",
+        "sensor_type": "optical",
+        "spatial_res_cm": 1000,
+        "data_access": "open",
+    }
+]
+REQUESTS = [{"norad_id": "25544", "url": "https://celestrak.test/?CATNR=25544"}]
+
+
+def cache_entry(epoch_age, fetch_age, now=None):
+    now = now or datetime.now(timezone.utc)
+    return {
+        "content": TLE,
+        "epoch": (now - epoch_age).isoformat(),
+        "fetched_at": (now - fetch_age).isoformat(),
+    }
+
+
+def fetch_cached(cache, handler, max_age=timedelta(hours=12), **kwargs):
+    """Run fetch_all_tles_cached() against a mock transport, without retry delays"""
+    requests = []
+
+    def record(request):
+        requests.append(request)
+        return handler(request)
+
+    def create_client(*args):
+        return httpx.AsyncClient(transport=httpx.MockTransport(record))
+
+    with (
+        mock.patch.object(fetch, "create_tle_client", create_client),
+        mock.patch.object(fetch.asyncio, "sleep", mock.AsyncMock()),
+    ):
+        results = asyncio.run(
+            fetch.fetch_all_tles_cached(REQUESTS, cache, max_age, **kwargs)
+        )
+    return results, requests
+
+
+class IsTleFreshTest(unittest.TestCase):
+    now = datetime(2026, 10, 16, 12, tzinfo=timezone.utc)
+
+    def test_young_epoch_is_fresh(self):
+        entry = cache_entry(timedelta(hours=1), timedelta(days=1), self.now)
+        self.assertTrue(fetch.is_tle_fresh(entry, self.now, timedelta(hours=12)))
+
+    def test_recent_fetch_is_fresh(self):
+        entry = cache_entry(timedelta(days=2), timedelta(hours=1), self.now)
+        self.assertTrue(fetch.is_tle_fresh(entry, self.now, timedelta(hours=12)))
+
+    def test_old_epoch_and_fetch_is_stale(self):
+        entry = cache_entry(timedelta(days=2), timedelta(hours=3), self.now)
+        self.assertFalse(fetch.is_tle_fresh(entry, self.now, timedelta(hours=12)))
+
+    def test_zero_max_age_refetches_recent_fetches(self):
+        entry = cache_entry(timedelta(hours=1), timedelta(minutes=5), self.now)
+        self.assertFalse(fetch.is_tle_fresh(entry, self.now, timedelta(0)))
+
+
+class FetchAllTlesCachedTest(unittest.TestCase):
+    def test_fresh_entry_is_served_from_cache(self):
+        cache = {"25544": cache_entry(timedelta(hours=1), timedelta(hours=1))}
+        results, requests = fetch_cached(cache, lambda request: httpx.Response(500))
+
+        self.assertEqual(requests, [])
+        self.assertTrue(results["25544"]["success"])
+        self.assertTrue(results["25544"]["cached"])
+        self.assertFalse(results["25544"]["stale"])
+
+    def test_fetch_updates_cache(self):
+        cache = {"25544": cache_entry(timedelta(days=2), timedelta(days=1))}
+        results, requests = fetch_cached(
+            cache, lambda request: httpx.Response(200, text=TLE)
+        )
+
+        self.assertEqual(len(requests), 1)
+        self.assertFalse(results["25544"]["cached"])
+        self.assertEqual(cache["25544"]["epoch"], "2008-09-20T12:25:40.104192+00:00")
+
+    def test_failed_fetch_falls_back_to_stale_cache(self):
+        cache = {"25544": cache_entry(timedelta(days=2), timedelta(days=1))}
+        results, requests = fetch_cached(cache, lambda request: httpx.Response(503))
+
+        self.assertEqual(len(requests), 3)
+        self.assertEqual(results["25544"]["content"], TLE)
+        self.assertTrue(results["25544"]["success"])
+        self.assertTrue(results["25544"]["stale"])
+
+    def test_offline_falls_back_to_stale_cache(self):
+        cache = {"25544": cache_entry(timedelta(days=2), timedelta(days=1))}
+        results, requests = fetch_cached(
+            cache, lambda request: httpx.Response(200, text=TLE), offline=True
+        )
+
+        self.assertEqual(requests, [])
+        self.assertTrue(results["25544"]["stale"])
+
+    def test_no_gp_data_is_not_served_stale(self):
+        cache = {"25544": cache_entry(timedelta(days=2), timedelta(days=1))}
+        results, _ = fetch_cached(
+            cache, lambda request: httpx.Response(404, text="No GP data found")
+        )
+
+        self.assertFalse(results["25544"]["success"])
+        self.assertTrue(results["25544"]["no_gp"])
+
+    def test_fetch_status_lists_stale_tles(self):
+        cache = {"25544": cache_entry(timedelta(days=2), timedelta(days=1))}
+        results, _ = fetch_cached(cache, lambda request: httpx.Response(503))
+        _, satellites = load_satellites(results["25544"]["content"], SATELLITE_INFO)
+
+        fetch_status = build_fetch_status(SATELLITE_INFO, satellites, results)
+
+        self.assertEqual(fetch_status["staleTleNoradIds"], [25544])
+        self.assertEqual(fetch_status["cachedNoradIds"], [])
+        self.assertEqual(fetch_status["fetchedCount"], 1)
+
+
+class CelestrakStub(BaseHTTPRequestHandler):
+    """Celestrak GP API serving an "active" group and single NORAD IDs"""
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        self.server.paths.append(self.path)
+        if "GROUP" in query:
+            body = {"active": TLE + ALPHA5_TLE}.get(query["GROUP"][0])
+        else:
+            body = {"25544": TLE}.get(query["CATNR"][0])
+        self.send_response(200 if body else 404)
+        self.end_headers()
+        self.wfile.write((body or "No GP data found").encode())
+
+    def log_message(self, *args):
+        pass
+
+
+class CelestrakUrlTest(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), CelestrakStub)
+        self.server.paths = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cache_path = os.path.join(directory.name, "tle_cache.json")
+
+    def test_fetches_single_tles_from_celestrak_url(self):
+        satellite_info = [{"norad_id": 25544}, {"norad_id": 99999}]
+        results = fetch_tles(
+            satellite_info, celestrak_url=self.url, cache_path=self.cache_path
+        )
+
+        self.assertEqual(results["25544"]["content"], TLE)
+        self.assertTrue(results["99999"]["no_gp"])
+        self.assertEqual(
+            sorted(self.server.paths),
+            [
+                "/NORAD/elements/gp.php?CATNR=25544&FORMAT=tle",
+                "/NORAD/elements/gp.php?CATNR=99999&FORMAT=tle",
+            ],
+        )
+        self.assertIn("25544", fetch.load_tle_cache(self.cache_path))
+
+    def test_fetches_groups_with_alpha5_ids_from_celestrak_url(self):
+        satellite_info = [{"norad_id": 25544}, {"norad_id": 100001}]
+        results = fetch_tles(
+            satellite_info,
+            celestrak_url=self.url,
+            tle_groups=["active"],
+            cache_path=self.cache_path,
+        )
+
+        self.assertEqual(
+            self.server.paths, ["/NORAD/elements/gp.php?GROUP=active&FORMAT=tle"]
+        )
+        self.assertEqual(results["25544"]["content"], TLE)
+        self.assertEqual(results["100001"]["content"], ALPHA5_TLE)
+
+    def test_missing_catalogue_falls_back_to_single_tles(self):
+        results = fetch_tles(
+            [{"norad_id": 25544}],
+            celestrak_url=self.url,
+            tle_catalogues=[os.path.join(os.path.dirname(self.cache_path), "none")],
+            cache_path=self.cache_path,
+        )
+
+        self.assertEqual(results["25544"]["content"], TLE)
+        self.assertEqual(
+            self.server.paths, ["/NORAD/elements/gp.php?CATNR=25544&FORMAT=tle"]
+        )
+
+
+class SplitTleCatalogueTest(unittest.TestCase):
+    def test_decodes_alpha5_catalogue_numbers(self):
+        self.assertEqual(fetch.catalogue_number("A0001"), "100001")
+        self.assertEqual(fetch.catalogue_number("Z9999"), "339999")
+        self.assertEqual(fetch.catalogue_number("00042"), "42")
+        self.assertEqual(
+            fetch.split_tle_catalogue(TLE + ALPHA5_TLE, {"100001"}),
+            {"100001": ALPHA5_TLE},
+        )
+
+    def test_reads_local_catalogue_files(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write(TLE)
+        self.addCleanup(os.remove, f.name)
+        results = asyncio.run(fetch.fetch_bulk_tles(None, REQUESTS, [f.name]))
+
+        self.assertEqual(results["25544"]["content"], TLE)
+
+    def test_missing_catalogue_falls_back_to_stale_cache(self):
+        cache = {"25544": cache_entry(timedelta(days=2), timedelta(days=1))}
+        with tempfile.TemporaryDirectory() as directory:
+            missing = os.path.join(directory, "missing.txt")
+            results, requests = fetch_cached(
+                cache,
+                lambda request: httpx.Response(200, text=TLE),
+                offline=True,
+                bulk_sources=[missing, directory],
+            )
+
+        self.assertEqual(requests, [])
+        self.assertTrue(results["25544"]["stale"])
+        self.assertEqual(results["25544"]["content"], TLE)
+
+
+if __name__ == "__main__":
+    unittest.main()
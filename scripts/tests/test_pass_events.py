@@ -0,0 +1,216 @@
+"""Pass events compared with a brute-force scan of the off-nadir angle"""
+
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import shapely
+from skyfield.api import wgs84
+
+from eo_predictor.pass_events import (
+    field_of_regard_deg,
+    find_pass_events,
+    load_aois,
+    off_nadir_angle,
+    satellite_xyz,
+    subsatellite_point,
+    time_origin,
+)
+from eo_predictor.tle import create_satellite
+
+SATELLITE = (
+    "SAT-44390",
+    "1 44390U 24001A   26289.50000000  .00000000  00000-0  00000-0 0  9999",
+    "2 44390  98.2000 206.1523 0001000  90.0000 212.4973 15.17043400    14",
+    {
+        "constellation": "ICEYE",
+        "swath_km": 30,
+        "altitude_km": 570,
+        "off_nadir_deg": 30,
+        "operator": "ICEYE",
+        "sensor_type": "SAR",
+        "spatial_res_cm": 100,
+        "data_access": "commercial",
+        "tasking": True,
+    },
+)
+START_TIME = datetime(2026, 10, 16, 12, tzinfo=timezone.utc)
+POINT = (46.95, 7.45)
+# Wider than the satellite's reach, so the track can cross its interior with
+# no outline point in reach
+POLYGON = shapely.box(-5.0, 38.0, 20.0, 56.0)
+
+
+def scan_off_nadir(sat, points, hours):
+    """
+    Smallest off-nadir angle in degrees to any of points, every second.
+
+    Returns:
+        tuple: (seconds from START_TIME, angles)
+    """
+    seconds = np.arange(0, hours * 3600 + 1, 1.0)
+    origin = time_origin(sat, START_TIME)
+    lat, lon = points
+    site_xyz = wgs84.latlon(np.asarray(lat), np.asarray(lon)).itrs_xyz.km
+    site_xyz = site_xyz.reshape(3, -1)
+    site_radius = np.linalg.norm(site_xyz, axis=0)
+    angles = []
+    for chunk in np.array_split(seconds, max(len(seconds) // 600, 1)):
+        position = satellite_xyz(sat.model, origin, chunk)
+        satellite_radius = np.linalg.norm(position, axis=0)
+        cos_distance = (position / satellite_radius).T @ (site_xyz / site_radius)
+        angles.append(
+            off_nadir_angle(
+                cos_distance, satellite_radius[:, None], site_radius[None, :]
+            ).min(axis=1)
+        )
+    return seconds, np.degrees(np.concatenate(angles))
+
+
+def scan_passes(seconds, in_reach):
+    """(entry, exit) seconds of every run of samples in reach"""
+    edges = np.diff(np.concatenate([[0], in_reach.astype(int), [0]]))
+    starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1) - 1
+    return [(seconds[start], seconds[end]) for start, end in zip(starts, ends)]
+
+
+def event_seconds(events, column):
+    return (events[column] - pd.Timestamp(START_TIME)).dt.total_seconds().to_numpy()
+
+
+class FindPassEventsTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.sat = create_satellite(*SATELLITE)
+        cls.limit = field_of_regard_deg(
+            cls.sat.off_nadir_deg, cls.sat.swath_km, cls.sat.altitude_km
+        )
+
+    def check_point_events(self, hours):
+        aois = pd.DataFrame({"aoi_id": ["point"], "lat": [POINT[0]], "lon": [POINT[1]]})
+        events = find_pass_events(
+            self.sat, aois, START_TIME, START_TIME + timedelta(hours=hours)
+        )
+        seconds, angles = scan_off_nadir(self.sat, POINT, hours)
+        passes = scan_passes(seconds, angles <= self.limit)
+
+        self.assertGreater(len(passes), 0)
+        self.assertEqual(len(events), len(passes))
+        for event, (entry, exit_), closest, expected_angle in zip(
+            events.itertuples(),
+            passes,
+            event_seconds(events, "closest_time"),
+            [
+                angles[(seconds >= entry) & (seconds <= exit_)].min()
+                for entry, exit_ in passes
+            ],
+        ):
+            in_pass = (seconds >= entry) & (seconds <= exit_)
+            expected_closest = seconds[in_pass][np.argmin(angles[in_pass])]
+            self.assertAlmostEqual(closest, expected_closest, delta=1.5)
+            self.assertLessEqual(event.off_nadir_deg, expected_angle + 1e-6)
+            self.assertAlmostEqual(event.off_nadir_deg, expected_angle, delta=0.01)
+        np.testing.assert_allclose(
+            event_seconds(events, "entry_time"), [p[0] for p in passes], atol=1
+        )
+        np.testing.assert_allclose(
+            event_seconds(events, "exit_time"), [p[1] for p in passes], atol=1
+        )
+        return events, passes
+
+    def test_point_events_match_scan(self):
+        self.check_point_events(24)
+
+    def test_point_pass_in_progress_at_window_end_is_clipped(self):
+        # End the window in the middle of a pass
+        events, passes = self.check_point_events(24)
+        entry, exit_ = passes[-1]
+        hours = (entry + exit_) / 2 / 3600
+        events, _ = self.check_point_events(hours)
+
+        self.assertEqual(len(events), len(passes))
+        self.assertEqual(
+            events["exit_time"].iloc[-1],
+            pd.Timestamp(START_TIME + timedelta(hours=hours)),
+        )
+
+    def check_polygon_events(self, hours):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "aoi.geojson")
+            with open(path, "w") as f:
+                json.dump(
+                    {
+                        "type": "FeatureCollection",
+                        "features": [
+                            {
+                                "type": "Feature",
+                                "properties": {"id": "polygon"},
+                                "geometry": shapely.geometry.mapping(POLYGON),
+                            }
+                        ],
+                    },
+                    f,
+                )
+            aois = load_aois(path)
+        end_time = START_TIME + timedelta(hours=hours)
+        events = find_pass_events(self.sat, aois, START_TIME, end_time)
+
+        # In reach while any outline point is, or the track is inside
+        outline = shapely.get_coordinates(shapely.segmentize(POLYGON, 0.05))
+        seconds, angles = scan_off_nadir(
+            self.sat, (outline[:, 1], outline[:, 0]), hours
+        )
+        lat, lon = subsatellite_point(
+            self.sat.model, time_origin(self.sat, START_TIME), seconds
+        )
+        inside = shapely.contains_xy(POLYGON, lon, lat)
+        outline_in_reach = angles <= self.limit
+        passes = scan_passes(seconds, outline_in_reach | inside)
+
+        self.assertGreater(len(passes), 0)
+        self.assertEqual(list(events["aoi_id"].unique()), ["polygon"])
+        self.assertEqual(len(events), len(passes))
+        np.testing.assert_allclose(
+            event_seconds(events, "entry_time"), [p[0] for p in passes], atol=2
+        )
+        np.testing.assert_allclose(
+            event_seconds(events, "exit_time"), [p[1] for p in passes], atol=2
+        )
+
+        # Closest approach is the centroid's whenever it is in reach
+        centroid = shapely.centroid(POLYGON)
+        seconds, angles = scan_off_nadir(self.sat, (centroid.y, centroid.x), hours)
+        closest = event_seconds(events, "closest_time")
+        for entry, exit_ in scan_passes(seconds, angles <= self.limit):
+            in_pass = (seconds >= entry) & (seconds <= exit_)
+            expected_closest = seconds[in_pass][np.argmin(angles[in_pass])]
+            self.assertAlmostEqual(
+                np.min(np.abs(closest - expected_closest)), 0, delta=1.5
+            )
+        return events, passes, inside & ~outline_in_reach
+
+    def test_polygon_events_match_scan(self):
+        _, _, interior_only = self.check_polygon_events(24)
+
+        # Some passes cross the interior out of reach of the outline
+        self.assertTrue(interior_only.any())
+
+    def test_polygon_pass_in_progress_at_window_end_is_clipped(self):
+        # End the window while the track is inside the polygon, out of reach
+        # of its outline
+        _, _, interior_only = self.check_polygon_events(24)
+        end = np.flatnonzero(interior_only)[np.count_nonzero(interior_only) // 2]
+        events, _, _ = self.check_polygon_events(end / 3600)
+
+        self.assertEqual(
+            events["exit_time"].iloc[-1],
+            pd.Timestamp(START_TIME + timedelta(seconds=int(end))),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
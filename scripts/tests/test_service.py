@@ -0,0 +1,159 @@
+"""Tests of the prediction service against a local TLE file"""
+
+import json
+import os
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timezone
+from http.server import ThreadingHTTPServer
+from unittest import mock
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import shapely
+
+from eo_predictor import service as service_module
+from eo_predictor.service import PredictionHandler, PredictionService, bbox_geometry
+
+# Sentinel-2A and an ICEYE satellite, with epochs at the start of the window
+TLES = (
+    "SAT-40697\n"
+    "1 40697U 24001A   26289.50000000  .00000000  00000-0  00000-0 0  9995\n"
+    "2 40697  97.8000 190.4428 0001000  90.0000 144.2316 15.28593288    13\n"
+    "SAT-44390\n"
+    "1 44390U 24001A   26289.50000000  .00000000  00000-0  00000-0 0  9999\n"
+    "2 44390  98.2000 206.1523 0001000  90.0000 212.4973 15.17043400    14\n"
+)
+START = "2026-10-16T12:00:00Z"
+START_TIME = datetime(2026, 10, 16, 12, tzinfo=timezone.utc)
+EUROPE = (-10.0, 35.0, 30.0, 60.0)
+ANTIMERIDIAN = (170.0, -60.0, -170.0, 60.0)
+
+
+class PredictionServiceTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        directory = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(directory.cleanup)
+        tle_path = os.path.join(directory.name, "tle.txt")
+        with open(tle_path, "w") as f:
+            f.write(TLES)
+        cls.service = PredictionService(tle_path=tle_path, daylight_mode="subsolar")
+
+        handler = type(
+            "Handler",
+            (PredictionHandler,),
+            {"service": cls.service, "log_message": lambda *args: None},
+        )
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.addClassCleanup(cls.server.server_close)
+        cls.addClassCleanup(cls.server.shutdown)
+        cls.url = f"http://127.0.0.1:{cls.server.server_port}"
+
+    def get(self, path):
+        with urlopen(self.url + path) as response:
+            return json.load(response)
+
+    def assert_status(self, path, status):
+        with self.assertRaises(HTTPError) as error:
+            urlopen(self.url + path)
+        error.exception.close()
+        self.assertEqual(error.exception.code, status)
+
+    def test_satellites(self):
+        satellites = self.get("/satellites")
+
+        self.assertEqual(
+            sorted((sat["norad_id"], sat["constellation"]) for sat in satellites),
+            [("40697", "Sentinel-2"), ("44390", "ICEYE")],
+        )
+
+    def test_paths(self):
+        collection = self.get(f"/paths?norad_id=40697&start={START}&hours=6")
+
+        self.assertEqual(collection["type"], "FeatureCollection")
+        self.assertGreater(len(collection["features"]), 0)
+        self.assertEqual(
+            {feature["properties"]["satellite"] for feature in collection["features"]},
+            {"SAT-40697"},
+        )
+
+    def test_paths_in_bbox(self):
+        for bbox in [EUROPE, ANTIMERIDIAN]:
+            with self.subTest(bbox=bbox):
+                query = ",".join(map(str, bbox))
+                collection = self.get(f"/paths?bbox={query}&start={START}&hours=24")
+                box = bbox_geometry(bbox)
+
+                self.assertGreater(len(collection["features"]), 0)
+                for feature in collection["features"]:
+                    geometry = shapely.geometry.shape(feature["geometry"])
+                    self.assertTrue(geometry.intersects(box))
+
+    def test_paths_across_antimeridian_match_both_halves(self):
+        west, south, east, north = ANTIMERIDIAN
+        segments = self.service.paths(
+            bbox=ANTIMERIDIAN, start_time=START_TIME, hours=24
+        )
+        halves = [
+            self.service.paths(bbox=half, start_time=START_TIME, hours=24)
+            for half in [(west, south, 180, north), (-180, south, east, north)]
+        ]
+
+        self.assertTrue(all(len(half) for half in halves))
+        self.assertEqual(
+            len(segments), len(set().union(*(half.index for half in halves)))
+        )
+
+    def test_passes_over_bbox(self):
+        query = ",".join(map(str, EUROPE))
+        passes = self.get(f"/passes?bbox={query}&start={START}&hours=24")
+
+        self.assertGreater(len(passes), 0)
+        for event in passes:
+            self.assertLess(event["start_time"], event["end_time"])
+        self.assertEqual(
+            [event["start_time"] for event in passes],
+            sorted(event["start_time"] for event in passes),
+        )
+
+    def test_passes_over_point(self):
+        events = self.get(f"/passes?lat=46.95&lon=7.45&start={START}&hours=24")
+
+        self.assertGreater(len(events), 0)
+        for event in events:
+            self.assertLessEqual(event["entry_time"], event["closest_time"])
+            self.assertLessEqual(event["closest_time"], event["exit_time"])
+            self.assertLessEqual(event["off_nadir_deg"], event["field_of_regard_deg"])
+
+    def test_cached_window_is_not_regenerated(self):
+        start_time = datetime(2026, 10, 17, tzinfo=timezone.utc)
+        with mock.patch.object(
+            service_module,
+            "generate_path_segments",
+            wraps=service_module.generate_path_segments,
+        ) as generate:
+            first = self.service.paths(start_time=start_time, hours=3)
+            second = self.service.paths(start_time=start_time, hours=3)
+
+        self.assertEqual(generate.call_count, 1)
+        self.assertTrue(first.equals(second))
+        windows = {key[-2:] for key in self.service._segments}
+        self.assertIn((start_time, start_time.replace(hour=3)), windows)
+
+    def test_unknown_norad_id_is_not_found(self):
+        self.assert_status("/paths?norad_id=1", 404)
+        self.assert_status("/satellites?norad_id=40697,1", 404)
+
+    def test_invalid_arguments_are_bad_requests(self):
+        self.assert_status("/paths?bbox=1,2,3", 400)
+        self.assert_status("/paths?bbox=0,10,1,5", 400)
+        self.assert_status("/paths?hours=100", 400)
+        self.assert_status("/paths?hours=abc", 400)
+        self.assert_status("/passes?hours=6", 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,13 +6,21 @@ import Map, {
   GeolocateControl,
   type MapRef,
 } from "react-map-gl/maplibre";
+import maplibregl from "maplibre-gl";
 import "maplibre-gl/dist/maplibre-gl.css";
+import { Protocol } from "pmtiles";
 import { useFilterStore, type DataRepoType } from "@/store/filterStore";
 import { SatellitePopup } from "@/components/SatellitePopup";
 import { Header } from "@/components/Header";
 import { SidebarContent } from "@/components/SidebarContent";
 import { ZoomPrompt } from "@/components/ZoomPrompt";
-import { loadMapData, type FetchStatus } from "@/utils/mapUtils";
+import {
+  loadMapData,
+  pathLayerIds,
+  segmentProperties,
+  visibleTimeSlices,
+  type FetchStatus,
+} from "@/utils/mapUtils";
 
 interface ClickedFeature {
   lngLat: { lng: number; lat: number };
@@ -30,6 +38,13 @@ interface ClickedFeature {
   is_daytime?: boolean;
 }
 
+const tilesUrl = import.meta.env.VITE_TILES_URL;
+
+// A PMTiles archive is read with HTTP range requests through the pmtiles://
+// protocol; anything else is a {z}/{x}/{y} tile URL template
+const tileSourceProps = (url: string) =>
+  url.endsWith(".pmtiles") ? { url: `pmtiles://${url}` } : { tiles: [url] };
+
 function App() {
   const [clickedFeature, setClickedFeature] = useState<ClickedFeature | null>(
     null
@@ -38,8 +53,22 @@ function App() {
   const mapRef = useRef<MapRef | null>(null); // MapLibre map ref
   const [fetchStatus, setFetchStatus] = useState<FetchStatus | null>(null);
 
-  const { metadata, timeRange, mapFilter, setMetadata, setTimeRange } =
-    useFilterStore();
+  const {
+    metadata,
+    timeRange,
+    mapFilter,
+    showFieldOfRegard,
+    setMetadata,
+    setTimeRange,
+  } = useFilterStore();
+
+  useEffect(() => {
+    const protocol = new Protocol();
+    maplibregl.addProtocol("pmtiles", protocol.tile);
+    return () => {
+      maplibregl.removeProtocol("pmtiles");
+    };
+  }, []);
 
   useEffect(() => {
     // Load metadata
@@ -57,7 +86,10 @@ function App() {
   const handleMapClick = (e: any) => {
     const feature = e.features?.[0];
     if (feature?.properties) {
-      setClickedFeature({ ...feature.properties, lngLat: e.lngLat });
+      setClickedFeature({
+        ...segmentProperties(metadata, feature.properties),
+        lngLat: e.lngLat,
+      } as ClickedFeature);
     } else {
       setClickedFeature(null);
     }
@@ -67,6 +99,15 @@ function App() {
     return <div>Loading...</div>;
   }
 
+  // Sliced tilesets: load only the slices the time range shows, with layer
+  // ids suffixed by the slice start (see pathLayerIds)
+  const tileSources = metadata.timeSlices
+    ? visibleTimeSlices(metadata, timeRange).map((slice) => ({
+        suffix: `-${slice.start}`,
+        url: slice.tilesUrl,
+      }))
+    : [{ suffix: "", url: tilesUrl }];
+
   return (
     <div className="h-screen flex flex-col">
       <Header />
@@ -95,36 +136,64 @@ function App() {
             projection={{ type: "globe" }}
             onClick={handleMapClick}
             onMove={(evt) => setZoom(evt.viewState.zoom)}
-            interactiveLayerIds={["satellite_paths"]}
+            interactiveLayerIds={pathLayerIds(metadata, timeRange)}
             maxZoom={13}
           >
-            <Source
-              type="vector"
-              tiles={[import.meta.env.VITE_TILES_URL]}
-              minzoom={0}
-              maxzoom={7}
-            >
-              <Layer
-                id="satellite_paths"
-                source-layer="satellite_paths"
-                type="fill"
-                paint={{
-                  "fill-color": "red",
-                  "fill-opacity": [
-                    "interpolate",
-                    ["linear"],
-                    ["zoom"],
-                    2,
-                    0,
-                    6,
-                    0.05,
-                    13,
-                    0.1,
-                  ],
-                }}
-                filter={mapFilter}
-              />
-            </Source>
+            {tileSources.map(({ suffix, url }) => (
+              <Source
+                key={suffix}
+                type="vector"
+                {...tileSourceProps(url)}
+                minzoom={0}
+                maxzoom={7}
+              >
+                {metadata.fieldOfRegard && (
+                  <Layer
+                    id={`field_of_regard${suffix}`}
+                    source-layer="field_of_regard"
+                    type="fill"
+                    layout={{
+                      visibility: showFieldOfRegard ? "visible" : "none",
+                    }}
+                    paint={{
+                      "fill-color": "orange",
+                      "fill-opacity": [
+                        "interpolate",
+                        ["linear"],
+                        ["zoom"],
+                        2,
+                        0,
+                        6,
+                        0.02,
+                        13,
+                        0.05,
+                      ],
+                    }}
+                    filter={mapFilter}
+                  />
+                )}
+                <Layer
+                  id={`satellite_paths${suffix}`}
+                  source-layer="satellite_paths"
+                  type="fill"
+                  paint={{
+                    "fill-color": "red",
+                    "fill-opacity": [
+                      "interpolate",
+                      ["linear"],
+                      ["zoom"],
+                      2,
+                      0,
+                      6,
+                      0.05,
+                      13,
+                      0.1,
+                    ],
+                  }}
+                  filter={mapFilter}
+                />
+              </Source>
+            ))}
             <SatellitePopup
               clickedFeature={clickedFeature}
               onClose={() => setClickedFeature(null)}
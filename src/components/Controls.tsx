@@ -5,6 +5,7 @@ import {
   SelectTrigger,
   SelectValue,
 } from "@/components/ui/select";
+import { Toggle } from "@/components/ui/toggle";
 import { ToggleGroup, ToggleGroupItem } from "@/components/ui/toggle-group";
 import { Button } from "@/components/ui/button";
 import {
@@ -29,6 +30,7 @@ import {
   Info,
   Sun,
   Moon,
+  Scan,
 } from "lucide-react";
 
 export const Controls = () => {
@@ -40,6 +42,7 @@ export const Controls = () => {
     selectedDataAccess,
     selectedTasking,
     selectedDaylight,
+    showFieldOfRegard,
     availableConstellations,
     availableOperators,
     availableSensorTypes,
@@ -55,6 +58,7 @@ export const Controls = () => {
     setDataAccess,
     setTasking,
     setDaylight,
+    setShowFieldOfRegard,
     resetFilters,
   } = useFilterStore();
 
@@ -304,6 +308,31 @@ export const Controls = () => {
             );
           })}
         </ToggleGroup>
+        {metadata.fieldOfRegard && (
+          <div className="flex items-center gap-2">
+            <Toggle
+              pressed={showFieldOfRegard}
+              onPressedChange={setShowFieldOfRegard}
+              variant="outline"
+              size="sm"
+              aria-label="Show the area tasking satellites can image off nadir"
+            >
+              <Scan />
+              FIELD OF REGARD
+            </Toggle>
+            <Tooltip>
+              <TooltipTrigger asChild>
+                <Info className="h-3 w-3 text-muted-foreground cursor-help" />
+              </TooltipTrigger>
+              <TooltipContent>
+                <p>
+                  Show the wider area tasking satellites can image by pointing
+                  off nadir, alongside the nadir swath
+                </p>
+              </TooltipContent>
+            </Tooltip>
+          </div>
+        )}
       </div>
 
       <div className="space-y-2">
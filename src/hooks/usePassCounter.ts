@@ -1,6 +1,7 @@
-import { useState, useCallback, useEffect } from "react";
+import { useState, useCallback, useEffect, useMemo } from "react";
 import maplibregl from "maplibre-gl";
-import type { VisiblePass } from "../store/filterStore";
+import { useFilterStore, type VisiblePass } from "../store/filterStore";
+import { pathLayerIds, segmentProperties } from "../utils/mapUtils";
 
 interface UsePassCounterProps {
   mapRef: React.RefObject<maplibregl.Map | null>;
@@ -10,6 +11,12 @@ export const usePassCounter = ({ mapRef }: UsePassCounterProps) => {
   const [visiblePassCount, setVisiblePassCount] = useState<number | null>(null);
   const [visiblePasses, setVisiblePasses] = useState<VisiblePass[]>([]);
 
+  const { metadata, timeRange } = useFilterStore();
+  const layerIds = useMemo(
+    () => (metadata ? pathLayerIds(metadata, timeRange) : []),
+    [metadata, timeRange]
+  );
+
   const MAX_PASSES_THRESHOLD = 100;
 
   // Function to count unique satellites from rendered features
@@ -18,8 +25,9 @@ export const usePassCounter = ({ mapRef }: UsePassCounterProps) => {
 
     try {
       const map = mapRef.current;
+      // Skip time slice layers that have not been added to the map yet
       const features = map.queryRenderedFeatures(undefined, {
-        layers: ["satellite_paths"],
+        layers: layerIds.filter((id) => map.getLayer(id)),
       });
 
       if (features.length === 0) {
@@ -38,7 +46,7 @@ export const usePassCounter = ({ mapRef }: UsePassCounterProps) => {
       // Build list of passes with deduplication
       const allPasses: VisiblePass[] = features
         .map((feature: maplibregl.MapGeoJSONFeature): VisiblePass | null => {
-          const props = feature.properties || {};
+          const props = segmentProperties(metadata, feature.properties || {});
           const name = (props.satellite || props.name || "").toString();
           const start = (props.start_time || "").toString();
 
@@ -101,7 +109,7 @@ export const usePassCounter = ({ mapRef }: UsePassCounterProps) => {
       setVisiblePassCount(null);
       setVisiblePasses([]);
     }
-  }, [mapRef]);
+  }, [mapRef, layerIds, metadata]);
 
   // Set up event listeners when map becomes available
   useEffect(() => {
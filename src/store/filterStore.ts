@@ -4,6 +4,27 @@ import { devtools } from "zustand/middleware";
 // eslint-disable-next-line @typescript-eslint/no-explicit-any
 export type FilterExpression = any;
 
+// A tileset holding the path segments that start in [start, end)
+export interface TimeSlice {
+  start: number;
+  end: number;
+  tilesUrl: string;
+}
+
+// Properties of a satellite, shared by all of its path segments
+export interface SatelliteAttributes {
+  satellite: string;
+  swath_km: number;
+  constellation: string;
+  operator: string;
+  sensor_type: string;
+  spatial_res_m: number;
+  data_access: string;
+  data_repo_type: DataRepoType | null;
+  data_repo_url: string | null;
+  tasking: boolean;
+}
+
 export interface Metadata {
   minTime: number;
   maxTime: number;
@@ -13,6 +34,13 @@ export interface Metadata {
   spatialResolutions: string[];
   data_access_options: string[];
   lastUpdated: string;
+  // True when the tiles include the field_of_regard layer
+  fieldOfRegard?: boolean;
+  // Present when the tiles are split into time slices
+  timeSlices?: TimeSlice[];
+  // Present when segments carry only a sat_id (NORAD ID) and these
+  // attributes are looked up by it
+  satelliteTable?: Record<string, SatelliteAttributes>;
   // Add other properties as needed
 }
 
@@ -32,6 +60,36 @@ export interface VisiblePass {
   is_daytime?: boolean;
 }
 
+// Evaluates the attribute filters of generateMapFilter against a satellite's
+// attributes: "all" of comparisons of ["get", property] with a value
+const matchesFilter = (
+  expression: FilterExpression,
+  attributes: SatelliteAttributes
+): boolean => {
+  const [operator, ...args] = expression;
+  if (operator === "all") {
+    return args.every((arg: FilterExpression) =>
+      matchesFilter(arg, attributes)
+    );
+  }
+  const value = attributes[args[0][1] as keyof SatelliteAttributes];
+  const target = args[1];
+  switch (operator) {
+    case "==":
+      return value === target;
+    case "<":
+      return Number(value) < target;
+    case "<=":
+      return Number(value) <= target;
+    case ">":
+      return Number(value) > target;
+    case ">=":
+      return Number(value) >= target;
+    default:
+      return false;
+  }
+};
+
 interface FilterState {
   // Raw data
   metadata: Metadata | null;
@@ -46,6 +104,9 @@ interface FilterState {
   selectedTasking: string;
   selectedDaylight: string;
 
+  // Layer visibility
+  showFieldOfRegard: boolean;
+
   // Computed/derived state
   availableConstellations: Array<{ value: string; disabled: boolean }>;
   availableOperators: Array<{ value: string; disabled: boolean }>;
@@ -68,6 +129,7 @@ interface FilterState {
   setDataAccess: (value: string) => void;
   setTasking: (value: string) => void;
   setDaylight: (value: string) => void;
+  setShowFieldOfRegard: (value: boolean) => void;
   resetFilters: () => void;
 
   // Computed filter logic
@@ -88,6 +150,7 @@ export const useFilterStore = create<FilterState>()(
       selectedDataAccess: "all",
       selectedTasking: "all",
       selectedDaylight: "all",
+      showFieldOfRegard: false,
 
       // Initial computed state
       availableConstellations: [],
@@ -145,6 +208,10 @@ export const useFilterStore = create<FilterState>()(
         get().updateDerivedState();
       },
 
+      setShowFieldOfRegard: (value) => {
+        set({ showFieldOfRegard: value });
+      },
+
       resetFilters: () => {
         set({
           selectedConstellation: "all",
@@ -249,9 +316,12 @@ export const useFilterStore = create<FilterState>()(
           ],
         ];
 
+        // Filters on satellite attributes
+        const attributeFilters: FilterExpression[] = [];
+
         // Constellation filter
         if (state.selectedConstellation !== "all") {
-          filter.push([
+          attributeFilters.push([
             "==",
             ["get", "constellation"],
             state.selectedConstellation,
@@ -260,12 +330,20 @@ export const useFilterStore = create<FilterState>()(
 
         // Operator filter
         if (state.selectedOperator !== "all") {
-          filter.push(["==", ["get", "operator"], state.selectedOperator]);
+          attributeFilters.push([
+            "==",
+            ["get", "operator"],
+            state.selectedOperator,
+          ]);
         }
 
         // Sensor type filter
         if (state.selectedSensorType !== "all") {
-          filter.push(["==", ["get", "sensor_type"], state.selectedSensorType]);
+          attributeFilters.push([
+            "==",
+            ["get", "sensor_type"],
+            state.selectedSensorType,
+          ]);
         }
 
         // Spatial resolution filter
@@ -285,19 +363,23 @@ export const useFilterStore = create<FilterState>()(
               state.selectedSpatialResolution as keyof typeof resolutionFilters
             ];
           if (resolutionFilter) {
-            filter.push(resolutionFilter);
+            attributeFilters.push(resolutionFilter);
           }
         }
 
         // Data access filter
         if (state.selectedDataAccess !== "all") {
-          filter.push(["==", ["get", "data_access"], state.selectedDataAccess]);
+          attributeFilters.push([
+            "==",
+            ["get", "data_access"],
+            state.selectedDataAccess,
+          ]);
         }
 
         // Tasking filter
         if (state.selectedTasking !== "all") {
           const taskingValue = state.selectedTasking === "tasking";
-          filter.push(["==", ["get", "tasking"], taskingValue]);
+          attributeFilters.push(["==", ["get", "tasking"], taskingValue]);
         }
 
         // Daylight filter
@@ -306,6 +388,20 @@ export const useFilterStore = create<FilterState>()(
           filter.push(["==", ["get", "is_daytime"], isDaytime]);
         }
 
+        const satelliteTable = state.metadata?.satelliteTable;
+        if (!satelliteTable) {
+          filter.push(...attributeFilters);
+        } else if (attributeFilters.length) {
+          // Segments only carry a sat_id: filter the satellite table, then
+          // segments by the ids of the matching satellites
+          const satIds = Object.entries(satelliteTable)
+            .filter(([, attributes]) =>
+              attributeFilters.every((f) => matchesFilter(f, attributes))
+            )
+            .map(([satId]) => Number(satId));
+          filter.push(["in", ["get", "sat_id"], ["literal", satIds]]);
+        }
+
         return filter;
       },
     }),
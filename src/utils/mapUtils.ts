@@ -1,3 +1,5 @@
+import type { Metadata, TimeSlice } from "@/store/filterStore";
+
 /**
  * Loads satellite metadata and processes it for the application
  * @returns Promise resolving to processed data
@@ -9,6 +11,8 @@ export interface FetchStatus {
   missingNoradIds: number[];
   noGpDataNoradIds: number[];
   failedFetchNoradIds: number[];
+  cachedNoradIds?: number[];
+  staleTleNoradIds?: number[];
   successRate: number;
   lastUpdated: string;
 }
@@ -32,10 +36,22 @@ export const loadMapData = async () => {
   const min = new Date(metadataData.minTime).getTime();
   const max = new Date(metadataData.maxTime).getTime();
 
+  // Slice tilesets are listed relative to the metadata file. Resolve them by
+  // concatenation, as URL() would escape the braces of {z}/{x}/{y} templates
+  const baseUrl = new URL(".", window.location.href).href;
+  const timeSlices = metadataData.timeSlices?.map(
+    (slice: { start: string; end: string; tilesUrl: string }): TimeSlice => ({
+      start: new Date(slice.start).getTime(),
+      end: new Date(slice.end).getTime(),
+      tilesUrl: baseUrl + slice.tilesUrl,
+    })
+  );
+
   const processedMetadata = {
     ...metadataData,
     minTime: min,
     maxTime: max,
+    timeSlices,
   };
 
   return {
@@ -44,3 +60,39 @@ export const loadMapData = async () => {
     fetchStatus,
   };
 };
+
+/**
+ * Time slices holding the segments the map shows for a time range: those
+ * starting in the range, as slices are split by segment start time
+ */
+export const visibleTimeSlices = (metadata: Metadata, timeRange: number[]) =>
+  (metadata.timeSlices ?? []).filter(
+    (slice) => slice.start <= timeRange[1] && slice.end > timeRange[0]
+  );
+
+/**
+ * Ids of the satellite path layers on the map, one per visible time slice
+ * when the tiles are sliced
+ */
+export const pathLayerIds = (metadata: Metadata, timeRange: number[]) =>
+  metadata.timeSlices
+    ? visibleTimeSlices(metadata, timeRange).map(
+        (slice) => `satellite_paths-${slice.start}`
+      )
+    : ["satellite_paths"];
+
+// Properties of a map feature, as MapLibre types them
+// eslint-disable-next-line @typescript-eslint/no-explicit-any
+type FeatureProperties = Record<string, any>;
+
+/**
+ * Properties of a path segment feature, joined with its satellite's
+ * attributes when segments carry only a sat_id
+ */
+export const segmentProperties = (
+  metadata: Metadata | null,
+  properties: FeatureProperties
+): FeatureProperties => {
+  const attributes = metadata?.satelliteTable?.[String(properties.sat_id)];
+  return attributes ? { ...attributes, ...properties } : properties;
+};